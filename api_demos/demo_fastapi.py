@@ -1,86 +1,149 @@
 # Created by AG on 22-12-2025
 
+import os
 import re
 import json
-from pathlib import Path
-from typing import Any, Tuple
-from fastavro import parse_schema
-from fastavro.validation import validate, ValidationError
-from fastapi import FastAPI, HTTPException, Request
+import time
+import argparse
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from fastapi import FastAPI, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from core.encoding import EncodingError, confluent_schema_id, decode_payload, schema_fingerprint
+from core.histogram import LatencyHistogram
+from core.phases import REGISTRY_CACHE_HITS, PhaseTimer
+from core.registry import LRUCache, RegistryError, UnknownSchemaError, registry_client
+from core.metrics import OPENMETRICS_CONTENT_TYPE, histogram_lines
+from src.compile_validator import compile_validator
+from src.compile_validator import MISSING_FIELD, INVALID_ENUM, NULL_VALUE
+from src.utils import load_bundled_contract, load_contract
 
 demo = FastAPI()
 
+# AVROMAN_DEMO_SCHEMA points the demo at another schema; it is read by every worker process
+SCHEMA_PATH = os.environ.get("AVROMAN_DEMO_SCHEMA")
+
 email_regex = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
-AvroContract = parse_schema(json.loads(Path("contracts/sample.avsc").read_text(encoding="utf-8")))
+AvroContract = load_contract(SCHEMA_PATH) if SCHEMA_PATH else load_bundled_contract()
 valid_fields = {
     field["name"] for field in AvroContract["fields"]
 }
+validate_contract = compile_validator(AvroContract, strict=True)
+contract_fingerprint = schema_fingerprint(AvroContract)
+# AVROMAN_DEMO_REGISTRY: decode Confluent bodies with the writer schema their id names in this registry
+REGISTRY_URL = os.environ.get("AVROMAN_DEMO_REGISTRY")
+
+reason_errors = {
+    MISSING_FIELD: "missing fields",
+    INVALID_ENUM: "invalid enum",
+    NULL_VALUE: "value cannot be null",
+}
 
-def parse_error(message: str) -> Tuple[str, int]:
-    message = message.lower()
 
-    if "required" in message and "field" in message:
-        return "missing fields", 422
+def _detail(detail: Dict[str, Any]) -> bytes:
+    return json.dumps({"detail": detail}, separators=(",", ":")).encode("utf-8")
 
-    if "symbols" in message and ("not in" in message or "valid" in message):
-        return "invalid enum", 422
 
-    if "null" in message and ("expected" in message or "valid" in message or "allowed" in  message):
-        return "value cannot be null", 422
+# response bodies are serialized once, the handler only picks one
+OK_BODY = b'{"OK":true}'
+INVALID_REQUEST_BODY = _detail({"error": "invalid_request_body", "message": "Request must be JSON"})
+INVALID_JSON_BODY = _detail({"error": "invalid_json_body", "message": "Request body is not valid JSON"})
+INVALID_EMAIL_BODY = _detail({"error": "invalid_email", "message": "Email is not valid", "field": "email"})
 
-    if "expected" in message or "is not a" in message or "not a valid" in message:
-        return "data type mismatch", 422
 
-    return "schema could not be validated", 422
+@lru_cache(maxsize=4096)
+def reason_body(code: str, field: str) -> bytes:
+    return _detail({
+        "error": reason_errors.get(code, "data type mismatch"),
+        "message": "Schema validation failed",
+        "reason": code,
+        "field": field
+    })
 
 
-def validate_request(
+def check_payload(
     payload: Any
-) -> None:
+) -> Tuple[int, bytes]:
     if not isinstance(payload, dict):
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "invalid_request_body",
-                "message": "Request must be JSON"
-            },
-        )
-
-    invalid_fields = sorted(set(payload.keys()) - valid_fields)
-
-    if invalid_fields:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "unknown_fields",
-                "message": "Unknown fields in request body",
-                "fields": invalid_fields
-            },
-        )
-
-    if "email" in payload and payload["email"] is not None:
-        if not isinstance(payload["email"], str) or not email_regex.match(payload["email"]):
-            raise HTTPException(
-                status_code=422,
-                detail={
-                    "error": "invalid_email",
-                    "message": "Email is not valid",
-                    "field": "email"
-                },
-            )
-
+        return 400, INVALID_REQUEST_BODY
+
+    if not valid_fields.issuperset(payload):
+        return 400, _detail({
+            "error": "unknown_fields",
+            "message": "Unknown fields in request body",
+            "fields": sorted(set(payload) - valid_fields)
+        })
+
+    email = payload.get("email")
+    if email is not None and (not isinstance(email, str) or not email_regex.match(email)):
+        return 422, INVALID_EMAIL_BODY
+
+    reason = validate_contract(payload)
+    if reason is not None:
+        return 422, reason_body(reason.code, reason.field)
+    return 200, OK_BODY
+
+
+class ServerCounters:
+    # Handler time (body read to response chosen) and responses by status, for
+    # this worker process; each worker reports its own under a `worker` label.
+    # Handlers run on the event loop thread, so no locking is needed.
+    def __init__(self) -> None:
+        self.worker = str(os.getpid())
+        self.status_counts: Dict[int, int] = {}
+        self.latency = LatencyHistogram()
+        # registry requests and schema cache hits/misses, one lookup per Confluent body
+        self.registry = PhaseTimer()
+
+    def record(self, status_code: int, elapsed_time_ms: float) -> None:
+        self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+        self.latency.record(elapsed_time_ms)
+
+    def openmetrics_text(self) -> str:
+        lines: List[str] = [
+            "# TYPE avroman_demo_responses counter",
+            "# HELP avroman_demo_responses Responses by status code.",
+        ]
+        for status_code, count in sorted(self.status_counts.items()):
+            lines.append(f'avroman_demo_responses_total{{worker="{self.worker}",status="{status_code}"}} {count}')
+        lines += [
+            "# TYPE avroman_demo_handler_latency_seconds histogram",
+            "# HELP avroman_demo_handler_latency_seconds Time spent in the event handler.",
+        ]
+        lines += histogram_lines("avroman_demo_handler_latency_seconds", self.latency, f'worker="{self.worker}"')
+        for counter, count in sorted(self.registry.counters.items()):
+            lines += [
+                f"# TYPE avroman_demo_{counter} counter",
+                f'avroman_demo_{counter}_total{{worker="{self.worker}"}} {count}',
+            ]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+counters = ServerCounters()
+# ids the registry answered 404 for, so a replayed bad id does not go back to it
+unknown_schema_ids: LRUCache[str] = LRUCache()
+
+
+async def writer_schema(schema_id: int) -> Dict[str, Any]:
+    # Cache hits are answered on the event loop; a miss fetches the schema in
+    # the threadpool, so a slow registry does not stall the other requests.
+    error = unknown_schema_ids.get(schema_id)
+    if error is not None:
+        counters.registry.count(REGISTRY_CACHE_HITS)
+        raise UnknownSchemaError(error)
+
+    client = registry_client(REGISTRY_URL)
+    parsed_contract = client.cached_schema(schema_id)
+    if parsed_contract is not None:
+        counters.registry.count(REGISTRY_CACHE_HITS)
+        return parsed_contract
     try:
-        validate(payload, AvroContract, raise_errors=True, strict=True)
-    except ValidationError as err:
-        error_message, status_code = parse_error(str(err))
-        raise HTTPException(
-            status_code=status_code,
-            detail={
-                "error": error_message,
-                "message": "Schema validation failed",
-                "details": str(err)
-            },
-        )
+        return await run_in_threadpool(client.schema, schema_id, counters.registry)
+    except UnknownSchemaError as err:
+        unknown_schema_ids.put(schema_id, str(err))
+        raise
+
 
 @demo.get("/status")
 def status():
@@ -88,21 +151,60 @@ def status():
         "OK": True
     }
 
+
+@demo.get("/metrics")
+async def metrics() -> Response:
+    return Response(counters.openmetrics_text(), media_type=OPENMETRICS_CONTENT_TYPE)
+
+
 @demo.post("/events/usercreated")
-async def usercreated(request: Request):
+async def usercreated(request: Request) -> Response:
+    start_time = time.perf_counter()
+    content_type = request.headers.get("content-type", "application/json")
+    body = await request.body()
     try:
-        payload = await request.json()
-    except Exception:
-        raise HTTPException(
-            status_code=400,
-            detail={
-                "error": "invalid_json_body",
-                "message": "Request body is not valid JSON"
-            }
-        )
-
-    validate_request(payload)
-
-    return {
-        "OK": True
-    }
+        schema_lookup = None
+        schema_id = confluent_schema_id(body, content_type) if REGISTRY_URL else None
+        if schema_id is not None:
+            writer_contract = await writer_schema(schema_id)
+            schema_lookup = lambda _schema_id: writer_contract
+        payload = decode_payload(body, content_type, AvroContract, contract_fingerprint, schema_lookup)
+    except (EncodingError, RegistryError) as err:
+        status_code, content = 400, _detail({
+            "error": "invalid_avro_body",
+            "message": "Request body is not valid Avro for this schema",
+            "details": str(err)
+        })
+    except ValueError:
+        # json.JSONDecodeError and UnicodeDecodeError; anything else is a server error
+        status_code, content = 400, INVALID_JSON_BODY
+    else:
+        status_code, content = check_payload(payload)
+
+    counters.record(status_code, (time.perf_counter() - start_time) * 1000.0)
+    return Response(content, status_code=status_code, media_type="application/json")
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="AvroMan demo target")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=8080, type=int)
+    parser.add_argument("--workers", default=1, type=int, help="Worker processes, each with its own event loop")
+    parser.add_argument("--registry", default=None, help="Schema registry URL for Confluent-framed bodies (sets AVROMAN_DEMO_REGISTRY)")
+    arguments = parser.parse_args()
+    if arguments.registry:
+        os.environ["AVROMAN_DEMO_REGISTRY"] = arguments.registry
+    uvicorn.run(
+        "api_demos.demo_fastapi:demo",
+        host=arguments.host,
+        port=arguments.port,
+        workers=arguments.workers,
+        log_level="warning",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
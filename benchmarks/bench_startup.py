@@ -0,0 +1,72 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import sys
+import time
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# CLI start-up on top of a bare `python -c pass`, so the budget does not depend
+# on how slow the interpreter itself starts on the machine running it
+STARTUP_BUDGET_MS = 100.0
+COMMANDS: Tuple[Tuple[str, ...], ...] = (
+    ("--help",),
+    ("run", "--help"),
+    ("generate", "--help"),
+)
+# none of these may be imported just to print help
+HEAVY_MODULES = ("fastavro", "numpy", "requests", "rich", "urllib3", "fastapi")
+
+
+def _best_ms(args: Sequence[str], repeat: int) -> float:
+    # the fastest of `repeat` runs; slower runs mostly measure a busy machine
+    best = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        best = min(best, time.perf_counter() - start_time)
+    return best * 1000.0
+
+
+def heavy_imports(args: Sequence[str] = ("--help",)) -> List[str]:
+    # top-level packages from HEAVY_MODULES that `avroman <args>` imported
+    script = (
+        "import sys, runpy\n"
+        f"sys.argv = ['avroman', *{list(args)!r}]\n"
+        "try:\n"
+        "    runpy.run_module('src.avroman', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}} & {set(HEAVY_MODULES)!r})))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    # the last line; the lines above it are the command's own output
+    return output.splitlines()[-1].split() if output.strip() else []
+
+
+def bench_startup(repeat: int = 15) -> Dict[str, float]:
+    interpreter_ms = _best_ms(("-c", "pass"), repeat)
+    results = {"interpreter_ms": interpreter_ms}
+    for command in COMMANDS:
+        results[" ".join(command)] = _best_ms(("-m", "src.avroman", *command), repeat) - interpreter_ms
+    return results
+
+
+if __name__ == "__main__":
+    results = bench_startup()
+    print(f"{'python -c pass':24} {results.pop('interpreter_ms'):8.1f} ms")
+    for command, overhead_ms in results.items():
+        print(f"{'avroman ' + command:24} {overhead_ms:+8.1f} ms")
+    heavy = heavy_imports()
+    print(f"imported for --help      {' '.join(heavy) or '-'}")
+
+    over_budget = [command for command, overhead_ms in results.items() if overhead_ms > STARTUP_BUDGET_MS]
+    if over_budget or heavy:
+        print(f"over the {STARTUP_BUDGET_MS:.0f} ms start-up budget: {', '.join(over_budget) or '-'}")
+        raise SystemExit(1)
@@ -0,0 +1,259 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import sys
+import json
+import time
+import socket
+import random
+import platform
+import subprocess
+import requests
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+from fastavro import parse_schema
+from rich.table import Table
+from rich.console import Console
+from src.utils import is_record_valid, load_bundled_contract, load_contract
+from src.pipeline import RunSettings, build_runner, execute, iter_cases
+from src.batch_payload import generate_valid_batch
+from src.compile_validator import compile_validator
+from src.compile_payload import compile_payload_generator
+from src.generate_payload import generate_invalid_payload, generate_valid_payload
+from src.size_profile import SizeProfile, SizeRange
+from benchmarks.schemas import large_arrays, nested_unions, wide_record
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_VERSION = 1
+
+
+class BenchCase(NamedTuple):
+    name: str
+    parsed_contract: Dict[str, Any]
+    size_profile: SizeProfile | None = None
+    # share of --n-records used for this schema, so heavy payloads finish in similar time
+    weight: float = 1.0
+
+
+def default_cases() -> List[BenchCase]:
+    return [
+        BenchCase("sample", load_bundled_contract()),
+        BenchCase("wide_200", parse_schema(wide_record(200)), weight=0.1),
+        BenchCase("nested_unions", parse_schema(nested_unions(6))),
+        BenchCase("large_arrays", parse_schema(large_arrays()), SizeProfile(items=SizeRange(500, 1000)), weight=0.01),
+    ]
+
+
+def schema_cases(contract_paths: List[Path]) -> List[BenchCase]:
+    return [BenchCase(path.stem, load_contract(path)) for path in contract_paths]
+
+
+def _best_rate(operation: Callable[[], int], repeat: int) -> float:
+    # records/s of the fastest of `repeat` rounds; the slower rounds are mostly noise
+    best = 0.0
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        processed = operation()
+        elapsed_time = time.perf_counter() - start_time
+        if elapsed_time > 0:
+            best = max(best, processed / elapsed_time)
+    return best
+
+
+def bench_case(
+    case: BenchCase,
+    n_records: int = 2000,
+    repeat: int = 3,
+    seed: int = 0
+) -> Dict[str, float]:
+    contract = case.parsed_contract
+    n = max(1, int(n_records * case.weight))
+    payload_generator = compile_payload_generator(contract, case.size_profile)
+    validator = compile_validator(contract)
+    rng = random.Random(seed)
+
+    def interpreted() -> int:
+        for _ in range(n):
+            generate_valid_payload(contract, rng, size_profile=case.size_profile)
+        return n
+
+    def compiled() -> int:
+        for _ in range(n):
+            payload_generator(rng)
+        return n
+
+    def batch() -> int:
+        return len(generate_valid_batch(contract, n, seed, case.size_profile))
+
+    def invalid() -> int:
+        for _ in range(n):
+            generate_invalid_payload(contract, rng, payload_generator)
+        return n
+
+    records = [payload_generator(rng) for _ in range(n)]
+    records += [generate_invalid_payload(contract, rng, payload_generator) for _ in range(n)]
+
+    def fastavro_validation() -> int:
+        for record in records:
+            is_record_valid(contract, record)
+        return len(records)
+
+    def compiled_validation() -> int:
+        for record in records:
+            validator(record)
+        return len(records)
+
+    # every row uses case.size_profile, so the interpreted, compiled and batch rates compare like for like
+    return {
+        "generate_valid": _best_rate(interpreted, repeat),
+        "generate_valid_compiled": _best_rate(compiled, repeat),
+        "generate_valid_batch": _best_rate(batch, repeat),
+        "generate_invalid": _best_rate(invalid, repeat),
+        "is_record_valid": _best_rate(fastavro_validation, repeat),
+        "validate_compiled": _best_rate(compiled_validation, repeat),
+    }
+
+
+def bench_http(
+    url: str,
+    n_requests: int = 1000,
+    concurrency: int = 8,
+    seed: int = 0
+) -> float:
+    # end to end through the same path as `avroman run`: generation, encoding and sends
+    parsed_contract = load_bundled_contract()
+    settings = RunSettings(url=url, concurrency=concurrency)
+    n_valid = n_requests // 2
+    cases = iter_cases(parsed_contract, random.Random(seed), n_valid, n_requests - n_valid)
+
+    with build_runner(parsed_contract, settings) as http_runner:
+        start_time = time.perf_counter()
+        errors = [record.error for record in execute(cases, http_runner.send, concurrency) if record.error is not None]
+        elapsed_time = time.perf_counter() - start_time
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {n_requests} requests failed, first error: {errors[0]}")
+    return n_requests / elapsed_time
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@contextmanager
+def demo_server(startup_timeout_s: float = 15.0) -> Iterator[str]:
+    # api_demos/demo_fastapi.py under uvicorn on a free local port; yields its event URL
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api_demos.demo_fastapi:demo", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=REPO_ROOT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.perf_counter() + startup_timeout_s
+        while True:
+            try:
+                requests.get(f"{base_url}/status", timeout=1.0)
+                break
+            except requests.ConnectionError:
+                if process.poll() is not None or time.perf_counter() > deadline:
+                    raise RuntimeError("Demo server did not start.")
+                time.sleep(0.1)
+        yield f"{base_url}/events/usercreated"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_suite(
+    cases: List[BenchCase],
+    n_records: int = 2000,
+    repeat: int = 3,
+    seed: int = 0,
+    url: str | None = None,
+    n_requests: int = 1000,
+    concurrency: int = 8
+) -> Dict[str, float]:
+    # flat "<schema>/<metric>" -> records/s (req/s for http), the unit baselines are kept in
+    results: Dict[str, float] = {}
+    for case in cases:
+        for metric, rate in bench_case(case, n_records, repeat, seed).items():
+            results[f"{case.name}/{metric}"] = rate
+    if url is not None:
+        results["sample/http_end_to_end"] = bench_http(url, n_requests, concurrency, seed)
+    return results
+
+
+def save_baseline(
+    path: Path,
+    results: Dict[str, float],
+    settings: Dict[str, Any]
+) -> None:
+    path.write_text(json.dumps({
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": time.time(),
+        "settings": settings,
+        "results": results,
+    }, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}: {data.get('version')}")
+    return data["results"]
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = 0.1
+) -> List[Tuple[str, float | None, float, float | None, bool]]:
+    # (benchmark, baseline rate, current rate, relative change, regressed); higher is better
+    rows = []
+    for name, rate in results.items():
+        before = baseline.get(name)
+        change = (rate - before) / before if before else None
+        rows.append((name, before, rate, change, change is not None and change < -threshold))
+    return rows
+
+
+def render(
+    results: Dict[str, float],
+    baseline: Dict[str, float] | None = None,
+    threshold: float = 0.1
+) -> int:
+    # prints the results table and returns the number of regressions
+    console = Console(width=140)
+    table = Table(title="Benchmarks (records/s, higher is better)", expand=True)
+    table.add_column("benchmark", no_wrap=True)
+    if baseline is not None:
+        table.add_column("baseline", justify="right", no_wrap=True)
+    table.add_column("current", justify="right", no_wrap=True)
+    if baseline is not None:
+        table.add_column("change", justify="right", no_wrap=True)
+
+    regressions = 0
+    for name, before, rate, change, regressed in compare(results, baseline or {}, threshold):
+        if baseline is None:
+            table.add_row(name, f"{rate:,.0f}")
+            continue
+        regressions += regressed
+        change_text = "-" if change is None else f"{100.0 * change:+.1f}%"
+        table.add_row(
+            name,
+            "-" if before is None else f"{before:,.0f}",
+            f"{rate:,.0f}",
+            f"[red]{change_text}[/red]" if regressed else change_text,
+        )
+
+    console.print(table)
+    if baseline is not None:
+        console.print(f"Regressions beyond {100.0 * threshold:g}%: {regressions}")
+    return regressions
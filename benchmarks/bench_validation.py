@@ -0,0 +1,71 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import sys
+import time
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from fastavro.validation import validate
+from src.utils import load_contract
+from src.compile_validator import compile_validator
+from src.compile_payload import compile_payload_generator
+from src.generate_payload import generate_invalid_payload
+
+
+def _fastavro_validate(parsed_contract: Dict[str, Any]) -> Callable[[Any], bool]:
+    def check(record: Any) -> bool:
+        try:
+            return bool(validate(record, parsed_contract))
+        except Exception:
+            return False
+    return check
+
+
+def _records_per_second(check: Callable[[Any], Any], records: List[Any], repeat: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for record in records:
+            check(record)
+    elapsed_time = time.perf_counter() - start_time
+    return len(records) * repeat / elapsed_time if elapsed_time > 0 else 0.0
+
+
+def bench_validation(
+    contract_path: str | Path,
+    n_records: int = 2000,
+    repeat: int = 5,
+    seed: int = 0
+) -> Dict[str, float]:
+    parsed_contract = load_contract(contract_path)
+    payload_generator = compile_payload_generator(parsed_contract)
+    rng = random.Random(seed)
+
+    valid_records = [payload_generator(rng) for _ in range(n_records)]
+    invalid_records = [generate_invalid_payload(parsed_contract, rng, payload_generator) for _ in range(n_records)]
+
+    fastavro_check = _fastavro_validate(parsed_contract)
+    compiled_validator = compile_validator(parsed_contract)
+
+    def compiled_check(record: Any) -> bool:
+        return compiled_validator(record) is None
+
+    for record in valid_records + invalid_records:
+        if fastavro_check(record) != compiled_check(record):
+            raise AssertionError(f"Validators disagree on {record!r}")
+
+    return {
+        "fastavro_valid_rps": _records_per_second(fastavro_check, valid_records, repeat),
+        "compiled_valid_rps": _records_per_second(compiled_check, valid_records, repeat),
+        "fastavro_invalid_rps": _records_per_second(fastavro_check, invalid_records, repeat),
+        "compiled_invalid_rps": _records_per_second(compiled_check, invalid_records, repeat),
+    }
+
+
+if __name__ == "__main__":
+    results = bench_validation(sys.argv[1] if len(sys.argv) > 1 else "src/contracts/sample.avsc")
+    for name, value in results.items():
+        print(f"{name:24} {value:12,.0f} records/s")
+    print(f"speedup (valid)          {results['compiled_valid_rps'] / results['fastavro_valid_rps']:12.1f}x")
+    print(f"speedup (invalid)        {results['compiled_invalid_rps'] / results['fastavro_invalid_rps']:12.1f}x")
@@ -0,0 +1,73 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+_WIDE_FIELD_TYPES: List[Any] = [
+    "string",
+    "int",
+    "long",
+    "double",
+    "boolean",
+    ["null", "string"],
+    ["null", "long"],
+    {"type": "array", "items": "int"},
+]
+
+
+def wide_record(n_fields: int = 200) -> Dict[str, Any]:
+    # flat record; every 25th field is an enum so the named-type path is covered too
+    fields: List[Dict[str, Any]] = []
+    for index in range(n_fields):
+        if index % 25 == 24:
+            field_type: Any = {"type": "enum", "name": f"Choice{index}", "symbols": ["a", "b", "c", "d"]}
+        else:
+            field_type = _WIDE_FIELD_TYPES[index % len(_WIDE_FIELD_TYPES)]
+        fields.append({"name": f"field_{index:03d}", "type": field_type})
+    return {"type": "record", "name": "Wide", "namespace": "bench", "fields": fields}
+
+
+def nested_unions(depth: int = 6) -> Dict[str, Any]:
+    # Level0.child -> [null, string, long, Level1] -> ... -> Level<depth>
+    contract: Dict[str, Any] = {
+        "type": "record",
+        "name": f"Level{depth}",
+        "fields": [{"name": "leaf", "type": ["null", "string", "double"]}],
+    }
+    for level in range(depth - 1, -1, -1):
+        contract = {
+            "type": "record",
+            "name": f"Level{level}",
+            "fields": [
+                {"name": "id", "type": "long"},
+                {"name": "tag", "type": ["null", {"type": "enum", "name": f"Tag{level}", "symbols": ["x", "y"]}]},
+                {"name": "child", "type": ["null", "string", "long", contract]},
+            ],
+        }
+    contract["namespace"] = "bench"
+    return contract
+
+
+def large_arrays() -> Dict[str, Any]:
+    # sized by the bench size profile (items 500-1000), not by the schema
+    return {
+        "type": "record",
+        "name": "Arrays",
+        "namespace": "bench",
+        "fields": [
+            {"name": "ids", "type": {"type": "array", "items": "long"}},
+            {"name": "labels", "type": {"type": "array", "items": "string"}},
+            {
+                "name": "points",
+                "type": {
+                    "type": "array",
+                    "items": {
+                        "type": "record",
+                        "name": "Point",
+                        "fields": [{"name": "x", "type": "double"}, {"name": "y", "type": "double"}],
+                    },
+                },
+            },
+        ],
+    }
@@ -0,0 +1,12 @@
+# Created by AG on 18-10-2026
+
+# Names shared by the CLI options and the modules behind them. Nothing is
+# imported here, so `avroman --help` can build its options without loading them.
+
+JSON = "json"
+AVRO_BINARY = "avro-binary"
+AVRO_SINGLE_OBJECT = "avro-single-object"
+CONFLUENT = "confluent"
+ENCODINGS = (JSON, AVRO_BINARY, AVRO_SINGLE_OBJECT, CONFLUENT)
+
+DEFAULT_REGISTRY_PORT = 8081
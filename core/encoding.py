@@ -0,0 +1,363 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import io
+import json
+import base64
+import binascii
+import struct
+import threading
+from typing import Any, Callable, Dict, Tuple
+from fastavro import schemaless_reader, schemaless_writer
+from fastavro.schema import fingerprint, to_parsing_canonical_form
+from core.constants import AVRO_BINARY, AVRO_SINGLE_OBJECT, CONFLUENT, ENCODINGS, JSON
+
+CONTENT_TYPES = {
+    JSON: "application/json",
+    AVRO_BINARY: "avro/binary",
+    AVRO_SINGLE_OBJECT: "application/vnd.apache.avro.single-object",
+    CONFLUENT: "application/vnd.confluent.avro",
+}
+ENCODING_BY_CONTENT_TYPE = {
+    content_type: encoding for encoding, content_type in CONTENT_TYPES.items()
+}
+
+SINGLE_OBJECT_MARKER = b"\xc3\x01"
+CONFLUENT_MAGIC_BYTE = b"\x00"
+
+Converter = Callable[[Any], Any]
+
+
+class EncodingError(ValueError):
+    pass
+
+
+def schema_fingerprint(parsed_contract: Dict[str, Any]) -> bytes:
+    return bytes.fromhex(fingerprint(to_parsing_canonical_form(parsed_contract), "CRC-64-AVRO"))
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _decode_b64(value: Any) -> Any:
+    # text that is not base64 stays text, so validating it still reports a type mismatch
+    if not isinstance(value, str):
+        return value
+    try:
+        return base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return value
+
+
+def _encode_b64(value: Any) -> Any:
+    return base64.b64encode(value).decode("ascii") if isinstance(value, (bytes, bytearray)) else value
+
+
+def _contains_bytes(contract: Any, named_schemas: Dict[str, Any], seen: set) -> bool:
+    if isinstance(contract, list):
+        return any(_contains_bytes(branch, named_schemas, seen) for branch in contract)
+    if isinstance(contract, str):
+        if contract == "bytes":
+            return True
+        if contract in named_schemas and contract not in seen:
+            seen.add(contract)
+            return _contains_bytes(named_schemas[contract], named_schemas, seen)
+        return False
+    if not isinstance(contract, dict):
+        return False
+
+    data_type = contract.get("type")
+    if data_type in ("bytes", "fixed"):
+        return True
+    if data_type == "record":
+        seen.add(contract.get("name"))
+        return any(_contains_bytes(field["type"], named_schemas, seen) for field in contract.get("fields", []))
+    if data_type == "array":
+        return _contains_bytes(contract["items"], named_schemas, seen)
+    if data_type == "map":
+        return _contains_bytes(contract["values"], named_schemas, seen)
+    if isinstance(data_type, (str, list)):
+        return _contains_bytes(data_type, named_schemas, seen)
+    return False
+
+
+def _resolved(contract: Any, named_schemas: Dict[str, Any]) -> Any:
+    # a union branch as a schema: named references replaced by their definition,
+    # {"type": "bytes", ...} wrappers by what they wrap
+    if isinstance(contract, str):
+        return named_schemas.get(contract, contract)
+    if isinstance(contract, dict) and isinstance(contract.get("type"), str) \
+            and contract["type"] not in ("record", "enum", "fixed", "array", "map"):
+        return contract["type"]
+    return contract
+
+
+def _branch_type(contract: Any, named_schemas: Dict[str, Any]) -> Any:
+    contract = _resolved(contract, named_schemas)
+    return contract.get("type") if isinstance(contract, dict) else contract
+
+
+def _compile_union_converter(
+    branches: list,
+    named_schemas: Dict[str, Any],
+    compiled: Dict[str, Converter | None],
+    leaf: Converter
+) -> Converter:
+    # One converter per branch, picked by the value's shape: dicts go to the record
+    # whose fields cover their keys (else the map), lists to the array, text and
+    # bytes to the bytes/fixed branch. Text stays text where a string branch or an
+    # enum symbol can explain it.
+    converters = [
+        (_branch_type(branch, named_schemas), _resolved(branch, named_schemas),
+         _compile_bytes_converter(branch, named_schemas, compiled, leaf))
+        for branch in branches
+    ]
+    if all(converter is _identity for _, _, converter in converters):
+        return _identity
+
+    records = [
+        ({field["name"] for field in contract.get("fields", [])}, converter)
+        for branch_type, contract, converter in converters if branch_type == "record"
+    ]
+    convert_map = next((converter for branch_type, _, converter in converters if branch_type == "map"), None)
+    convert_array = next((converter for branch_type, _, converter in converters if branch_type == "array"), _identity)
+    convert_scalar = next(
+        (converter for branch_type, _, converter in converters if branch_type in ("bytes", "fixed")), _identity
+    )
+    keeps_text = leaf is _decode_b64 and any(branch_type == "string" for branch_type, _, _ in converters)
+    symbols = {
+        symbol for branch_type, contract, _ in converters if branch_type == "enum" for symbol in contract.get("symbols", [])
+    }
+
+    def convert_union(value: Any) -> Any:
+        if isinstance(value, dict):
+            for field_names, convert_record in records:
+                if value.keys() <= field_names:
+                    return convert_record(value)
+            if convert_map is not None:
+                return convert_map(value)
+            return records[0][1](value) if records else value
+        if isinstance(value, list):
+            return convert_array(value)
+        if isinstance(value, str) and (keeps_text or value in symbols):
+            return value
+        return convert_scalar(value)
+    return convert_union
+
+
+def _compile_record_converter(
+    contract: Dict[str, Any],
+    named_schemas: Dict[str, Any],
+    compiled: Dict[str, Converter | None],
+    leaf: Converter
+) -> Converter:
+    fields = [
+        (field["name"], _compile_bytes_converter(field["type"], named_schemas, compiled, leaf))
+        for field in contract.get("fields", [])
+    ]
+    fields = [(name, converter) for name, converter in fields if converter is not _identity]
+    if not fields:
+        return _identity
+
+    def convert_record(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        converted = dict(value)
+        for name, converter in fields:
+            if name in converted:
+                converted[name] = converter(converted[name])
+        return converted
+    return convert_record
+
+
+def _compile_named_converter(
+    name: str,
+    contract: Dict[str, Any],
+    named_schemas: Dict[str, Any],
+    compiled: Dict[str, Converter | None],
+    leaf: Converter
+) -> Converter:
+    # Compiled once per name. A reference met while its record is still being
+    # compiled (a recursive type) calls through `compiled`, which holds the
+    # finished converter by the time any value reaches it.
+    if name in compiled:
+        converter = compiled[name]
+        if converter is None:
+            def convert_recursive(value: Any) -> Any:
+                return compiled[name](value)
+            return convert_recursive
+        return converter
+
+    if not _contains_bytes(contract, named_schemas, set()):
+        compiled[name] = _identity
+        return _identity
+    compiled[name] = None
+    converter = compiled[name] = _compile_record_converter(contract, named_schemas, compiled, leaf)
+    return converter
+
+
+def _compile_bytes_converter(
+    contract: Any,
+    named_schemas: Dict[str, Any],
+    compiled: Dict[str, Converter | None],
+    leaf: Converter
+) -> Converter:
+    # payloads carry bytes/fixed as base64 text for JSON; Avro binary carries raw bytes.
+    if isinstance(contract, list):
+        return _compile_union_converter(contract, named_schemas, compiled, leaf)
+
+    if isinstance(contract, str):
+        if contract == "bytes":
+            return leaf
+        if contract in named_schemas:
+            return _compile_bytes_converter(named_schemas[contract], named_schemas, compiled, leaf)
+        return _identity
+
+    if not isinstance(contract, dict):
+        return _identity
+
+    data_type = contract.get("type")
+    if data_type in ("bytes", "fixed"):
+        return leaf
+
+    if data_type == "record":
+        return _compile_named_converter(contract.get("name"), contract, named_schemas, compiled, leaf)
+
+    if data_type == "array":
+        convert_item = _compile_bytes_converter(contract["items"], named_schemas, compiled, leaf)
+        if convert_item is _identity:
+            return _identity
+
+        def convert_array(value: Any) -> Any:
+            return [convert_item(item) for item in value] if isinstance(value, list) else value
+        return convert_array
+
+    if data_type == "map":
+        convert_value = _compile_bytes_converter(contract["values"], named_schemas, compiled, leaf)
+        if convert_value is _identity:
+            return _identity
+
+        def convert_map(value: Any) -> Any:
+            return {key: convert_value(item) for key, item in value.items()} if isinstance(value, dict) else value
+        return convert_map
+
+    if isinstance(data_type, (str, list)):
+        return _compile_bytes_converter(data_type, named_schemas, compiled, leaf)
+    return _identity
+
+
+def _named_schemas(parsed_contract: Any) -> Dict[str, Any]:
+    return parsed_contract.get("__named_schemas", {}) if isinstance(parsed_contract, dict) else {}
+
+
+def is_identity(converter: Converter) -> bool:
+    # true for the converters of schemas without bytes/fixed, which return values unchanged
+    return converter is _identity
+
+
+def to_avro_converter(parsed_contract: Any) -> Converter:
+    return _compile_bytes_converter(parsed_contract, _named_schemas(parsed_contract), {}, _decode_b64)
+
+
+def from_avro_converter(parsed_contract: Any) -> Converter:
+    return _compile_bytes_converter(parsed_contract, _named_schemas(parsed_contract), {}, _encode_b64)
+
+
+class PayloadEncoder:
+    def __init__(
+        self,
+        parsed_contract: Dict[str, Any],
+        encoding: str = JSON,
+        schema_id: int = 1,
+        validator: Callable[[Any], Any] | None = None
+    ) -> None:
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding}")
+
+        self.parsed_contract = parsed_contract
+        self.encoding = encoding
+        self.content_type = CONTENT_TYPES[encoding]
+        self.fingerprint = schema_fingerprint(parsed_contract)
+        self.validator = validator
+
+        if encoding == AVRO_SINGLE_OBJECT:
+            self.prefix = SINGLE_OBJECT_MARKER + self.fingerprint
+        elif encoding == CONFLUENT:
+            self.prefix = CONFLUENT_MAGIC_BYTE + struct.pack(">I", schema_id)
+        else:
+            self.prefix = b""
+
+        self._to_avro = to_avro_converter(parsed_contract)
+        self._buffers = threading.local()
+
+    def _buffer(self) -> io.BytesIO:
+        buffer = getattr(self._buffers, "buffer", None)
+        if buffer is None:
+            buffer = self._buffers.buffer = io.BytesIO()
+        buffer.seek(0)
+        buffer.truncate()
+        return buffer
+
+    def encode(self, payload: Any) -> Tuple[bytes, str]:
+        if self.encoding == JSON:
+            return json.dumps(payload, separators=(",", ":")).encode("utf-8"), self.content_type
+
+        datum = self._to_avro(payload)
+        if self.validator is not None:
+            reason = self.validator(datum)
+            if reason is not None:
+                raise EncodingError(f"Payload does not match the schema: {reason}")
+
+        buffer = self._buffer()
+        buffer.write(self.prefix)
+        try:
+            schemaless_writer(buffer, self.parsed_contract, datum)
+        except Exception as err:
+            raise EncodingError(str(err)) from err
+        return buffer.getvalue(), self.content_type
+
+
+def _content_encoding(content_type: str) -> str | None:
+    return ENCODING_BY_CONTENT_TYPE.get(content_type.split(";", 1)[0].strip().lower())
+
+
+def confluent_schema_id(body: bytes, content_type: str) -> int | None:
+    # the registry id in a Confluent header; None for other encodings or a short header
+    if _content_encoding(content_type) != CONFLUENT or body[:1] != CONFLUENT_MAGIC_BYTE or len(body) < 5:
+        return None
+    return struct.unpack(">I", body[1:5])[0]
+
+
+def decode_payload(
+    body: bytes,
+    content_type: str,
+    parsed_contract: Dict[str, Any],
+    expected_fingerprint: bytes | None = None,
+    schema_lookup: Callable[[int], Dict[str, Any]] | None = None
+) -> Any:
+    # schema_lookup: Confluent schema id -> writer schema, resolved against parsed_contract
+    encoding = _content_encoding(content_type)
+    if encoding is None or encoding == JSON:
+        return json.loads(body)
+
+    offset = 0
+    if encoding == AVRO_SINGLE_OBJECT:
+        if body[:2] != SINGLE_OBJECT_MARKER:
+            raise EncodingError("Missing single-object encoding marker")
+        if expected_fingerprint is not None and body[2:10] != expected_fingerprint:
+            raise EncodingError("Unknown schema fingerprint")
+        offset = 10
+    elif encoding == CONFLUENT:
+        if body[:1] != CONFLUENT_MAGIC_BYTE or len(body) < 5:
+            raise EncodingError("Missing Confluent wire format header")
+        offset = 5
+
+    try:
+        if encoding == CONFLUENT and schema_lookup is not None:
+            writer_contract = schema_lookup(struct.unpack(">I", body[1:5])[0])
+            return schemaless_reader(io.BytesIO(body[offset:]), writer_contract, parsed_contract)
+        return schemaless_reader(io.BytesIO(body[offset:]), parsed_contract, None)
+    except Exception as err:
+        raise EncodingError(str(err)) from err
@@ -0,0 +1,101 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, Tuple, TypeVar
+
+Case = TypeVar("Case")
+Outcome = TypeVar("Outcome")
+
+_EXHAUSTED = object()
+
+
+def in_flight_window(
+    concurrency: int,
+    max_in_flight: int | None = None,
+    rps: float | None = None
+) -> int:
+    # Queued + running requests. An explicit bound below concurrency would leave
+    # workers idle, so it is rejected; the default is 2 x concurrency, and at
+    # least 10 s of sends in open-loop mode.
+    if max_in_flight is not None:
+        if max_in_flight < concurrency:
+            raise ValueError(f"max_in_flight ({max_in_flight}) must be at least concurrency ({concurrency})")
+        return max_in_flight
+    if rps is not None:
+        return max(concurrency * 2, int(rps * 10))
+    return concurrency * 2
+
+
+def dispatch(
+    cases: Iterable[Case],
+    send: Callable[[Case], Outcome],
+    concurrency: int = 1,
+    max_in_flight: int | None = None
+) -> Iterator[Tuple[Case, Outcome]]:
+    # cases are pulled lazily from the calling thread, so whatever produces them
+    # (and its rng) runs in a fixed order no matter how responses interleave.
+    window = in_flight_window(concurrency, max_in_flight)
+    if concurrency <= 1:
+        for case in cases:
+            yield case, send(case)
+        return
+
+    in_flight: Deque[Tuple[Case, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="avroman-send") as pool:
+        for case in cases:
+            if len(in_flight) >= window:
+                head_case, head_future = in_flight.popleft()
+                yield head_case, head_future.result()
+            in_flight.append((case, pool.submit(send, case)))
+
+        while in_flight:
+            head_case, head_future = in_flight.popleft()
+            yield head_case, head_future.result()
+
+
+def dispatch_open_loop(
+    cases: Iterable[Case],
+    send: Callable[[Case, float], Outcome],
+    rps: float,
+    concurrency: int = 1,
+    duration_s: float | None = None,
+    max_in_flight: int | None = None
+) -> Iterator[Tuple[Case, Outcome]]:
+    # sends are released on a fixed timeline (start + i / rps) whether or not
+    # earlier requests have returned; send() gets the scheduled time so latency
+    # includes any queueing behind a slow endpoint.
+    interval = 1.0 / rps
+    window = in_flight_window(concurrency, max_in_flight, rps)
+    in_flight: Deque[Tuple[Case, Future]] = deque()
+    case_iterator = iter(cases)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="avroman-send") as pool:
+        start_time = time.perf_counter()
+        index = 0
+        while True:
+            scheduled_at = start_time + index * interval
+            if duration_s is not None and scheduled_at - start_time >= duration_s:
+                break
+
+            while in_flight and (in_flight[0][1].done() or len(in_flight) >= window):
+                head_case, head_future = in_flight.popleft()
+                yield head_case, head_future.result()
+
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            case = next(case_iterator, _EXHAUSTED)
+            if case is _EXHAUSTED:
+                break
+            in_flight.append((case, pool.submit(send, case, scheduled_at)))
+            index += 1
+
+        while in_flight:
+            head_case, head_future = in_flight.popleft()
+            yield head_case, head_future.result()
@@ -0,0 +1,122 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List
+
+
+class LatencyHistogram:
+    # Log-bucketed histogram: every bucket is `precision` wider than the one
+    # below it, so quantiles carry a bounded relative error and the bucket
+    # count is fixed by (lowest, highest, precision) regardless of sample count.
+    def __init__(
+        self,
+        lowest_ms: float = 0.001,
+        highest_ms: float = 3_600_000.0,
+        precision: float = 0.01
+    ) -> None:
+        self.lowest_ms = lowest_ms
+        self.highest_ms = highest_ms
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self._max_index = self._index(highest_ms)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.sum_squares_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def _index(self, value_ms: float) -> int:
+        if value_ms <= self.lowest_ms:
+            return 0
+        return int(math.log(value_ms / self.lowest_ms) / self._log_base) + 1
+
+    def _upper_bound(self, index: int) -> float:
+        return self.lowest_ms * math.exp(index * self._log_base)
+
+    def record(self, value_ms: float) -> None:
+        value_ms = max(0.0, value_ms)
+        index = min(self._index(value_ms), self._max_index)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.sum_squares_ms += value_ms * value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if (other.lowest_ms, other.highest_ms, other.precision) != (self.lowest_ms, self.highest_ms, self.precision):
+            raise ValueError("Cannot merge histograms with different bucket layouts.")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.sum_squares_ms += other.sum_squares_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_ms / self.count if self.count else 0.0
+
+    @property
+    def stddev_ms(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.sum_squares_ms - self.sum_ms * self.sum_ms / self.count) / (self.count - 1)
+        return math.sqrt(max(0.0, variance))
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._upper_bound(index), self.min_ms), self.max_ms)
+        return self.max_ms
+
+    def cumulative_counts(self, bounds_ms: Iterable[float]) -> List[int]:
+        # samples at or below each bound, to bucket precision
+        ordered = sorted(self.counts.items())
+        cumulative: List[int] = []
+        position = seen = 0
+        for bound in bounds_ms:
+            while position < len(ordered) and self._upper_bound(ordered[position][0]) <= bound:
+                seen += ordered[position][1]
+                position += 1
+            cumulative.append(seen)
+        return cumulative
+
+    def percentiles(self, percents: Iterable[float]) -> Dict[float, float]:
+        return {percent: self.percentile(percent) for percent in percents}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lowest_ms": self.lowest_ms,
+            "highest_ms": self.highest_ms,
+            "precision": self.precision,
+            "counts": {str(index): count for index, count in self.counts.items()},
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "sum_squares_ms": self.sum_squares_ms,
+            "min_ms": self.min_ms if self.count else None,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data["lowest_ms"], data["highest_ms"], data["precision"])
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.sum_ms = data["sum_ms"]
+        histogram.sum_squares_ms = data["sum_squares_ms"]
+        histogram.min_ms = data["min_ms"] if data["min_ms"] is not None else math.inf
+        histogram.max_ms = data["max_ms"]
+        return histogram
@@ -0,0 +1,151 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+import time
+import threading
+import requests
+from typing import Any, Dict
+from core.encoding import EncodingError, PayloadEncoder
+from core.phases import NETWORK, SERIALIZE, PhaseTimer
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# The requests/urllib3 side of the runner, apart from core.runner so that
+# records, statistics and sinks can be used without loading an HTTP client.
+
+_connect_clock = threading.local()
+
+
+def _reset_connect_clock() -> None:
+    _connect_clock.elapsed_ms = 0.0
+
+
+def _read_connect_clock() -> float:
+    return getattr(_connect_clock, "elapsed_ms", 0.0)
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        start_time = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_clock.elapsed_ms = _read_connect_clock() + (time.perf_counter() - start_time) * 1000.0
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        start_time = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_clock.elapsed_ms = _read_connect_clock() + (time.perf_counter() - start_time) * 1000.0
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool
+        }
+
+
+def _json_body(payload: Any) -> bytes:
+    return json.dumps(payload, allow_nan=False).encode("utf-8")
+
+
+class HttpRunner:
+    def __init__(
+        self,
+        url: str,
+        http_method: str = "POST",
+        headers: Dict[str, str] | None = None,
+        timeout: float = 10.0,
+        pool_size: int = 10,
+        encoder: PayloadEncoder | None = None,
+        phases: PhaseTimer | None = None
+    ) -> None:
+        self.url = url
+        self.http_method = http_method.upper()
+        self.timeout = timeout
+        self.encoder = encoder
+        self.phases = phases
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive"
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+        adapter = _TimedAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request_body(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # serialized here rather than by requests' json= so it can be timed on its own
+        if self.encoder is None:
+            return {"data": _json_body(payload)}
+        try:
+            body, content_type = self.encoder.encode(payload)
+        except EncodingError:
+            return {"data": _json_body(payload), "headers": {"Content-Type": "application/json"}}
+        return {"data": body, "headers": {"Content-Type": content_type}}
+
+    def send(
+        self,
+        payload: Dict[str, Any],
+        scheduled_at: float | None = None
+    ) -> tuple[int | None, float, float, str | None, str | None]:
+        _reset_connect_clock()
+        serialize_start = time.perf_counter()
+        start_time = serialize_start if scheduled_at is None else scheduled_at
+
+        try:
+            request_body = self._request_body(payload)
+            if self.phases is not None:
+                self.phases.add(SERIALIZE, time.perf_counter() - serialize_start)
+            if scheduled_at is None:
+                start_time = time.perf_counter()
+            response = self.session.request(
+                method=self.http_method,
+                url=self.url,
+                timeout=self.timeout,
+                **request_body
+            )
+
+            response_block = (response.text or "")[:500]
+            total_time = (time.perf_counter() - start_time) * 1000.0
+            connect_time = _read_connect_clock()
+            if self.phases is not None:
+                self.phases.add(NETWORK, total_time / 1000.0)
+            return response.status_code, total_time - connect_time, connect_time, None, response_block
+
+        except Exception as err:
+            total_time = (time.perf_counter() - start_time) * 1000.0
+            connect_time = _read_connect_clock()
+            if self.phases is not None:
+                self.phases.add(NETWORK, total_time / 1000.0)
+            return None, total_time - connect_time, connect_time, str(err), None
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HttpRunner":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
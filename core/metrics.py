@@ -0,0 +1,119 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import time
+import threading
+from typing import Any, List
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.histogram import LatencyHistogram
+from core.statistics import RunStatistics
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# Prometheus-style bucket bounds in seconds; counts come from the log buckets
+# of LatencyHistogram, so each bound is exact to the histogram's precision.
+LATENCY_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def histogram_lines(metric: str, histogram: LatencyHistogram, labels: str = "") -> List[str]:
+    # `labels` is the rendered label set without braces, e.g. 'kind="valid"'
+    prefix = f"{labels}," if labels else ""
+    suffix = f"{{{labels}}}" if labels else ""
+    lines: List[str] = []
+    cumulative = histogram.cumulative_counts(1000.0 * bound for bound in LATENCY_BUCKETS_S)
+    for bound, count in zip(LATENCY_BUCKETS_S, cumulative):
+        lines.append(f'{metric}_bucket{{{prefix}le="{bound:g}"}} {count}')
+    lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+    lines.append(f"{metric}_sum{suffix} {histogram.sum_ms / 1000.0}")
+    return lines
+
+
+def openmetrics_text(statistics: RunStatistics) -> str:
+    lines: List[str] = [
+        "# TYPE avroman_requests counter",
+        "# HELP avroman_requests Requests sent, by response status ('-' for transport errors).",
+    ]
+    for status, count in sorted(statistics.status_counts.items()):
+        lines.append(f'avroman_requests_total{{status="{label_value(status)}"}} {count}')
+    lines += [
+        "# TYPE avroman_unexpected counter",
+        "# HELP avroman_unexpected Cases whose outcome did not match the expectation.",
+        f"avroman_unexpected_total {statistics.unexpected}",
+        "# TYPE avroman_errors counter",
+        "# HELP avroman_errors Requests that failed without a response.",
+        f"avroman_errors_total {statistics.errors}",
+        "# TYPE avroman_request_latency_seconds histogram",
+        "# HELP avroman_request_latency_seconds Request latency, by case kind.",
+    ]
+    for kind, histogram in sorted(statistics.latency_by_kind.items()):
+        lines += histogram_lines("avroman_request_latency_seconds", histogram, f'kind="{kind}"')
+    if statistics.phases.total_s:
+        lines += [
+            "# TYPE avroman_phase_seconds counter",
+            "# HELP avroman_phase_seconds Time spent per pipeline phase.",
+        ]
+        for phase, total in sorted(statistics.phases.total_s.items()):
+            lines.append(f'avroman_phase_seconds_total{{phase="{phase}"}} {total}')
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    # Serves the latest OpenMetrics snapshot on /metrics from a daemon thread.
+    # The text is rendered on update(), in the thread that owns the statistics,
+    # and at most once per refresh interval; scrapes only read the cached bytes.
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        refresh_interval_s: float = 1.0
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.refresh_interval_s = refresh_interval_s
+        self._body = openmetrics_text(RunStatistics()).encode("utf-8")
+        self._last_refresh = 0.0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics._body
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+
+    def update(self, statistics: RunStatistics, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self._last_refresh < self.refresh_interval_s:
+            return
+        self._last_refresh = now
+        self._body = openmetrics_text(statistics).encode("utf-8")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
@@ -0,0 +1,124 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import time
+import pstats
+import cProfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+PARSE_SCHEMA = "parse_schema"
+GENERATE = "generate"
+VALIDATE = "validate"
+MUTATE = "mutate"
+SERIALIZE = "serialize"
+NETWORK = "network"
+RENDER = "render"
+REGISTRY = "registry"
+PHASES = (PARSE_SCHEMA, REGISTRY, GENERATE, VALIDATE, MUTATE, SERIALIZE, NETWORK, RENDER)
+
+VALIDATION_RETRIES = "validation_retries"
+FAILED_RECORDS = "failed_records"
+# requests sent to the schema registry, and schema/id resolutions served from or missing its cache
+REGISTRY_LOOKUPS = "registry_lookups"
+REGISTRY_CACHE_HITS = "registry_cache_hits"
+REGISTRY_CACHE_MISSES = "registry_cache_misses"
+
+
+class PhaseTimer:
+    # Cumulative time, call count and slowest call per phase, plus plain counters.
+    # Sends record from the pool threads, so updates take a lock; phases run
+    # concurrently with --concurrency > 1 and can add up to more than wall time.
+    def __init__(self) -> None:
+        self.total_s: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.max_s: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, elapsed_s: float) -> None:
+        with self._lock:
+            self.total_s[phase] = self.total_s.get(phase, 0.0) + elapsed_s
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+            if elapsed_s > self.max_s.get(phase, 0.0):
+                self.max_s[phase] = elapsed_s
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start_time)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def mean_ms(self, phase: str) -> float:
+        calls = self.calls.get(phase, 0)
+        return 1000.0 * self.total_s.get(phase, 0.0) / calls if calls else 0.0
+
+    def merge(self, other: "PhaseTimer") -> "PhaseTimer":
+        with self._lock:
+            for phase, total in other.total_s.items():
+                self.total_s[phase] = self.total_s.get(phase, 0.0) + total
+                self.calls[phase] = self.calls.get(phase, 0) + other.calls.get(phase, 0)
+                self.max_s[phase] = max(self.max_s.get(phase, 0.0), other.max_s.get(phase, 0.0))
+            for counter, amount in other.counters.items():
+                self.counters[counter] = self.counters.get(counter, 0) + amount
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        return {
+            "phases": {
+                phase: {
+                    "calls": self.calls[phase],
+                    "total_s": self.total_s[phase],
+                    "mean_ms": self.mean_ms(phase),
+                    "max_ms": 1000.0 * self.max_s.get(phase, 0.0),
+                }
+                for phase in self.total_s
+            },
+            "counters": dict(self.counters),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PhaseTimer":
+        timer = cls()
+        for phase, entry in data["phases"].items():
+            timer.total_s[phase] = entry["total_s"]
+            timer.calls[phase] = entry["calls"]
+            timer.max_s[phase] = entry["max_ms"] / 1000.0
+        timer.counters = dict(data["counters"])
+        return timer
+
+
+@contextmanager
+def profiled(
+    profile_path: Path | None,
+    report_lines: int = 40
+) -> Iterator[None]:
+    # cProfile of the calling thread: writes pstats data to profile_path (for
+    # snakeviz, `python -m pstats`, ...) and the top functions by cumulative
+    # time to <profile_path>.txt.
+    if profile_path is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
+        with Path(f"{profile_path}.txt").open("w", encoding="utf-8") as report:
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(report_lines)
@@ -0,0 +1,344 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+import threading
+import requests
+from functools import lru_cache
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+from typing import Any, Callable, Dict, Generic, Hashable, List, Tuple, TypeVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fastavro import parse_schema
+from fastavro.schema import SchemaParseException, to_parsing_canonical_form
+from core.constants import DEFAULT_REGISTRY_PORT
+from core.phases import REGISTRY, REGISTRY_CACHE_HITS, REGISTRY_CACHE_MISSES, REGISTRY_LOOKUPS, PhaseTimer
+
+REGISTRY_CONTENT_TYPE = "application/vnd.schemaregistry.v1+json"
+
+# Confluent error codes used by the stand-in
+SUBJECT_NOT_FOUND = 40401
+VERSION_NOT_FOUND = 40402
+SCHEMA_NOT_FOUND = 40403
+INVALID_SCHEMA = 42201
+
+Value = TypeVar("Value")
+
+
+class RegistryError(Exception):
+    pass
+
+
+class UnknownSchemaError(RegistryError):
+    pass
+
+
+class LRUCache(Generic[Value]):
+    # Bounded mapping that evicts the least recently used entry; shared by
+    # sending threads, so every access takes the lock.
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Value]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Value | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def schema_json(parsed_contract: Any) -> str:
+    # the schema as a registry stores it: fastavro's bookkeeping keys removed
+    def strip(contract: Any) -> Any:
+        if isinstance(contract, list):
+            return [strip(branch) for branch in contract]
+        if isinstance(contract, dict):
+            return {key: strip(value) for key, value in contract.items() if not key.startswith("__")}
+        return contract
+    return json.dumps(strip(parsed_contract), separators=(",", ":"))
+
+
+def default_subject(parsed_contract: Any) -> str:
+    # RecordNameStrategy: the full name of the top-level record
+    if isinstance(parsed_contract, dict) and parsed_contract.get("name"):
+        return parsed_contract["name"]
+    return "avroman-value"
+
+
+class RegistryClient:
+    # Schema ids by (subject, canonical schema) and parsed schemas by id, each
+    # in an LRU, so only the first use of a schema goes to the registry.
+    def __init__(
+        self,
+        base_url: str,
+        cache_size: int = 1024,
+        timeout_s: float = 10.0
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+        self.session = requests.Session()
+        self._ids: LRUCache[int] = LRUCache(cache_size)
+        self._schemas: LRUCache[Dict[str, Any]] = LRUCache(cache_size)
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: Dict[str, Any] | None = None,
+        phases: PhaseTimer | None = None
+    ) -> Tuple[int, Any]:
+        phases = phases or PhaseTimer()
+        phases.count(REGISTRY_LOOKUPS)
+        try:
+            with phases.time(REGISTRY):
+                response = self.session.request(
+                    method, f"{self.base_url}{path}",
+                    data=None if body is None else json.dumps(body),
+                    headers={"Content-Type": REGISTRY_CONTENT_TYPE, "Accept": REGISTRY_CONTENT_TYPE},
+                    timeout=self.timeout_s,
+                )
+            return response.status_code, response.json()
+        except (requests.RequestException, ValueError) as err:
+            raise RegistryError(f"Schema registry request {method} {path} failed: {err}") from err
+
+    def schema_id(
+        self,
+        subject: str,
+        parsed_contract: Dict[str, Any],
+        phases: PhaseTimer | None = None
+    ) -> int:
+        # looks the schema up under `subject` and registers it if it is new there
+        phases = phases or PhaseTimer()
+        key = (subject, to_parsing_canonical_form(parsed_contract))
+        schema_id = self._ids.get(key)
+        if schema_id is not None:
+            phases.count(REGISTRY_CACHE_HITS)
+            return schema_id
+        phases.count(REGISTRY_CACHE_MISSES)
+
+        path = f"/subjects/{quote(subject, safe='')}"
+        body = {"schema": schema_json(parsed_contract)}
+        status, data = self._request("POST", path, body, phases)
+        if status == 404:
+            status, data = self._request("POST", f"{path}/versions", body, phases)
+        if status != 200 or "id" not in data:
+            raise RegistryError(f"Schema registry rejected subject {subject}: {status} {data}")
+
+        self._ids.put(key, data["id"])
+        self._schemas.put(data["id"], parsed_contract)
+        return data["id"]
+
+    def cached_schema(self, schema_id: int) -> Dict[str, Any] | None:
+        # the parsed schema if it is cached, without a registry request
+        return self._schemas.get(schema_id)
+
+    def schema(
+        self,
+        schema_id: int,
+        phases: PhaseTimer | None = None
+    ) -> Dict[str, Any]:
+        phases = phases or PhaseTimer()
+        parsed_contract = self._schemas.get(schema_id)
+        if parsed_contract is not None:
+            phases.count(REGISTRY_CACHE_HITS)
+            return parsed_contract
+        phases.count(REGISTRY_CACHE_MISSES)
+
+        status, data = self._request("GET", f"/schemas/ids/{schema_id}", phases=phases)
+        if status == 404:
+            raise UnknownSchemaError(f"Unknown schema id {schema_id}: {status} {data}")
+        if status != 200 or "schema" not in data:
+            raise RegistryError(f"Unknown schema id {schema_id}: {status} {data}")
+        parsed_contract = parse_schema(json.loads(data["schema"]))
+        self._schemas.put(schema_id, parsed_contract)
+        return parsed_contract
+
+
+@lru_cache(maxsize=16)
+def registry_client(base_url: str) -> RegistryClient:
+    # one client per registry and process, so runs and suite entries share its caches
+    return RegistryClient(base_url)
+
+
+class RegistryStore:
+    # In-memory subjects and versions. Ids are global: the same canonical
+    # schema gets the same id under every subject, as in Confluent's registry.
+    def __init__(self) -> None:
+        self.schemas: Dict[int, str] = {}
+        self.subjects: Dict[str, List[int]] = {}
+        self._ids_by_canonical: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _canonical(schema: str) -> str:
+        return to_parsing_canonical_form(parse_schema(json.loads(schema)))
+
+    def lookup(self, subject: str, schema: str) -> Dict[str, Any]:
+        canonical = self._canonical(schema)
+        with self._lock:
+            versions = self.subjects.get(subject)
+            if versions is None:
+                raise KeyError(SUBJECT_NOT_FOUND)
+            schema_id = self._ids_by_canonical.get(canonical)
+            if schema_id not in versions:
+                raise KeyError(SCHEMA_NOT_FOUND)
+            return self._version(subject, versions.index(schema_id) + 1)
+
+    def register(self, subject: str, schema: str) -> int:
+        canonical = self._canonical(schema)
+        with self._lock:
+            schema_id = self._ids_by_canonical.get(canonical)
+            if schema_id is None:
+                schema_id = self._ids_by_canonical[canonical] = len(self.schemas) + 1
+                self.schemas[schema_id] = schema
+            versions = self.subjects.setdefault(subject, [])
+            if schema_id not in versions:
+                versions.append(schema_id)
+            return schema_id
+
+    def version(self, subject: str, version: str) -> Dict[str, Any]:
+        with self._lock:
+            versions = self.subjects.get(subject)
+            if versions is None:
+                raise KeyError(SUBJECT_NOT_FOUND)
+            if version != "latest" and not version.isdigit():
+                raise KeyError(VERSION_NOT_FOUND)
+            number = len(versions) if version == "latest" else int(version)
+            if not 1 <= number <= len(versions):
+                raise KeyError(VERSION_NOT_FOUND)
+            return self._version(subject, number)
+
+    def _version(self, subject: str, number: int) -> Dict[str, Any]:
+        schema_id = self.subjects[subject][number - 1]
+        return {"subject": subject, "version": number, "id": schema_id, "schema": self.schemas[schema_id]}
+
+
+class RegistryServer:
+    # A local stand-in for a Confluent-style schema registry, for tests and
+    # demos: subjects/versions and schema-by-id endpoints, kept in memory.
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_REGISTRY_PORT
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.store = RegistryStore()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _handler(self) -> type:
+        store = self.store
+        messages = {
+            SUBJECT_NOT_FOUND: "Subject not found.",
+            VERSION_NOT_FOUND: "Version not found.",
+            SCHEMA_NOT_FOUND: "Schema not found.",
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, data: Any) -> None:
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", REGISTRY_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _parts(self) -> List[str]:
+                return [unquote(part) for part in self.path.split("?", 1)[0].strip("/").split("/")]
+
+            def _route(self, method: str) -> Tuple[int, Any]:
+                parts = self._parts()
+                if method == "GET":
+                    if parts == ["subjects"]:
+                        return 200, sorted(store.subjects)
+                    if len(parts) == 3 and parts[0] == "subjects" and parts[2] == "versions":
+                        if parts[1] not in store.subjects:
+                            raise KeyError(SUBJECT_NOT_FOUND)
+                        return 200, list(range(1, len(store.subjects[parts[1]]) + 1))
+                    if len(parts) == 4 and parts[0] == "subjects" and parts[2] == "versions":
+                        return 200, store.version(parts[1], parts[3])
+                    if len(parts) == 3 and parts[:2] == ["schemas", "ids"] and parts[2].isdigit():
+                        if int(parts[2]) not in store.schemas:
+                            raise KeyError(SCHEMA_NOT_FOUND)
+                        return 200, {"schema": store.schemas[int(parts[2])]}
+                    return 404, {"error_code": 404, "message": "HTTP 404 Not Found"}
+
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                schema = body.get("schema", "") if isinstance(body, dict) else ""
+                if len(parts) == 2 and parts[0] == "subjects":
+                    return 200, store.lookup(parts[1], schema)
+                if len(parts) == 3 and parts[0] == "subjects" and parts[2] == "versions":
+                    return 200, {"id": store.register(parts[1], schema)}
+                return 404, {"error_code": 404, "message": "HTTP 404 Not Found"}
+
+            def _handle(self, method: str) -> None:
+                try:
+                    status, data = self._route(method)
+                except KeyError as err:
+                    code = err.args[0] if err.args and err.args[0] in messages else VERSION_NOT_FOUND
+                    status, data = 404, {"error_code": code, "message": messages[code]}
+                except (ValueError, SchemaParseException) as err:
+                    status, data = 422, {"error_code": INVALID_SCHEMA, "message": f"Invalid schema: {err}"}
+                self._reply(status, data)
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_POST(self) -> None:
+                self._handle("POST")
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="registry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "RegistryServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def serve_registry(
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_REGISTRY_PORT,
+    on_ready: Callable[[Tuple[str, int]], None] | None = None
+) -> None:
+    registry = RegistryServer(host, port)
+    with ThreadingHTTPServer((host, port), registry._handler()) as server:
+        if on_ready is not None:
+            on_ready(server.server_address[:2])
+        server.serve_forever()
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import time
-import requests
-from typing import Any, Dict, Tuple
+import re
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Record:
     id: str
     is_valid: bool
@@ -17,38 +17,129 @@ class Record:
     elapsed_time_ms: float
     error: str | None
     response: str | None
+    connect_time_ms: float = 0.0
+    ok: bool = True
 
-def runner(
-    url: str,
-    http_method: str,
-    payload: Dict[str, Any],
-    headers: Dict[str, str] | None = None,
-    timeout: float = 10.0
-) -> tuple[int | None, float, str | None, str | None]:
-    header = {
-        "Content-Type": "application/json"
-    }
-    if headers:
-        header.update(headers)
-
-    start_time = time.perf_counter()
-
-    try:
-        response = requests.request(
-            method=http_method.upper(),
-            url=url,
-            headers=header,
-            json=payload,
-            timeout=timeout
+
+OTHER_RESPONSES = "(other responses)"
+
+
+class ResponseTable:
+    # Distinct response bodies and error messages with a count each. With a
+    # limit, texts first seen after it is reached are counted under OTHER_RESPONSES.
+    __slots__ = ("limit", "ids", "texts", "counts")
+
+    def __init__(self, limit: int | None = None) -> None:
+        self.limit = limit
+        self.ids: Dict[str, int] = {}
+        self.texts: List[str] = []
+        self.counts = array("q")
+
+    def add(self, text: str, count: int = 1) -> int:
+        text_id = self.ids.get(text)
+        if text_id is None:
+            if self.limit is not None and len(self.texts) >= self.limit and text != OTHER_RESPONSES:
+                return self.add(OTHER_RESPONSES, count)
+            text_id = self.ids[text] = len(self.texts)
+            self.texts.append(text)
+            self.counts.append(0)
+        self.counts[text_id] += count
+        return text_id
+
+    def merge(self, other: "ResponseTable") -> "ResponseTable":
+        for text, count in zip(other.texts, other.counts):
+            self.add(text, count)
+        return self
+
+    def most_common(self, n: int | None = None) -> List[Tuple[str, int]]:
+        ranked = sorted(zip(self.texts, self.counts), key=lambda entry: entry[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"limit": self.limit, "entries": [[text, count] for text, count in zip(self.texts, self.counts)]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResponseTable":
+        table = cls(data.get("limit"))
+        for text, count in data["entries"]:
+            table.add(text, count)
+        return table
+
+
+_CASE_ID = re.compile(r"([VI])(\d+)")
+_IS_VALID, _IS_OK, _EXPECTS_PASS = 1, 2, 4
+
+
+class RecordStore:
+    # Columnar storage for kept records: one array slot per column instead of a
+    # Record object, and response/error texts stored once in a ResponseTable.
+    # Ids like V007/I012 are kept as their number; other ids go to a side table.
+    __slots__ = (
+        "responses", "case_numbers", "other_ids", "flags", "status_codes",
+        "elapsed_times_ms", "connect_times_ms", "response_ids", "error_ids"
+    )
+
+    def __init__(self) -> None:
+        self.responses = ResponseTable()
+        self.case_numbers = array("q")
+        self.other_ids: Dict[int, str] = {}
+        self.flags = array("B")
+        self.status_codes = array("H")
+        self.elapsed_times_ms = array("d")
+        self.connect_times_ms = array("d")
+        self.response_ids = array("l")
+        self.error_ids = array("l")
+
+    def _text_id(self, text: str | None) -> int:
+        return -1 if text is None else self.responses.add(text)
+
+    def append(self, record: Record) -> None:
+        match = _CASE_ID.fullmatch(record.id)
+        if match is not None and match.group(1) == ("V" if record.is_valid else "I") \
+                and record.id == f"{match.group(1)}{int(match.group(2)):03d}":
+            self.case_numbers.append(int(match.group(2)))
+        else:
+            self.other_ids[len(self.case_numbers)] = record.id
+            self.case_numbers.append(-1)
+
+        self.flags.append(
+            (_IS_VALID if record.is_valid else 0) | (_IS_OK if record.ok else 0)
+            | (_EXPECTS_PASS if record.expected == "pass" else 0)
+        )
+        self.status_codes.append(record.status_code or 0)
+        self.elapsed_times_ms.append(record.elapsed_time_ms)
+        self.connect_times_ms.append(record.connect_time_ms)
+        self.response_ids.append(self._text_id(record.response))
+        self.error_ids.append(self._text_id(record.error))
+
+    def _text(self, text_id: int) -> str | None:
+        return None if text_id < 0 else self.responses.texts[text_id]
+
+    def __getitem__(self, row: int) -> Record:
+        flags = self.flags[row]
+        is_valid = bool(flags & _IS_VALID)
+        case_number = self.case_numbers[row]
+        return Record(
+            id=self.other_ids[row] if case_number < 0 else f"{'V' if is_valid else 'I'}{case_number:03d}",
+            is_valid=is_valid,
+            expected="pass" if flags & _EXPECTS_PASS else "fail",
+            status_code=self.status_codes[row] or None,
+            elapsed_time_ms=self.elapsed_times_ms[row],
+            error=self._text(self.error_ids[row]),
+            response=self._text(self.response_ids[row]),
+            connect_time_ms=self.connect_times_ms[row],
+            ok=bool(flags & _IS_OK),
         )
 
-        elapsed_time = (time.perf_counter() - start_time) * 1000.0
-        response_block = (response.text or "")[:500]
-        return response.status_code, elapsed_time, None, response_block
+    def __iter__(self) -> Iterator[Record]:
+        for row in range(len(self.flags)):
+            yield self[row]
 
-    except Exception as err:
-        elapsed_time = (time.perf_counter() - start_time) * 1000.0
-        return None, elapsed_time, str(err), None
+    def __len__(self) -> int:
+        return len(self.flags)
 
 
 # def parse_runner_response(
@@ -0,0 +1,212 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import csv
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from dataclasses import asdict, fields
+from typing import Any, Callable, Dict, IO, List
+from core.runner import Record
+from core.statistics import PERCENTILES, RunStatistics
+from core.metrics import MetricsServer, openmetrics_text
+
+RECORD_COLUMNS = [field.name for field in fields(Record)]
+_CLOSE = None
+
+
+class _RecordSink(ABC):
+    # Streams records to a file from a writer thread: write() only enqueues the
+    # Record, formatting and file I/O happen off the send loop. The bounded
+    # queue applies backpressure instead of growing without limit when the
+    # disk falls behind. A path of None makes every call a no-op.
+    def __init__(
+        self,
+        path: str | Path | None,
+        buffer_size: int = 1 << 16,
+        queue_size: int = 10_000
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.buffer_size = buffer_size
+        self._queue: queue.Queue[Record | None] = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    @abstractmethod
+    def _open(self, handle: IO[str]) -> Callable[[Record], None]:
+        ...
+
+    def __enter__(self) -> "_RecordSink":
+        if self.path is not None:
+            handle = self.path.open("w", encoding="utf-8", newline="", buffering=self.buffer_size)
+            self._thread = threading.Thread(target=self._drain, args=(handle,), name=f"sink:{self.path.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def _drain(self, handle: IO[str]) -> None:
+        try:
+            write = self._open(handle)
+            while True:
+                record = self._queue.get()
+                if record is _CLOSE:
+                    break
+                write(record)
+        except BaseException as err:
+            self._error = err
+            # keep consuming so producers blocked on a full queue are released
+            while self._queue.get() is not _CLOSE:
+                pass
+        finally:
+            handle.close()
+
+    def write(self, record: Record) -> None:
+        if self._thread is not None:
+            self._queue.put(record)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            raise self._error
+
+
+class JsonlSpill(_RecordSink):
+    def _open(self, handle: IO[str]) -> Callable[[Record], None]:
+        def write(record: Record) -> None:
+            handle.write(json.dumps(asdict(record), separators=(",", ":")))
+            handle.write("\n")
+        return write
+
+
+class CsvSink(_RecordSink):
+    def _open(self, handle: IO[str]) -> Callable[[Record], None]:
+        writer = csv.writer(handle)
+        writer.writerow(RECORD_COLUMNS)
+
+        def write(record: Record) -> None:
+            writer.writerow([getattr(record, column) for column in RECORD_COLUMNS])
+        return write
+
+
+class RecordSinks:
+    # Every per-record sink selected for a run, written to as one.
+    def __init__(
+        self,
+        spill_path: Path | None = None,
+        csv_path: Path | None = None
+    ) -> None:
+        self.sinks: List[_RecordSink] = [JsonlSpill(spill_path), CsvSink(csv_path)]
+
+    def __enter__(self) -> "RecordSinks":
+        for index, sink in enumerate(self.sinks):
+            try:
+                sink.__enter__()
+            except BaseException:
+                self._close(self.sinks[:index])
+                raise
+        return self
+
+    def write(self, record: Record) -> None:
+        for sink in self.sinks:
+            sink.write(record)
+
+    @staticmethod
+    def _close(sinks: List[_RecordSink]) -> None:
+        # every sink is closed and its writer joined, even after one fails;
+        # the first writer error is raised once they all are
+        error: BaseException | None = None
+        for sink in sinks:
+            try:
+                sink.__exit__(None, None, None)
+            except BaseException as err:
+                error = error or err
+        if error is not None:
+            raise error
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._close(self.sinks)
+
+
+def summary_dict(statistics: RunStatistics) -> Dict[str, Any]:
+    # The end-of-run summary in plain numbers; RunStatistics.to_dict() keeps raw
+    # histogram buckets for merging instead.
+    groups = {"all": statistics.latency}
+    groups.update(statistics.latency_by_kind)
+    groups.update({f"status {status}": histogram for status, histogram in sorted(statistics.latency_by_status.items())})
+    return {
+        "total": statistics.total,
+        "good": statistics.good,
+        "bad": statistics.bad,
+        "unexpected": statistics.unexpected,
+        "errors": statistics.errors,
+        "status_counts": dict(sorted(statistics.status_counts.items())),
+        "duration_s": statistics.duration_s,
+        "throughput_rps": statistics.throughput(),
+        "target_rps": statistics.target_rps,
+        "latency_ms": {
+            group: {
+                "count": histogram.count,
+                "mean": histogram.mean_ms,
+                "stddev": histogram.stddev_ms,
+                **{f"p{percent:g}": histogram.percentile(percent) for percent in PERCENTILES},
+                "max": histogram.max_ms,
+            }
+            for group, histogram in groups.items()
+        },
+        "connect_time_ms": statistics.connect_time_ms,
+        "responses": [
+            {"response": response, "count": count} for response, count in statistics.responses.most_common(10)
+        ],
+        "phases": statistics.phases.to_dict(),
+        "started_at": statistics.started_at,
+        "finished_at": statistics.finished_at,
+    }
+
+
+def _write_text(path: Path, text: str) -> None:
+    # written next to the target and renamed, so a reader never sees half a file
+    partial = path.with_name(f".{path.name}.partial")
+    partial.write_text(text, encoding="utf-8")
+    partial.replace(path)
+
+
+class RunSinks:
+    # Run-level outputs: a JSON summary and an OpenMetrics file written once at
+    # the end, and a scrape endpoint refreshed from progress updates.
+    def __init__(
+        self,
+        summary_path: Path | None = None,
+        openmetrics_path: Path | None = None,
+        metrics_port: int | None = None,
+        metrics_host: str = "127.0.0.1"
+    ) -> None:
+        self.summary_path = summary_path
+        self.openmetrics_path = openmetrics_path
+        self.server = MetricsServer(metrics_host, metrics_port) if metrics_port is not None else None
+
+    def __enter__(self) -> "RunSinks":
+        if self.server is not None:
+            self.server.start()
+        return self
+
+    def update(self, statistics: RunStatistics) -> None:
+        if self.server is not None:
+            self.server.update(statistics)
+
+    def finish(self, statistics: RunStatistics) -> None:
+        if self.summary_path is not None:
+            _write_text(self.summary_path, json.dumps(summary_dict(statistics), indent=2))
+        if self.openmetrics_path is not None:
+            _write_text(self.openmetrics_path, openmetrics_text(statistics))
+        if self.server is not None:
+            self.server.update(statistics, force=True)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.server is not None:
+            self.server.stop()
@@ -2,10 +2,18 @@
 
 from __future__ import annotations
 
-from typing import List, Any
-from core.runner import Record
-from rich.table import Table
-from rich.console import Console
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable
+from core.runner import Record, ResponseTable
+from core.histogram import LatencyHistogram
+from core.phases import FAILED_RECORDS, PHASES, RENDER, VALIDATION_RETRIES, PhaseTimer
+from core.phases import REGISTRY_CACHE_HITS, REGISTRY_CACHE_MISSES, REGISTRY_LOOKUPS
+
+# rich is imported where something is drawn: shards, agents and the sinks
+# only aggregate statistics and never load the renderer
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
 
 
 def _as_bool(string: Any) -> bool:
@@ -18,28 +26,208 @@ def _as_bool(string: Any) -> bool:
     return False
 
 
-def summary(records: List[Record]) -> None:
-    console = Console(width=140)
-    # console.print(type(records[0].ok), records[0].ok)
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+RESPONSE_LIMIT = 1000
+RESPONSE_SNIPPET_LENGTH = 300
+
+
+def _histogram_for(
+    histograms: Dict[str, LatencyHistogram],
+    key: str
+) -> LatencyHistogram:
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = LatencyHistogram()
+    return histogram
+
+
+class RunStatistics:
+    def __init__(self) -> None:
+        self.total = 0
+        self.good = 0
+        self.bad = 0
+        self.unexpected = 0
+        self.errors = 0
+        self.status_counts: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        self.latency_by_kind: Dict[str, LatencyHistogram] = {}
+        self.latency_by_status: Dict[str, LatencyHistogram] = {}
+        self.connect_time_ms = 0.0
+        self.responses = ResponseTable(RESPONSE_LIMIT)
+        self.phases = PhaseTimer()
+        self.target_rps: float | None = None
+        self.started_at = time.time()
+        self.finished_at = self.started_at
+
+    def add(self, record: Record) -> None:
+        self.total += 1
+        expected = (record.expected or "").strip().lower()
+        if expected == "pass":
+            self.good += 1
+        elif expected == "fail":
+            self.bad += 1
+        if not record.ok:
+            self.unexpected += 1
+        if record.error is not None:
+            self.errors += 1
+
+        status = "-" if record.status_code is None else str(record.status_code)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        kind = "valid" if record.is_valid else "invalid"
+        self.latency.record(record.elapsed_time_ms)
+        _histogram_for(self.latency_by_kind, kind).record(record.elapsed_time_ms)
+        _histogram_for(self.latency_by_status, status).record(record.elapsed_time_ms)
+        self.connect_time_ms += record.connect_time_ms
+        response = (record.error or record.response or "")[:RESPONSE_SNIPPET_LENGTH]
+        self.responses.add(f"{status} {response}")
+        self.finished_at = time.time()
+
+    def merge(self, other: "RunStatistics") -> "RunStatistics":
+        self.total += other.total
+        self.good += other.good
+        self.bad += other.bad
+        self.unexpected += other.unexpected
+        self.errors += other.errors
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+        self.latency.merge(other.latency)
+        for kind, histogram in other.latency_by_kind.items():
+            _histogram_for(self.latency_by_kind, kind).merge(histogram)
+        for status, histogram in other.latency_by_status.items():
+            _histogram_for(self.latency_by_status, status).merge(histogram)
+        self.connect_time_ms += other.connect_time_ms
+        self.responses.merge(other.responses)
+        self.phases.merge(other.phases)
+        if other.target_rps is not None:
+            self.target_rps = (self.target_rps or 0.0) + other.target_rps
+        self.started_at = min(self.started_at, other.started_at)
+        self.finished_at = max(self.finished_at, other.finished_at)
+        return self
+
+    @property
+    def mean_elapsed_time_ms(self) -> float:
+        return self.latency.mean_ms
+
+    @property
+    def duration_s(self) -> float:
+        return max(0.0, self.finished_at - self.started_at)
 
-    # good_count = sum(1 for record in records if _as_bool(record.ok))
-    # bad_count = len(records) - good_count
+    def throughput(self, count: int | None = None) -> float:
+        duration = self.duration_s
+        if duration <= 0.0:
+            return 0.0
+        return (self.total if count is None else count) / duration
 
-    good_count = sum(1 for record in records if (record.expected or "").strip().lower() == "pass")
-    bad_count = sum(1 for record in records if (record.expected or "").strip().lower() == "fail")
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "good": self.good,
+            "bad": self.bad,
+            "unexpected": self.unexpected,
+            "errors": self.errors,
+            "status_counts": dict(self.status_counts),
+            "latency": self.latency.to_dict(),
+            "latency_by_kind": {kind: histogram.to_dict() for kind, histogram in self.latency_by_kind.items()},
+            "latency_by_status": {status: histogram.to_dict() for status, histogram in self.latency_by_status.items()},
+            "connect_time_ms": self.connect_time_ms,
+            "responses": self.responses.to_dict(),
+            "phases": self.phases.to_dict(),
+            "target_rps": self.target_rps,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunStatistics":
+        statistics = cls()
+        statistics.total = data["total"]
+        statistics.good = data["good"]
+        statistics.bad = data["bad"]
+        statistics.unexpected = data["unexpected"]
+        statistics.errors = data["errors"]
+        statistics.status_counts = dict(data["status_counts"])
+        statistics.latency = LatencyHistogram.from_dict(data["latency"])
+        statistics.latency_by_kind = {
+            kind: LatencyHistogram.from_dict(histogram) for kind, histogram in data["latency_by_kind"].items()
+        }
+        statistics.latency_by_status = {
+            status: LatencyHistogram.from_dict(histogram) for status, histogram in data["latency_by_status"].items()
+        }
+        statistics.connect_time_ms = data["connect_time_ms"]
+        statistics.responses = ResponseTable.from_dict(data["responses"])
+        statistics.phases = PhaseTimer.from_dict(data["phases"])
+        statistics.target_rps = data.get("target_rps")
+        statistics.started_at = data["started_at"]
+        statistics.finished_at = data["finished_at"]
+        return statistics
 
+
+class LiveProgress:
+    def __init__(
+        self,
+        total: int | None,
+        enabled: bool = True,
+        refresh_interval_s: float = 0.1
+    ) -> None:
+        self.total = total
+        self.enabled = enabled
+        self.refresh_interval_s = refresh_interval_s
+        self._last_refresh = 0.0
+        self._progress: Progress | None = None
+        self._task = None
+
+    def __enter__(self) -> "LiveProgress":
+        if self.enabled:
+            from rich.console import Console
+            from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+            self._progress = Progress(
+                TextColumn("[bold]sending"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeElapsedColumn(),
+                TextColumn("{task.fields[details]}"),
+                console=Console(width=140),
+                transient=True,
+            )
+            self._progress.start()
+            self._task = self._progress.add_task("sending", total=self.total, details="")
+        return self
+
+    def update(self, statistics: RunStatistics, force: bool = False) -> None:
+        if self._progress is None:
+            return
+        now = time.perf_counter()
+        if not force and now - self._last_refresh < self.refresh_interval_s:
+            return
+        self._last_refresh = now
+
+        status_counts = " ".join(f"{status}:{count}" for status, count in sorted(statistics.status_counts.items()))
+        self._progress.update(
+            self._task,
+            completed=statistics.total,
+            details=f"unexpected {statistics.unexpected}  mean {statistics.mean_elapsed_time_ms:.1f} ms  {status_counts}",
+        )
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._progress is not None:
+            self._progress.stop()
+            self._progress = None
+
+
+def _render_records(console: Console, records: Iterable[Record]) -> None:
+    from rich.table import Table
     table = Table(title="Schema Test Result", expand=True)
     table.add_column("record", width=6, no_wrap=True)
     table.add_column("is_valid", width=8, no_wrap=True)
     table.add_column("pass/fail", width=9, no_wrap=True)
     table.add_column("status code", width=11, no_wrap=True)
     table.add_column("time (ms)", justify="right", width=10, no_wrap=True)
+    table.add_column("connect (ms)", justify="right", width=12, no_wrap=True)
     table.add_column("api response", overflow="fold")
 
     for record in records:
         status = "-" if record.status_code is None else str(record.status_code)
-        response_snippet = (record.error or record.response or "")[:300]
+        response_snippet = (record.error or record.response or "")[:RESPONSE_SNIPPET_LENGTH]
 
         table.add_row(
             record.id,
@@ -47,9 +235,117 @@ def summary(records: List[Record]) -> None:
             record.expected,
             status,
             f"{record.elapsed_time_ms:.1f}",
+            f"{record.connect_time_ms:.1f}",
             response_snippet,
         )
 
     console.print(table)
-    console.print(f"Total: {len(records)}  Good: {good_count}  Bad: {bad_count}")
+
+
+def _render_latency(console: Console, statistics: RunStatistics) -> None:
+    from rich.table import Table
+    table = Table(title="Latency (ms)", expand=True)
+    table.add_column("group", no_wrap=True)
+    table.add_column("count", justify="right", no_wrap=True)
+    table.add_column("req/s", justify="right", no_wrap=True)
+    table.add_column("mean", justify="right", no_wrap=True)
+    table.add_column("stddev", justify="right", no_wrap=True)
+    for percent in PERCENTILES:
+        table.add_column(f"p{percent:g}", justify="right", no_wrap=True)
+    table.add_column("max", justify="right", no_wrap=True)
+
+    groups = [("all", statistics.latency)]
+    groups += [(kind, statistics.latency_by_kind[kind]) for kind in ("valid", "invalid") if kind in statistics.latency_by_kind]
+    groups += [(f"status {status}", histogram) for status, histogram in sorted(statistics.latency_by_status.items())]
+
+    for group, histogram in groups:
+        table.add_row(
+            group,
+            str(histogram.count),
+            f"{statistics.throughput(histogram.count):.1f}",
+            f"{histogram.mean_ms:.1f}",
+            f"{histogram.stddev_ms:.1f}",
+            *(f"{histogram.percentile(percent):.1f}" for percent in PERCENTILES),
+            f"{histogram.max_ms:.1f}",
+        )
+
+    console.print(table)
+
+
+def _render_responses(console: Console, statistics: RunStatistics, limit: int = 10) -> None:
+    from rich.table import Table
+    table = Table(title=f"Responses ({len(statistics.responses)} distinct)", expand=True)
+    table.add_column("count", justify="right", width=10, no_wrap=True)
+    table.add_column("share", justify="right", width=7, no_wrap=True)
+    table.add_column("status / api response", overflow="fold", ratio=1)
+
+    for response, count in statistics.responses.most_common(limit):
+        table.add_row(str(count), f"{100.0 * count / statistics.total:.1f}%", response)
+
+    console.print(table)
+
+
+def _render_phases(console: Console, statistics: RunStatistics) -> None:
+    from rich.table import Table
+    phases = statistics.phases
+    table = Table(title="Phases", expand=True)
+    table.add_column("phase", no_wrap=True)
+    table.add_column("calls", justify="right", no_wrap=True)
+    table.add_column("total (s)", justify="right", no_wrap=True)
+    table.add_column("mean (ms)", justify="right", no_wrap=True)
+    table.add_column("max (ms)", justify="right", no_wrap=True)
+    table.add_column("% of wall", justify="right", no_wrap=True)
+
+    duration = statistics.duration_s
+    for phase in sorted(phases.total_s, key=lambda name: PHASES.index(name) if name in PHASES else len(PHASES)):
+        total = phases.total_s[phase]
+        table.add_row(
+            phase,
+            str(phases.calls[phase]),
+            f"{total:.3f}",
+            f"{phases.mean_ms(phase):.3f}",
+            f"{1000.0 * phases.max_s.get(phase, 0.0):.3f}",
+            f"{100.0 * total / duration:.1f}" if duration > 0.0 else "-",
+        )
+
+    console.print(table)
+    console.print(
+        f"Validation retries: {phases.counters.get(VALIDATION_RETRIES, 0)}  "
+        f"Failed records: {phases.counters.get(FAILED_RECORDS, 0)}"
+    )
+    hits, misses = phases.counters.get(REGISTRY_CACHE_HITS, 0), phases.counters.get(REGISTRY_CACHE_MISSES, 0)
+    if hits or misses:
+        console.print(
+            f"Schema registry: {phases.counters.get(REGISTRY_LOOKUPS, 0)} lookups  "
+            f"Cache hits: {hits}  Misses: {misses}  Hit rate: {100.0 * hits / (hits + misses):.1f}%"
+        )
+
+
+def summary(
+    statistics: RunStatistics,
+    records: Iterable[Record] | None = None
+) -> None:
+    from rich.console import Console
+    console = Console(width=140)
+    # console.print(type(records[0].ok), records[0].ok)
+
+    if records is not None:
+        with statistics.phases.time(RENDER):
+            _render_records(console, records)
+
+    status_counts = "  ".join(f"{status}: {count}" for status, count in sorted(statistics.status_counts.items()))
+    console.print(f"Total: {statistics.total}  Good: {statistics.good}  Bad: {statistics.bad}")
+    console.print(f"Unexpected: {statistics.unexpected}  Errors: {statistics.errors}  Status codes: {status_counts or '-'}")
+    if statistics.total:
+        _render_responses(console, statistics)
+        _render_latency(console, statistics)
+    if statistics.phases.total_s:
+        _render_phases(console, statistics)
+    console.print(f"Duration: {statistics.duration_s:.2f} s  Throughput: {statistics.throughput():.1f} req/s")
+    if statistics.target_rps:
+        achieved = statistics.throughput()
+        console.print(
+            f"Offered load: target {statistics.target_rps:.1f} req/s  achieved {achieved:.1f} req/s "
+            f"({100.0 * achieved / statistics.target_rps:.1f}% of target)"
+        )
 
@@ -6,11 +6,18 @@ import json
 import click
 import random
 from pathlib import Path
-from typing import Any, Dict
-from core.statistics import summary
-from src.utils import load_contract, is_record_valid
-from core.runner import Record, runner, parse_runner_response
-from src.generate_payload import generate_valid_payload, generate_invalid_payload
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, List
+from core.constants import DEFAULT_REGISTRY_PORT, ENCODINGS, JSON
+from core.phases import PARSE_SCHEMA, PhaseTimer, profiled
+from src.constants import AGENT_TOKEN_ENV, CODECS, DEFAULT_AGENT_PORT, DEFAULT_CACHE_DIR, INVALID_MODES, MUTATION_MATRIX, RANDOM_MUTATIONS
+from src.size_profile import SizeProfile, fit_size_profile, load_size_profile, parse_field_sizes, parse_size_range
+
+# Only click and stdlib-only modules are imported up front; every command
+# imports what it runs (fastavro, requests, rich, the generators and
+# validators), so `--help` and argument errors return without loading them.
+if TYPE_CHECKING:
+    from src.pipeline import RunSettings
 
 
 def parse_headers(
@@ -28,39 +35,123 @@ def parse_headers(
     }
 
 
-def validate_record_type(payload: Any) -> Dict[str, Any] | None:
-    return payload if isinstance(payload, dict) else None
+def size_profile_options(command):
+    options = [
+        click.option("--size-profile", "size_profile_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), default=None, help="JSON size profile; the options below override it"),
+        click.option("--items", "items_size", default=None, help="Array/map element count as MIN-MAX [default: 0-5]"),
+        click.option("--string-length", default=None, help="String length as MIN-MAX [default: 5-20]"),
+        click.option("--bytes-length", default=None, help="Bytes length as MIN-MAX [default: 0-16]"),
+        click.option("--field-size", "field_sizes", multiple=True, help="Per-field size as FIELD=MIN-MAX, e.g. UserCreated.tags=1000-1000 (repeatable)"),
+        click.option("--target-size", "target_bytes", default=None, type=click.IntRange(min=1), help="Scale the type ranges, narrowed to +-10% of their mean, so a payload is about this many bytes on average; payloads that take a field default or a null branch come out smaller"),
+        click.option("--max-depth", default=None, type=click.IntRange(min=0), help="Expansions of a recursive named type before it ends in its smallest value [default: 4]"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def run_sink_options(command):
+    options = [
+        click.option("--summary-json", "summary_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Write the final summary (counts, latency percentiles, top responses, phases) to this JSON file"),
+        click.option("--openmetrics", "openmetrics_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Write status counters and the latency histogram to this OpenMetrics text file at the end of the run"),
+        click.option("--metrics-port", default=None, type=click.IntRange(min=0, max=65535), help="Serve the same metrics on http://127.0.0.1:PORT/metrics while the run is in progress"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def registry_options(command):
+    options = [
+        click.option("--registry", "registry_url", default=None, help="Schema registry URL; the schema is looked up (or registered) there and its id replaces --schema-id"),
+        click.option("--subject", default=None, help="Registry subject [default: the schema's full record name]"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def resolve_registry(
+    parsed_contract: Dict,
+    settings: RunSettings,
+    phases: PhaseTimer
+) -> RunSettings:
+    from core.registry import RegistryError
+    from src.pipeline import resolve_schema_id
+    try:
+        return resolve_schema_id(parsed_contract, settings, phases)
+    except RegistryError as err:
+        raise click.ClickException(str(err))
+
 
+def build_size_profile(
+    size_profile_path: Path | None,
+    items_size: str | None,
+    string_length: str | None,
+    bytes_length: str | None,
+    field_sizes: List[str],
+    target_bytes: int | None,
+    max_depth: int | None
+) -> SizeProfile | None:
+    if size_profile_path is None and max_depth is None and not (
+        items_size or string_length or bytes_length or field_sizes or target_bytes
+    ):
+        return None
 
-def generate_valid_record(
-    parsed_contract: Dict[str, Any],
-    rng: random.Random,
-    attempts_to_make: int = 5
-) -> Dict[str, Any]:
-    for _ in range(max(1, attempts_to_make)):
-        payload = validate_record_type(
-            generate_valid_payload(parsed_contract, rng)
+    try:
+        size_profile = load_size_profile(size_profile_path) if size_profile_path is not None else SizeProfile()
+        overrides = {
+            key: parse_size_range(value)
+            for key, value in (("items", items_size), ("string_length", string_length), ("bytes_length", bytes_length))
+            if value is not None
+        }
+        return replace(
+            size_profile,
+            **overrides,
+            fields={**size_profile.fields, **parse_field_sizes(field_sizes)},
+            target_bytes=target_bytes if target_bytes is not None else size_profile.target_bytes,
+            max_depth=max_depth if max_depth is not None else size_profile.max_depth,
         )
-        if payload is not None and is_record_valid(parsed_contract, payload):
-            return payload
+    except ValueError as err:
+        raise click.BadParameter(str(err))
 
-    return {
-        "_failed": True
-    }
 
+def fit_target_size(
+    parsed_contract: Dict,
+    size_profile: SizeProfile | None
+) -> SizeProfile | None:
+    if size_profile is None or size_profile.target_bytes is None:
+        return size_profile
 
-def generate_invalid_record(
-    parsed_contract: Dict[str, Any],
-    rng: random.Random
-) -> Dict[str, Any]:
-    payload = generate_invalid_payload(parsed_contract, rng)
-    if isinstance(payload, dict):
-        return payload
+    try:
+        fitted, expected_bytes = fit_size_profile(parsed_contract, size_profile)
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="--target-size")
+    click.echo(
+        f"Size profile fitted to ~{expected_bytes:,.0f} bytes per payload: "
+        f"items {fitted.items}, strings {fitted.string_length}, bytes {fitted.bytes_length}"
+    )
+    return fitted
 
-    return {
-        "_is_invalid": True
-}
 
+def plan_invalid_cases(
+    parsed_contract: Dict,
+    invalid_mode: str,
+    n_invalid: int | None,
+    size_profile: SizeProfile | None
+) -> int:
+    if invalid_mode != MUTATION_MATRIX:
+        return 25 if n_invalid is None else n_invalid
+
+    from src.mutation_matrix import MutationMatrix
+    matrix = MutationMatrix(parsed_contract, size_profile)
+    n_invalid = len(matrix) if n_invalid is None else n_invalid
+    kinds = "  ".join(f"{kind}: {count}" for kind, count in matrix.describe().items() if count)
+    click.echo(
+        f"Mutation matrix: {len(matrix)} (field path, mutation) pairs over {matrix.field_paths()} field paths "
+        f"({kinds or '-'}); {n_invalid} invalid cases cover {min(n_invalid, len(matrix))}/{len(matrix)}"
+    )
+    return n_invalid
 
 
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
@@ -70,13 +161,78 @@ def avroman() -> None:
 
 @avroman.command()
 @click.option("--schema", "contract_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), required=True, help="Path to schema file")
+@click.option("--out", "corpus_path", type=click.Path(dir_okay=False, writable=True, path_type=Path), required=True, help="Avro container file to write")
+@click.option("--n-valid", default=25, show_default=True, type=int, help="Number of valid cases")
+@click.option("--n-invalid", default=None, type=int, help="Number of invalid cases [default: 25, or one per pair with --invalid-mode matrix]")
+@click.option("--invalid-mode", default=RANDOM_MUTATIONS, show_default=True, type=click.Choice(INVALID_MODES), help="random: one random top-level mutation per case; matrix: enumerate every (field path, mutation) pair once")
+@click.option("--seed", default=0, show_default=True, type=int, help="RNG seed")
+@click.option("--codec", default="deflate", show_default=True, type=click.Choice(CODECS), help="Avro block compression codec")
+@size_profile_options
+def generate(
+    contract_path: Path,
+    corpus_path: Path,
+    n_valid: int,
+    n_invalid: int | None,
+    invalid_mode: str,
+    seed: int,
+    codec: str,
+    **size_options,
+) -> None:
+    from src.utils import load_contract
+    from src.corpus import write_corpus
+    from src.pipeline import iter_labelled_cases
+    from src.mutation_matrix import MutationMatrix, mutation_coverage
+
+    parsed_contract = load_contract(contract_path)
+    rng = random.Random(seed)
+    size_profile = fit_target_size(parsed_contract, build_size_profile(**size_options))
+    n_invalid = plan_invalid_cases(parsed_contract, invalid_mode, n_invalid, size_profile)
+
+    cases = iter_labelled_cases(
+        parsed_contract, rng, n_valid, n_invalid, size_profile=size_profile, invalid_mode=invalid_mode
+    )
+    metadata = {"seed": seed, "n_valid": n_valid, "n_invalid": n_invalid, "schema": contract_path.name}
+    try:
+        counts = write_corpus(corpus_path, parsed_contract, cases, metadata=metadata, codec=codec)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+
+    mutation_counts: Dict[str, int] = {}
+    for mutation, count in counts["mutations"].items():
+        kind = mutation.split(":", 1)[0]
+        mutation_counts[kind] = mutation_counts.get(kind, 0) + count
+    mutations = "  ".join(f"{mutation}: {count}" for mutation, count in sorted(mutation_counts.items()))
+    click.echo(f"Wrote {counts['encoded']} Avro-encoded and {counts['sidecar']} sidecar cases to {corpus_path}")
+    click.echo(f"Mutations: {mutations or '-'}")
+    if invalid_mode == MUTATION_MATRIX:
+        covered, total = mutation_coverage(MutationMatrix(parsed_contract, size_profile), counts["mutations"])
+        click.echo(f"Mutation coverage: {covered}/{total} pairs produced an invalid payload")
+
+
+@avroman.command()
+@click.option("--schema", "contract_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), default=None, help="Path to schema file (optional with --corpus)")
+@click.option("--corpus", "corpus_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), default=None, help="Replay cases from a corpus written by 'avroman generate' instead of generating them")
 @click.option("--url", required=True, help="Endpoint URL")
 @click.option("--method", default="POST", show_default=True, help="HTTP method")
 @click.option("--n-valid", default=25, show_default=True, type=int, help="Number of valid cases")
-@click.option("--n-invalid", default=25, show_default=True, type=int, help="Number of invalid cases")
+@click.option("--n-invalid", default=None, type=int, help="Number of invalid cases [default: 25, or one per pair with --invalid-mode matrix]")
+@click.option("--invalid-mode", default=RANDOM_MUTATIONS, show_default=True, type=click.Choice(INVALID_MODES), help="random: one random top-level mutation per case; matrix: enumerate every (field path, mutation) pair once")
 @click.option("--seed", default=0, show_default=True, type=int, help="RNG seed")
 @click.option("--headers", default=None, help='Extra headers as JSON string, e.g. \'{"Authorization":"Bearer ..."}\'')
 @click.option("--timeout", "timeout_s", default=10.0, show_default=True, type=float, help="Request timeout in seconds")
+@click.option("--concurrency", default=1, show_default=True, type=click.IntRange(min=1), help="Number of requests sent in parallel")
+@click.option("--pool-size", default=None, type=click.IntRange(min=1), help="Keep-alive connections kept open to the endpoint [default: concurrency]")
+@click.option("--max-in-flight", default=None, type=click.IntRange(min=1), help="Upper bound on queued + running requests; at least --concurrency [default: 2 x concurrency, with --rps at least 10 s of sends]")
+@click.option("--rps", default=None, type=click.FloatRange(min=0, min_open=True), help="Open-loop mode: release requests on a fixed timeline at this rate, measuring latency from the scheduled send time")
+@click.option("--duration", "duration_s", default=None, type=click.FloatRange(min=0, min_open=True), help="With --rps, keep sending for this many seconds, mixing valid/invalid cases in the --n-valid:--n-invalid ratio")
+@click.option("--workers", default=1, show_default=True, type=click.IntRange(min=1), help="Processes that generate and send in parallel, each with a sub-seed derived from --seed and a disjoint slice of case ids")
+@click.option("--encoding", default=JSON, show_default=True, type=click.Choice(ENCODINGS), help="Wire format of request bodies")
+@click.option("--schema-id", default=1, show_default=True, type=click.IntRange(0, 2**32 - 1), help="Schema id written into the Confluent wire format header")
+@registry_options
+@click.option("--table/--no-table", "show_table", default=False, show_default=True, help="Keep every record and print the per-record table at the end instead of the live progress view")
+@click.option("--spill", "spill_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Stream every full record to this JSON Lines file")
+@click.option("--csv", "csv_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Stream every record to this CSV file")
+@run_sink_options
 @click.option(
     "--valid-accept-3xx/--valid-accept-2xx",
     default=False,
@@ -85,68 +241,530 @@ def avroman() -> None:
 )
 @click.option(
     "--fail-on-any/--no-fail-on-any",
-    default=True,
+    default=False,
     show_default=True,
     help="Exit non-zero if any case is not ok",
 )
+@click.option("--profile", "profile_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Run under cProfile; write pstats data here and a top-functions report to <path>.txt")
+@click.option("--phases-json", "phases_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Write the per-phase timings and counters to this JSON file")
+@size_profile_options
 def run(
-    contract_path: Path,
+    contract_path: Path | None,
+    corpus_path: Path | None,
     url: str,
     method: str,
     n_valid: int,
-    n_invalid: int,
+    n_invalid: int | None,
+    invalid_mode: str,
     seed: int,
     headers: str | None,
     timeout_s: float,
+    concurrency: int,
+    pool_size: int | None,
+    max_in_flight: int | None,
+    rps: float | None,
+    duration_s: float | None,
+    workers: int,
+    encoding: str,
+    schema_id: int,
+    registry_url: str | None,
+    subject: str | None,
+    show_table: bool,
+    spill_path: Path | None,
+    csv_path: Path | None,
+    summary_path: Path | None,
+    openmetrics_path: Path | None,
+    metrics_port: int | None,
     valid_accept_3xx: bool,
     fail_on_any: bool,
+    profile_path: Path | None,
+    phases_path: Path | None,
+    **size_options,
 ) -> None:
-    parsed_contract = load_contract(contract_path)
-    rng = random.Random(seed)
-    headers = parse_headers(headers)
-
-    results: list[Record] = []
-
-    for i in range(n_valid):
-        payload = generate_valid_record(parsed_contract, rng)
-        status, ms, err, snippet = runner(url, method, payload, headers=headers, timeout=timeout_s)
-        expected, ok = parse_runner_response(True, status, expect_2xx_for_valid=not valid_accept_3xx)
-        results.append(
-            Record(
-                id=f"V{i:03d}",
-                is_valid=True,
-                expected=expected,
-                status_code=status,
-                elapsed_time_ms=ms,
-                error=err,
-                response=snippet,
+    if contract_path is None and corpus_path is None:
+        raise click.UsageError("Either --schema or --corpus is required.")
+    if duration_s is not None and rps is None:
+        raise click.UsageError("--duration requires --rps.")
+    if max_in_flight is not None and max_in_flight < concurrency:
+        raise click.UsageError("--max-in-flight must be at least --concurrency.")
+    if workers > 1 and (corpus_path is not None or show_table):
+        raise click.UsageError("--workers cannot be combined with --corpus or --table.")
+    from src.utils import load_contract
+    from core.runner import RecordStore
+    from core.sinks import RecordSinks, RunSinks
+    from core.statistics import LiveProgress, RunStatistics, summary
+    from src.sharding import run_sharded
+    from src.corpus import iter_corpus_cases, read_corpus_header
+    from src.pipeline import RunSettings, build_runner, execute, iter_cases, iter_open_loop_cases
+
+    with profiled(profile_path):
+        size_profile = build_size_profile(**size_options)
+        phases = PhaseTimer()
+
+        if corpus_path is not None:
+            corpus_contract, corpus_metadata = read_corpus_header(corpus_path)
+            with phases.time(PARSE_SCHEMA):
+                parsed_contract = load_contract(contract_path) if contract_path is not None else corpus_contract
+            n_valid = int(corpus_metadata.get("n_valid", 0))
+            n_invalid = int(corpus_metadata.get("n_invalid", 0))
+            cases = iter_corpus_cases(corpus_path)
+        elif duration_s is not None:
+            with phases.time(PARSE_SCHEMA):
+                parsed_contract = load_contract(contract_path)
+            size_profile = fit_target_size(parsed_contract, size_profile)
+            n_invalid = plan_invalid_cases(parsed_contract, invalid_mode, n_invalid, size_profile)
+            cases = iter_open_loop_cases(
+                parsed_contract, random.Random(seed), n_valid, n_invalid,
+                size_profile=size_profile, invalid_mode=invalid_mode, phases=phases
+            )
+        else:
+            with phases.time(PARSE_SCHEMA):
+                parsed_contract = load_contract(contract_path)
+            size_profile = fit_target_size(parsed_contract, size_profile)
+            n_invalid = plan_invalid_cases(parsed_contract, invalid_mode, n_invalid, size_profile)
+            cases = iter_cases(
+                parsed_contract, random.Random(seed), n_valid, n_invalid,
+                size_profile=size_profile, invalid_mode=invalid_mode, phases=phases
             )
+        settings = RunSettings(
+            url=url,
+            method=method,
+            headers=parse_headers(headers),
+            timeout_s=timeout_s,
+            concurrency=concurrency,
+            pool_size=pool_size,
+            max_in_flight=max_in_flight,
+            encoding=encoding,
+            schema_id=schema_id,
+            expect_2xx_for_valid=not valid_accept_3xx,
+            rps=rps,
+            duration_s=duration_s,
+            invalid_mode=invalid_mode,
+            registry_url=registry_url,
+            subject=subject,
         )
+        settings = resolve_registry(parsed_contract, settings, phases)
+        total_cases = int(rps * duration_s) if rps and duration_s else n_valid + n_invalid
+        kept_records = RecordStore() if show_table else None
 
-    for i in range(n_invalid):
-        payload = generate_invalid_record(parsed_contract, rng)
-
-        if isinstance(payload, dict) and is_record_valid(parsed_contract, payload):
-            payload = {"_is_invalid": True}
-
-        status, ms, err, snippet = runner(url, method, payload, headers=headers, timeout=timeout_s)
-        expected, ok = parse_runner_response(False, status, expect_2xx_for_valid=not valid_accept_3xx)
-        results.append(
-            Record(
-                id=f"I{i:03d}",
-                is_valid=False,
-                expected=expected,
-                status_code=status,
-                elapsed_time_ms=ms,
-                error=err,
-                response=snippet,
-            )
+        with RunSinks(summary_path, openmetrics_path, metrics_port) as run_sinks:
+            if workers > 1:
+                with LiveProgress(total_cases) as progress:
+                    def on_shard_done(statistics: RunStatistics) -> None:
+                        progress.update(statistics)
+                        run_sinks.update(statistics)
+
+                    statistics = run_sharded(
+                        parsed_contract, settings, seed, n_valid, n_invalid, workers,
+                        spill_path=spill_path, on_shard_done=on_shard_done, size_profile=size_profile,
+                        csv_path=csv_path
+                    )
+                statistics.phases.merge(phases)
+            else:
+                statistics = RunStatistics()
+                statistics.phases = phases
+                statistics.target_rps = rps
+                with build_runner(parsed_contract, settings, phases) as http_runner, \
+                        RecordSinks(spill_path, csv_path) as record_sinks, \
+                        LiveProgress(total_cases, enabled=not show_table) as progress:
+                    records = execute(
+                        cases, http_runner.send, concurrency, max_in_flight,
+                        expect_2xx_for_valid=settings.expect_2xx_for_valid, rps=rps, duration_s=duration_s
+                    )
+                    for record in records:
+                        statistics.add(record)
+                        record_sinks.write(record)
+                        if kept_records is not None:
+                            kept_records.append(record)
+                        progress.update(statistics)
+                        run_sinks.update(statistics)
+
+            summary(statistics, kept_records)
+            run_sinks.finish(statistics)
+
+    if phases_path is not None:
+        phases_path.write_text(json.dumps(statistics.phases.to_dict(), indent=2), encoding="utf-8")
+
+    if fail_on_any and statistics.unexpected:
+        raise SystemExit(1)
+
+
+@avroman.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to listen on; pass 0.0.0.0 to accept coordinators from other hosts")
+@click.option("--port", default=DEFAULT_AGENT_PORT, show_default=True, type=int, help="TCP port to listen on")
+@click.option("--token", envvar=AGENT_TOKEN_ENV, show_envvar=True, required=True, help="Shared secret a coordinator must send with each job")
+def agent(
+    host: str,
+    port: int,
+    token: str,
+) -> None:
+    from src.distributed import serve_agent
+
+    if not token:
+        raise click.BadParameter("The token must not be empty.", param_hint="--token")
+
+    def ready(address) -> None:
+        click.echo(f"avroman agent listening on {address[0]}:{address[1]}")
+
+    try:
+        serve_agent(token, host, port, on_ready=ready)
+    except KeyboardInterrupt:
+        pass
+
+
+@avroman.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to listen on")
+@click.option("--port", default=DEFAULT_REGISTRY_PORT, show_default=True, type=int, help="TCP port to listen on")
+def registry(
+    host: str,
+    port: int,
+) -> None:
+    # in-memory stand-in for a Confluent-style schema registry; schemas are lost on exit
+    from core.registry import serve_registry
+
+    def ready(address) -> None:
+        click.echo(f"avroman schema registry listening on http://{address[0]}:{address[1]}")
+
+    try:
+        serve_registry(host, port, on_ready=ready)
+    except KeyboardInterrupt:
+        pass
+
+
+@avroman.command()
+@click.option("--schema", "contract_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), required=True, help="Path to schema file")
+@click.option("--agent", "agent_addresses", multiple=True, required=True, help="Agent address as host:port, repeat once per agent")
+@click.option("--token", envvar=AGENT_TOKEN_ENV, show_envvar=True, required=True, help="Shared secret the agents were started with")
+@click.option("--url", required=True, help="Endpoint URL, as reachable from the agents")
+@click.option("--method", default="POST", show_default=True, help="HTTP method")
+@click.option("--n-valid", default=25, show_default=True, type=int, help="Number of valid cases across all agents")
+@click.option("--n-invalid", default=None, type=int, help="Number of invalid cases across all agents [default: 25, or one per pair with --invalid-mode matrix]")
+@click.option("--invalid-mode", default=RANDOM_MUTATIONS, show_default=True, type=click.Choice(INVALID_MODES), help="random: one random top-level mutation per case; matrix: enumerate every (field path, mutation) pair once")
+@click.option("--seed", default=0, show_default=True, type=int, help="RNG seed, agents get sub-seeds derived from it")
+@click.option("--headers", default=None, help='Extra headers as JSON string, e.g. \'{"Authorization":"Bearer ..."}\'')
+@click.option("--timeout", "timeout_s", default=10.0, show_default=True, type=float, help="Request timeout in seconds")
+@click.option("--concurrency", default=1, show_default=True, type=click.IntRange(min=1), help="Requests sent in parallel by each agent")
+@click.option("--pool-size", default=None, type=click.IntRange(min=1), help="Keep-alive connections kept open by each agent [default: concurrency]")
+@click.option("--max-in-flight", default=None, type=click.IntRange(min=1), help="Upper bound on queued + running requests per agent; at least --concurrency [default: 2 x concurrency, with --rps at least 10 s of sends]")
+@click.option("--rps", default=None, type=click.FloatRange(min=0, min_open=True), help="Open-loop mode: total rate, split evenly across agents")
+@click.option("--duration", "duration_s", default=None, type=click.FloatRange(min=0, min_open=True), help="With --rps, keep sending for this many seconds")
+@click.option("--encoding", default=JSON, show_default=True, type=click.Choice(ENCODINGS), help="Wire format of request bodies")
+@click.option("--schema-id", default=1, show_default=True, type=click.IntRange(0, 2**32 - 1), help="Schema id written into the Confluent wire format header")
+@registry_options
+@click.option(
+    "--valid-accept-3xx/--valid-accept-2xx",
+    default=False,
+    show_default=True,
+    help="If set, treat any <400 as success for valid cases (accept 3xx). Default: only 2xx is success",
+)
+@run_sink_options
+@size_profile_options
+def coordinate(
+    contract_path: Path,
+    agent_addresses: List[str],
+    token: str,
+    url: str,
+    method: str,
+    n_valid: int,
+    n_invalid: int | None,
+    invalid_mode: str,
+    seed: int,
+    headers: str | None,
+    timeout_s: float,
+    concurrency: int,
+    pool_size: int | None,
+    max_in_flight: int | None,
+    rps: float | None,
+    duration_s: float | None,
+    encoding: str,
+    schema_id: int,
+    registry_url: str | None,
+    subject: str | None,
+    valid_accept_3xx: bool,
+    summary_path: Path | None,
+    openmetrics_path: Path | None,
+    metrics_port: int | None,
+    **size_options,
+) -> None:
+    if duration_s is not None and rps is None:
+        raise click.UsageError("--duration requires --rps.")
+    if max_in_flight is not None and max_in_flight < concurrency:
+        raise click.UsageError("--max-in-flight must be at least --concurrency.")
+    from src.utils import load_contract
+    from core.sinks import RunSinks
+    from core.statistics import LiveProgress, RunStatistics, summary
+    from src.pipeline import RunSettings
+    from src.distributed import AgentError, coordinate as coordinate_agents, parse_agent_address
+
+    try:
+        agents = [parse_agent_address(address) for address in agent_addresses]
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="--agent")
+
+    parsed_contract = load_contract(contract_path)
+    size_profile = fit_target_size(parsed_contract, build_size_profile(**size_options))
+    n_invalid = plan_invalid_cases(parsed_contract, invalid_mode, n_invalid, size_profile)
+    settings = RunSettings(
+        url=url,
+        method=method,
+        headers=parse_headers(headers),
+        timeout_s=timeout_s,
+        concurrency=concurrency,
+        pool_size=pool_size,
+        max_in_flight=max_in_flight,
+        encoding=encoding,
+        schema_id=schema_id,
+        expect_2xx_for_valid=not valid_accept_3xx,
+        rps=rps,
+        duration_s=duration_s,
+        invalid_mode=invalid_mode,
+        registry_url=registry_url,
+        subject=subject,
+    )
+    phases = PhaseTimer()
+    settings = resolve_registry(parsed_contract, settings, phases)
+    total_cases = int(rps * duration_s) if rps and duration_s else n_valid + n_invalid
+
+    with RunSinks(summary_path, openmetrics_path, metrics_port) as run_sinks:
+        try:
+            with LiveProgress(total_cases) as progress:
+                def on_progress(statistics: RunStatistics) -> None:
+                    progress.update(statistics)
+                    run_sinks.update(statistics)
+
+                statistics = coordinate_agents(
+                    parsed_contract, settings, seed, n_valid, n_invalid, agents, token,
+                    on_progress=on_progress, size_profile=size_profile
+                )
+        except AgentError as err:
+            raise click.ClickException(str(err))
+        statistics.phases.merge(phases)
+        summary(statistics)
+        run_sinks.finish(statistics)
+
+
+@avroman.command("run-suite")
+@click.argument("source", type=click.Path(exists=True, readable=True, path_type=Path))
+@click.option("--url", default=None, help="Endpoint URL for every schema; '{name}' is replaced by the schema file stem. Required for a directory, a default for a manifest")
+@click.option("--method", default="POST", show_default=True, help="HTTP method")
+@click.option("--n-valid", default=25, show_default=True, type=int, help="Number of valid cases per schema")
+@click.option("--n-invalid", default=None, type=int, help="Number of invalid cases per schema [default: 25, or one per pair with --invalid-mode matrix]")
+@click.option("--invalid-mode", default=RANDOM_MUTATIONS, show_default=True, type=click.Choice(INVALID_MODES), help="random: one random top-level mutation per case; matrix: enumerate every (field path, mutation) pair once")
+@click.option("--seed", default=0, show_default=True, type=int, help="RNG seed, the same for every schema")
+@click.option("--headers", default=None, help='Extra headers as JSON string, e.g. \'{"Authorization":"Bearer ..."}\'')
+@click.option("--timeout", "timeout_s", default=10.0, show_default=True, type=float, help="Request timeout in seconds")
+@click.option("--concurrency", default=1, show_default=True, type=click.IntRange(min=1), help="Requests sent in parallel per schema")
+@click.option("--parallel", default=4, show_default=True, type=click.IntRange(min=1), help="Schemas run at the same time")
+@click.option("--encoding", default=JSON, show_default=True, type=click.Choice(ENCODINGS), help="Wire format of request bodies")
+@click.option("--registry", "registry_url", default=None, help="Schema registry URL; each schema is looked up (or registered) under its full record name, or a manifest entry's 'subject'")
+@click.option("--cache-dir", default=DEFAULT_CACHE_DIR, show_default=True, type=click.Path(file_okay=False, writable=True, path_type=Path), help="On-disk cache of parsed schemas, keyed by file contents")
+@click.option("--no-cache", is_flag=True, default=False, help="Parse every schema, without reading or writing the cache")
+@click.option("--summary-json", "summary_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Write per-schema results to this JSON file")
+@click.option(
+    "--valid-accept-3xx/--valid-accept-2xx",
+    default=False,
+    show_default=True,
+    help="If set, treat any <400 as success for valid cases (accept 3xx). Default: only 2xx is success",
+)
+@click.option("--fail-on-any/--no-fail-on-any", default=False, show_default=True, help="Exit non-zero if any schema failed to load or had an unexpected case")
+@size_profile_options
+def run_suite_command(
+    source: Path,
+    url: str | None,
+    method: str,
+    n_valid: int,
+    n_invalid: int | None,
+    invalid_mode: str,
+    seed: int,
+    headers: str | None,
+    timeout_s: float,
+    concurrency: int,
+    parallel: int,
+    encoding: str,
+    registry_url: str | None,
+    cache_dir: Path,
+    no_cache: bool,
+    summary_path: Path | None,
+    valid_accept_3xx: bool,
+    fail_on_any: bool,
+    **size_options,
+) -> None:
+    from core.statistics import LiveProgress
+    from src.pipeline import RunSettings
+    from src.schema_cache import SchemaCache
+    from src.suite import discover_entries, load_manifest, render_suite, run_suite, suite_summary
+
+    settings = RunSettings(
+        url=url or "",
+        method=method,
+        headers=parse_headers(headers),
+        timeout_s=timeout_s,
+        concurrency=concurrency,
+        encoding=encoding,
+        expect_2xx_for_valid=not valid_accept_3xx,
+        invalid_mode=invalid_mode,
+        registry_url=registry_url,
+    )
+    if source.is_dir():
+        if url is None:
+            raise click.UsageError("--url is required when SOURCE is a directory.")
+        entries = discover_entries(source, url, settings, n_valid, n_invalid)
+    else:
+        try:
+            entries = load_manifest(source, settings, n_valid, n_invalid)
+        except (ValueError, KeyError) as err:
+            raise click.BadParameter(str(err), param_hint="SOURCE")
+    if not entries:
+        raise click.UsageError(f"No schemas found in {source}.")
+
+    cache = SchemaCache(None if no_cache else cache_dir)
+    size_profile = build_size_profile(**size_options)
+    total_cases = None if n_invalid is None and invalid_mode == MUTATION_MATRIX else sum(
+        entry.n_valid + (25 if entry.n_invalid is None else entry.n_invalid) for entry in entries
+    )
+    with LiveProgress(total_cases) as progress:
+        results = run_suite(entries, cache, parallel, seed, size_profile, on_progress=progress.update)
+
+    render_suite(results, cache)
+    if summary_path is not None:
+        summary_path.write_text(json.dumps(suite_summary(results), indent=2), encoding="utf-8")
+    if fail_on_any and any(result.error is not None or result.statistics.unexpected for result in results):
+        raise SystemExit(1)
+
+
+@avroman.command()
+@click.option("--writer-schema", "writer_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), required=True, help="Schema the producer writes with")
+@click.option("--reader-schema", "reader_path", type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), required=True, help="Schema the consumer reads with")
+@click.option("--n-records", default=10_000, show_default=True, type=click.IntRange(min=1), help="Writer records to generate, encode and resolve")
+@click.option("--batch-size", default=10_000, show_default=True, type=click.IntRange(min=1), help="Records encoded into one buffer before it is decoded")
+@click.option("--seed", default=0, show_default=True, type=int, help="RNG seed")
+@click.option("--report-json", "report_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Write issues, failure counts and throughput to this JSON file")
+@click.option("--url", default=None, help="Also send resolved payloads, encoded with the reader schema, to this endpoint as valid cases")
+@click.option("--method", default="POST", show_default=True, help="HTTP method")
+@click.option("--n-send", default=100, show_default=True, type=click.IntRange(min=1), help="Resolved payloads sent with --url")
+@click.option("--headers", default=None, help='Extra headers as JSON string, e.g. \'{"Authorization":"Bearer ..."}\'')
+@click.option("--timeout", "timeout_s", default=10.0, show_default=True, type=float, help="Request timeout in seconds")
+@click.option("--concurrency", default=1, show_default=True, type=click.IntRange(min=1), help="Number of requests sent in parallel")
+@click.option("--encoding", default=JSON, show_default=True, type=click.Choice(ENCODINGS), help="Wire format of request bodies")
+@click.option("--fail-on-any/--no-fail-on-any", default=False, show_default=True, help="Exit non-zero if any record failed to resolve or any sent payload was rejected")
+@size_profile_options
+def evolve(
+    writer_path: Path,
+    reader_path: Path,
+    n_records: int,
+    batch_size: int,
+    seed: int,
+    report_path: Path | None,
+    url: str | None,
+    method: str,
+    n_send: int,
+    headers: str | None,
+    timeout_s: float,
+    concurrency: int,
+    encoding: str,
+    fail_on_any: bool,
+    **size_options,
+) -> None:
+    from src.utils import load_contract
+    from core.statistics import LiveProgress, RunStatistics, summary
+    from src.evolution import fuzz_evolution, render_evolution
+    from src.pipeline import RunSettings, build_runner, execute
+
+    writer = load_contract(writer_path)
+    reader = load_contract(reader_path)
+    size_profile = fit_target_size(writer, build_size_profile(**size_options))
+
+    report = fuzz_evolution(
+        writer, reader, n_records, seed, batch_size, size_profile, keep_resolved=n_send if url is not None else 0
+    )
+    render_evolution(report)
+    if report_path is not None:
+        report_path.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+
+    statistics = None
+    if url is not None and report.resolved:
+        settings = RunSettings(
+            url=url,
+            method=method,
+            headers=parse_headers(headers),
+            timeout_s=timeout_s,
+            concurrency=concurrency,
+            encoding=encoding,
         )
+        cases = [(f"R{i:03d}", True, payload) for i, payload in enumerate(report.resolved)]
+        statistics = RunStatistics()
+        with build_runner(reader, settings, statistics.phases) as http_runner, LiveProgress(len(cases)) as progress:
+            for record in execute(cases, http_runner.send, concurrency):
+                statistics.add(record)
+                progress.update(statistics)
+        summary(statistics)
+
+    if fail_on_any and (report.failed or (statistics is not None and statistics.unexpected)):
+        raise SystemExit(1)
+
+
+@avroman.command()
+@click.option("--schema", "contract_paths", multiple=True, type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), help="Benchmark these schemas instead of the built-in set (sample, wide_200, nested_unions, large_arrays); repeatable")
+@click.option("--n-records", default=2000, show_default=True, type=click.IntRange(min=1), help="Records per round for each schema (scaled down for the heavy built-in schemas)")
+@click.option("--repeat", default=3, show_default=True, type=click.IntRange(min=1), help="Rounds per benchmark; the fastest round is reported")
+@click.option("--seed", default=0, show_default=True, type=int, help="RNG seed")
+@click.option("--url", default=None, help="Also measure end-to-end req/s of sample.avsc cases against this endpoint")
+@click.option("--serve-demo", is_flag=True, default=False, help="Start api_demos/demo_fastapi.py on a free local port and measure end-to-end req/s against it")
+@click.option("--requests", "n_requests", default=1000, show_default=True, type=click.IntRange(min=1), help="Requests sent for the end-to-end measurement")
+@click.option("--concurrency", default=8, show_default=True, type=click.IntRange(min=1), help="Requests sent in parallel for the end-to-end measurement")
+@click.option("--save", "save_path", default=None, type=click.Path(dir_okay=False, writable=True, path_type=Path), help="Write the results to this baseline JSON file")
+@click.option("--compare", "baseline_path", default=None, type=click.Path(exists=True, dir_okay=False, readable=True, path_type=Path), help="Compare against a baseline written by --save")
+@click.option("--threshold", default=10.0, show_default=True, type=click.FloatRange(min=0), help="Slowdown in percent that counts as a regression")
+@click.option("--fail-on-regression/--no-fail-on-regression", default=False, show_default=True, help="Exit non-zero if any benchmark regressed beyond --threshold")
+def bench(
+    contract_paths: List[Path],
+    n_records: int,
+    repeat: int,
+    seed: int,
+    url: str | None,
+    serve_demo: bool,
+    n_requests: int,
+    concurrency: int,
+    save_path: Path | None,
+    baseline_path: Path | None,
+    threshold: float,
+    fail_on_regression: bool,
+) -> None:
+    # benchmarks/ sits next to src/ in the repo and is not installed with the package
+    from contextlib import nullcontext
+    try:
+        from benchmarks.bench_suite import default_cases, demo_server, load_baseline, render, run_suite, save_baseline, schema_cases
+    except ImportError as err:
+        raise click.ClickException("avroman bench runs from a source checkout; benchmarks/ is not installed") from err
+
+    if url is not None and serve_demo:
+        raise click.UsageError("--url and --serve-demo are mutually exclusive.")
+    baseline = None
+    if baseline_path is not None:
+        try:
+            baseline = load_baseline(baseline_path)
+        except ValueError as err:
+            raise click.BadParameter(str(err), param_hint="--compare")
 
-    summary(results)
+    cases = schema_cases(list(contract_paths)) if contract_paths else default_cases()
+    try:
+        with demo_server() if serve_demo else nullcontext(url) as endpoint:
+            results = run_suite(cases, n_records, repeat, seed, endpoint, n_requests, concurrency)
+    except RuntimeError as err:
+        raise click.ClickException(str(err))
 
-    # if fail_on_any and any(not result.ok for result in results):
-    #     raise SystemExit(1)
+    regressions = render(results, baseline, threshold / 100.0)
+    if save_path is not None:
+        save_baseline(save_path, results, {
+            "schemas": [case.name for case in cases],
+            "n_records": n_records,
+            "repeat": repeat,
+            "seed": seed,
+            "n_requests": n_requests,
+            "concurrency": concurrency,
+        })
+    if fail_on_regression and regressions:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
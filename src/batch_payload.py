@@ -0,0 +1,265 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import base64
+import random
+import string
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+from src.payload_generation_utils import _is_branch_empty, _is_email_field_valid, _is_string_valid_contract
+from src.payload_generation_utils import _union_contains_string, EMAIL_PROVIDERS
+from src.size_profile import DEFAULT_SIZE_PROFILE, SizeProfile, SizeRange, fit_size_profile
+from src.named_types import PRIMITIVE_TYPES, named_schema_index
+from src.compile_payload import compile_terminal_generator
+from src.logical_types import BOUNDARY_PROBABILITY, LOGICAL_RANGES, LogicalRange, logical_key, logical_type_generator
+
+_ALPHANUMERIC = np.frombuffer((string.ascii_letters + string.digits).encode("ascii"), dtype=np.uint8)
+_EMAIL_CHARACTERS = np.frombuffer((string.ascii_lowercase + string.digits).encode("ascii"), dtype=np.uint8)
+
+
+def _split(values: List[Any], lengths: np.ndarray) -> List[List[Any]]:
+    ends = np.cumsum(lengths).tolist()
+    starts = [0] + ends[:-1]
+    return [values[start:end] for start, end in zip(starts, ends)]
+
+
+def _string_column(
+    n: int,
+    gen: np.random.Generator,
+    minimum_length: int,
+    maximum_length: int,
+    alphabet: np.ndarray = _ALPHANUMERIC
+) -> List[str]:
+    lengths = gen.integers(minimum_length, maximum_length + 1, n)
+    characters = alphabet[gen.integers(0, len(alphabet), int(lengths.sum()))]
+    text = characters.tobytes().decode("ascii")
+    return _split(text, lengths)
+
+
+def _bytes_column(
+    n: int,
+    gen: np.random.Generator,
+    minimum_length: int,
+    maximum_length: int
+) -> List[str]:
+    lengths = gen.integers(minimum_length, maximum_length + 1, n)
+    raw_data = gen.bytes(int(lengths.sum()))
+    return [base64.b64encode(chunk).decode("ascii") for chunk in _split(raw_data, lengths)]
+
+
+def _email_column(
+    n: int,
+    gen: np.random.Generator
+) -> List[str]:
+    local_parts = _string_column(n, gen, 3, 12, _EMAIL_CHARACTERS)
+    providers = gen.integers(0, len(EMAIL_PROVIDERS), n).tolist()
+    return [f"{local}@{EMAIL_PROVIDERS[provider]}" for local, provider in zip(local_parts, providers)]
+
+
+def _primitive_column(
+    contract: str,
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    size: SizeRange | None = None
+) -> List[Any]:
+    if contract == "null":
+        return [None] * n
+    if contract == "boolean":
+        return gen.integers(0, 2, n).astype(bool).tolist()
+    if contract == "int":
+        return gen.integers(-1000, 5001, n).tolist()
+    if contract == "long":
+        return gen.integers(-10000, 200001, n).tolist()
+    if contract in ["float", "double"]:
+        return gen.uniform(-1000.0, 5000.0, n).tolist()
+    if contract == "string":
+        string_length = size or size_profile.string_length
+        return _string_column(n, gen, string_length.minimum, string_length.maximum)
+    if contract == "bytes":
+        bytes_length = size or size_profile.bytes_length
+        return _bytes_column(n, gen, bytes_length.minimum, bytes_length.maximum)
+
+    return _string_column(n, gen, 4, 20)
+
+
+def _union_column(
+    contract: List[Any],
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    size: SizeRange | None = None,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = ()
+) -> List[Any]:
+    empty_branches = [branch for branch in contract if _is_branch_empty(branch)]
+    non_empty_branches = [branch for branch in contract if branch not in empty_branches]
+    branches = non_empty_branches if non_empty_branches else contract
+
+    selected = gen.integers(0, len(branches), n)
+    if empty_branches:
+        selected = np.where(gen.random(n) < 0.25, -1, selected)
+        branches = branches + [empty_branches[0]]
+        selected[selected == -1] = len(branches) - 1
+
+    column: List[Any] = [None] * n
+    for branch_index, branch in enumerate(branches):
+        rows = np.flatnonzero(selected == branch_index).tolist()
+        if not rows:
+            continue
+        for row, value in zip(rows, _column(branch, len(rows), gen, size_profile, size, named_schemas, expanding)):
+            column[row] = value
+    return column
+
+
+def _record_field_column(
+    record_name: str,
+    field: Dict[str, Any],
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = ()
+) -> List[Any]:
+    name = field["name"]
+    field_contract = field["type"]
+    field_default = field.get("default", None) if "default" in field else None
+
+    if _is_email_field_valid(name) and (_is_string_valid_contract(field_contract) or _union_contains_string(field_contract)):
+        column = _email_column(n, gen)
+    else:
+        column = _column(
+            field_contract, n, gen, size_profile, size_profile.for_field(record_name, name), named_schemas, expanding
+        )
+
+    if field_default is not None:
+        for row in np.flatnonzero(gen.random(n) < 0.15).tolist():
+            column[row] = field_default
+    return column
+
+
+def _record_column(
+    contract: Dict[str, Any],
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = ()
+) -> List[Dict[str, Any]]:
+    fields = contract.get("fields", [])
+    names = [field["name"] for field in fields]
+    record_name = contract.get("name", "")
+    columns = [_record_field_column(record_name, field, n, gen, size_profile, named_schemas, expanding) for field in fields]
+    if not columns:
+        return [{} for _ in range(n)]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _logical_range_column(
+    logical_range: LogicalRange,
+    n: int,
+    gen: np.random.Generator
+) -> List[int]:
+    values = gen.integers(logical_range.low, logical_range.high + 1, n, dtype=np.int64)
+    at_boundary = gen.random(n) < BOUNDARY_PROBABILITY
+    boundaries = np.array(logical_range.boundaries, dtype=np.int64)
+    values[at_boundary] = boundaries[gen.integers(0, len(boundaries), int(at_boundary.sum()))]
+    return values.tolist()
+
+
+def _dict_column(
+    contract: Dict[str, Any],
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    size: SizeRange | None = None,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = ()
+) -> List[Any]:
+    logical_range = LOGICAL_RANGES.get(logical_key(contract))
+    if logical_range is not None:
+        return _logical_range_column(logical_range, n, gen)
+    generate_logical_type = logical_type_generator(contract)
+    if generate_logical_type is not None:
+        rng = random.Random(int(gen.integers(0, 1 << 63)))
+        return [generate_logical_type(rng) for _ in range(n)]
+
+    data_type = contract.get("type")
+
+    if data_type == "record":
+        return _record_column(contract, n, gen, size_profile, named_schemas, expanding)
+    items = size or size_profile.items
+    if data_type == "array":
+        lengths = gen.integers(items.minimum, items.maximum + 1, n)
+        return _split(_column(contract["items"], int(lengths.sum()), gen, size_profile, None, named_schemas, expanding), lengths)
+    if data_type == "map":
+        lengths = gen.integers(items.minimum, items.maximum + 1, n)
+        total = int(lengths.sum())
+        key_length = size_profile.map_key_length
+        keys = _split(_string_column(total, gen, key_length.minimum, key_length.maximum), lengths)
+        values = _split(_column(contract["values"], total, gen, size_profile, None, named_schemas, expanding), lengths)
+        return [dict(zip(row_keys, row_values)) for row_keys, row_values in zip(keys, values)]
+    if data_type == "enum":
+        symbols = contract["symbols"]
+        return [symbols[index] for index in gen.integers(0, len(symbols), n).tolist()]
+    if data_type == "fixed":
+        return _bytes_column(n, gen, int(contract["size"]), int(contract["size"]))
+    if isinstance(data_type, (str, list)):
+        return _column(data_type, n, gen, size_profile, size, named_schemas, expanding)
+
+    return [None] * n
+
+
+def _named_column(
+    name: str,
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    named_schemas: Dict[str, Any],
+    expanding: Tuple[str, ...]
+) -> List[Any]:
+    if expanding.count(name) >= size_profile.max_depth:
+        generate_terminal = compile_terminal_generator(name, named_schemas)
+        rng = random.Random(int(gen.integers(0, 1 << 63)))
+        return [generate_terminal(rng) for _ in range(n)]
+    return _column(named_schemas[name], n, gen, size_profile, None, named_schemas, expanding + (name,))
+
+
+def _column(
+    contract: Any,
+    n: int,
+    gen: np.random.Generator,
+    size_profile: SizeProfile,
+    size: SizeRange | None = None,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = ()
+) -> List[Any]:
+    if n <= 0:
+        return []
+
+    if isinstance(contract, list):
+        return _union_column(contract, n, gen, size_profile, size, named_schemas, expanding)
+
+    if isinstance(contract, str):
+        if contract not in PRIMITIVE_TYPES and named_schemas and contract in named_schemas:
+            return _named_column(contract, n, gen, size_profile, named_schemas, expanding)
+        return _primitive_column(contract, n, gen, size_profile, size)
+
+    if isinstance(contract, dict):
+        return _dict_column(contract, n, gen, size_profile, size, named_schemas, expanding)
+    return [None] * n
+
+
+def generate_valid_batch(
+    contract: Any,
+    n: int,
+    seed: int = 0,
+    size_profile: SizeProfile | None = None
+) -> List[Any]:
+    gen = np.random.default_rng(seed)
+    size_profile = size_profile or DEFAULT_SIZE_PROFILE
+    if size_profile.target_bytes is not None:
+        size_profile, _ = fit_size_profile(contract, size_profile)
+    return _column(contract, n, gen, size_profile, None, named_schema_index(contract))
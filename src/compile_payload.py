@@ -0,0 +1,325 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Dict, FrozenSet, List, Tuple
+
+from src.logical_types import logical_type_generator
+from src.payload_generation_utils import _generate_random_string, _rand_bytes_to_b64, _rand_fixed_bytes_to_b64
+from src.payload_generation_utils import _is_branch_empty, _is_email_field_valid, _is_string_valid_contract
+from src.payload_generation_utils import _union_contains_string, _rand_email_gen
+from src.size_profile import DEFAULT_SIZE_PROFILE, SizeProfile, SizeRange, fit_size_profile
+from src.named_types import can_terminate, named_schema_index, recursive_names
+
+PayloadGenerator = Callable[[random.Random], Any]
+
+
+def _generate_null(rng: random.Random) -> None:
+    return None
+
+
+def _generate_boolean(rng: random.Random) -> bool:
+    return bool(rng.randint(0, 1))
+
+
+def _generate_int(rng: random.Random) -> int:
+    return rng.randint(-1000, 5000)
+
+
+def _generate_long(rng: random.Random) -> int:
+    return rng.randint(-10000, 200000)
+
+
+def _generate_floating(rng: random.Random) -> float:
+    return rng.uniform(-1000.0, 5000.0)
+
+
+def _generate_unknown(rng: random.Random) -> str:
+    return _generate_random_string(rng)
+
+
+_PRIMITIVE_GENERATORS: Dict[str, PayloadGenerator] = {
+    "null": _generate_null,
+    "boolean": _generate_boolean,
+    "int": _generate_int,
+    "long": _generate_long,
+    "float": _generate_floating,
+    "double": _generate_floating,
+}
+
+
+def _compile_string(size: SizeRange) -> PayloadGenerator:
+    minimum, maximum = size.minimum, size.maximum
+
+    def generate_string(rng: random.Random) -> str:
+        return _generate_random_string(rng, minimum, maximum)
+
+    return generate_string
+
+
+def _compile_bytes(size: SizeRange) -> PayloadGenerator:
+    minimum, maximum = size.minimum, size.maximum
+
+    def generate_bytes(rng: random.Random) -> str:
+        return _rand_bytes_to_b64(rng, minimum, maximum)
+
+    return generate_bytes
+
+
+def _generate_empty_list(rng: random.Random) -> List[Any]:
+    return []
+
+
+def _generate_empty_dict(rng: random.Random) -> Dict[str, Any]:
+    return {}
+
+
+def _constant_generator(value: Any) -> PayloadGenerator:
+    def generate_constant(rng: random.Random) -> Any:
+        return value
+
+    return generate_constant
+
+
+class _GeneratorCompiler:
+    # `size` is a per-field override; it applies to the first string, bytes,
+    # array or map under the field (through unions), not to nested items.
+    # Named references resolve through the schema's named-type index. Every
+    # expansion of a recursive type uses up one level of size_profile.max_depth;
+    # past it the type compiles to its smallest finite value.
+    def __init__(self, size_profile: SizeProfile, named_schemas: Dict[str, Any]) -> None:
+        self.size_profile = size_profile
+        self.named_schemas = named_schemas
+        self.recursive = recursive_names(named_schemas)
+        self.depth = 0
+        self.named_generators: Dict[Tuple[str, int], PayloadGenerator] = {}
+
+    def compile(self, contract: Any, size: SizeRange | None = None) -> PayloadGenerator:
+        if isinstance(contract, list):
+            return self._compile_union(contract, size)
+
+        if isinstance(contract, str):
+            if contract == "string":
+                return _compile_string(size or self.size_profile.string_length)
+            if contract == "bytes":
+                return _compile_bytes(size or self.size_profile.bytes_length)
+            if contract in _PRIMITIVE_GENERATORS:
+                return _PRIMITIVE_GENERATORS[contract]
+            if contract in self.named_schemas:
+                return self._compile_named_reference(contract)
+            return _generate_unknown
+
+        if isinstance(contract, dict):
+            return self._compile_dict_contract(contract, size)
+
+        return _generate_null
+
+    def _compile_named_reference(self, name: str) -> PayloadGenerator:
+        recursive = name in self.recursive
+        if recursive and self.depth >= self.size_profile.max_depth:
+            return self._compile_terminal(name, frozenset())
+
+        key = (name, self.depth)
+        if key not in self.named_generators:
+            if recursive:
+                self.depth += 1
+            try:
+                self.named_generators[key] = self.compile(self.named_schemas[name])
+            finally:
+                if recursive:
+                    self.depth -= 1
+        return self.named_generators[key]
+
+    def _compile_terminal(self, contract: Any, expanding: FrozenSet[str]) -> PayloadGenerator:
+        # null branches, empty collections and field defaults; only recursion-free
+        # branches are taken so the value is finite.
+        if isinstance(contract, list):
+            branches = [branch for branch in contract if can_terminate(branch, self.named_schemas, expanding)]
+            if not branches:
+                raise ValueError(f"Recursive union has no finite branch: {contract!r}")
+            empty_branches = [branch for branch in branches if _is_branch_empty(branch)]
+            if empty_branches:
+                return _generate_null
+            branch_generators = [self._compile_terminal(branch, expanding) for branch in branches]
+            if len(branch_generators) == 1:
+                return branch_generators[0]
+
+            def generate_terminal_union(rng: random.Random) -> Any:
+                return rng.choice(branch_generators)(rng)
+            return generate_terminal_union
+
+        if isinstance(contract, str):
+            if contract not in self.named_schemas:
+                return self.compile(contract)
+            if contract in expanding:
+                raise ValueError(f"Recursive type {contract} has no finite value")
+            return self._compile_terminal(self.named_schemas[contract], expanding | {contract})
+
+        if not isinstance(contract, dict):
+            return _generate_null
+
+        data_type = contract.get("type")
+        if data_type == "array":
+            return _generate_empty_list
+        if data_type == "map":
+            return _generate_empty_dict
+        if data_type == "record":
+            return self._compile_terminal_record(contract, expanding | {contract.get("name", "")})
+        if isinstance(data_type, (str, list)) and data_type not in ("enum", "fixed") and "logicalType" not in contract:
+            return self._compile_terminal(data_type, expanding)
+        return self.compile(contract)
+
+    def _compile_terminal_record(self, contract: Dict[str, Any], expanding: FrozenSet[str]) -> PayloadGenerator:
+        fields = []
+        for field in contract.get("fields", []):
+            name = field["name"]
+            field_contract = field["type"]
+            if _is_email_field_valid(name) and (_is_string_valid_contract(field_contract) or _union_contains_string(field_contract)):
+                fields.append((name, _rand_email_gen))
+            elif can_terminate(field_contract, self.named_schemas, expanding):
+                fields.append((name, self._compile_terminal(field_contract, expanding)))
+            elif "default" in field:
+                fields.append((name, _constant_generator(field["default"])))
+            else:
+                raise ValueError(f"Recursive field {contract.get('name')}.{name} has no finite value")
+        fields = tuple(fields)
+
+        def generate_terminal_record(rng: random.Random) -> Dict[str, Any]:
+            return {name: generate_field(rng) for name, generate_field in fields}
+
+        return generate_terminal_record
+
+    def _compile_union(self, contract: List[Any], size: SizeRange | None) -> PayloadGenerator:
+        empty_branches = [branch for branch in contract if _is_branch_empty(branch)]
+        non_empty_branches = [branch for branch in contract if branch not in empty_branches]
+        branch_generators = [
+            self.compile(branch, size) for branch in (non_empty_branches if non_empty_branches else contract)
+        ]
+
+        if not empty_branches:
+            def generate_union(rng: random.Random) -> Any:
+                return rng.choice(branch_generators)(rng)
+            return generate_union
+
+        empty_generator = self.compile(empty_branches[0])
+
+        def generate_nullable_union(rng: random.Random) -> Any:
+            if rng.random() < 0.25:
+                return empty_generator(rng)
+            return rng.choice(branch_generators)(rng)
+
+        return generate_nullable_union
+
+    def _compile_record_field(self, record_name: str, field: Dict[str, Any]) -> Tuple[str, PayloadGenerator]:
+        name = field["name"]
+        field_contract = field["type"]
+        field_default = field.get("default", None) if "default" in field else None
+
+        if _is_email_field_valid(name) and (_is_string_valid_contract(field_contract) or _union_contains_string(field_contract)):
+            value_generator: PayloadGenerator = _rand_email_gen
+        else:
+            value_generator = self.compile(field_contract, self.size_profile.for_field(record_name, name))
+
+        if field_default is None:
+            return name, value_generator
+
+        def generate_defaulted_field(rng: random.Random) -> Any:
+            if rng.random() < 0.15:
+                return field_default
+            return value_generator(rng)
+
+        return name, generate_defaulted_field
+
+    def _compile_record(self, contract: Dict[str, Any], size: SizeRange | None) -> PayloadGenerator:
+        record_name = contract.get("name", "")
+        fields = tuple(self._compile_record_field(record_name, field) for field in contract.get("fields", []))
+
+        def generate_record(rng: random.Random) -> Dict[str, Any]:
+            return {name: generate_field(rng) for name, generate_field in fields}
+
+        return generate_record
+
+    def _compile_array(self, contract: Dict[str, Any], size: SizeRange | None) -> PayloadGenerator:
+        items_generator = self.compile(contract["items"])
+        items = size or self.size_profile.items
+        minimum, maximum = items.minimum, items.maximum
+
+        def generate_array(rng: random.Random) -> List[Any]:
+            return [items_generator(rng) for _ in range(rng.randint(minimum, maximum))]
+
+        return generate_array
+
+    def _compile_map(self, contract: Dict[str, Any], size: SizeRange | None) -> PayloadGenerator:
+        values_generator = self.compile(contract["values"])
+        items = size or self.size_profile.items
+        minimum, maximum = items.minimum, items.maximum
+        key_length = self.size_profile.map_key_length
+        key_minimum, key_maximum = key_length.minimum, key_length.maximum
+
+        def generate_map(rng: random.Random) -> Dict[str, Any]:
+            return {
+                _generate_random_string(rng, key_minimum, key_maximum): values_generator(rng)
+                for _ in range(rng.randint(minimum, maximum))
+            }
+
+        return generate_map
+
+    def _compile_enum(self, contract: Dict[str, Any], size: SizeRange | None) -> PayloadGenerator:
+        symbols = list(contract["symbols"])
+
+        def generate_enum(rng: random.Random) -> str:
+            return rng.choice(symbols)
+
+        return generate_enum
+
+    def _compile_fixed(self, contract: Dict[str, Any], size: SizeRange | None) -> PayloadGenerator:
+        fixed_size = int(contract["size"])
+
+        def generate_fixed(rng: random.Random) -> str:
+            return _rand_fixed_bytes_to_b64(rng, fixed_size)
+
+        return generate_fixed
+
+    def _compile_dict_contract(self, contract: Dict[str, Any], size: SizeRange | None) -> PayloadGenerator:
+        generate_logical_type = logical_type_generator(contract)
+        if generate_logical_type is not None:
+            return generate_logical_type
+
+        data_type = contract.get("type")
+        dict_compiler = _DICT_COMPILERS.get(data_type)
+        if dict_compiler is not None:
+            return dict_compiler(self, contract, size)
+        # {"type": "long"} and unknown logical types generate as their plain type
+        return self.compile(data_type, size) if isinstance(data_type, (str, list)) else _generate_null
+
+
+_DICT_COMPILERS: Dict[str, Callable[[_GeneratorCompiler, Dict[str, Any], SizeRange | None], PayloadGenerator]] = {
+    "record": _GeneratorCompiler._compile_record,
+    "array": _GeneratorCompiler._compile_array,
+    "map": _GeneratorCompiler._compile_map,
+    "enum": _GeneratorCompiler._compile_enum,
+    "fixed": _GeneratorCompiler._compile_fixed,
+}
+
+
+def compile_payload_generator(
+    contract: Any,
+    size_profile: SizeProfile | None = None,
+    named_schemas: Dict[str, Any] | None = None
+) -> PayloadGenerator:
+    # `named_schemas` resolves names in a sub-contract of a parsed schema.
+    size_profile = size_profile or DEFAULT_SIZE_PROFILE
+    if size_profile.target_bytes is not None:
+        size_profile, _ = fit_size_profile(contract, size_profile)
+    if named_schemas is None:
+        named_schemas = named_schema_index(contract)
+    return _GeneratorCompiler(size_profile, named_schemas).compile(contract)
+
+
+def compile_terminal_generator(
+    contract: Any,
+    named_schemas: Dict[str, Any]
+) -> PayloadGenerator:
+    # Smallest finite value for `contract`, used once a recursive type is out of depth.
+    return _GeneratorCompiler(DEFAULT_SIZE_PROFILE, named_schemas)._compile_terminal(contract, frozenset())
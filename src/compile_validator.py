@@ -0,0 +1,300 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import array
+import numbers
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+from fastavro.logical_writers import LOGICAL_WRITERS
+
+INT_MIN_VALUE = -(1 << 31)
+INT_MAX_VALUE = (1 << 31) - 1
+LONG_MIN_VALUE = -(1 << 63)
+LONG_MAX_VALUE = (1 << 63) - 1
+
+TYPE_MISMATCH = "type_mismatch"
+OUT_OF_RANGE = "out_of_range"
+NULL_VALUE = "null_value"
+MISSING_FIELD = "missing_field"
+INVALID_ENUM = "invalid_enum"
+INVALID_SIZE = "invalid_size"
+INVALID_MAP_KEY = "invalid_map_key"
+RECORD_NAME_MISMATCH = "record_name_mismatch"
+
+
+class InvalidReason(NamedTuple):
+    code: str
+    field: str
+
+
+Validator = Callable[[Any], "InvalidReason | None"]
+_Check = Callable[[Any], "InvalidReason | None"]
+
+_NO_VALUE = object()
+
+
+def _compile_null(path: str) -> _Check:
+    reason = InvalidReason(TYPE_MISMATCH, path)
+
+    def check_null(datum: Any) -> InvalidReason | None:
+        return None if datum is None else reason
+    return check_null
+
+
+def _instance_check(python_types: Any, path: str) -> _Check:
+    type_reason = InvalidReason(TYPE_MISMATCH, path)
+    null_reason = InvalidReason(NULL_VALUE, path)
+
+    def check_instance(datum: Any) -> InvalidReason | None:
+        if isinstance(datum, python_types):
+            return None
+        return null_reason if datum is None else type_reason
+    return check_instance
+
+
+def _integer_check(minimum: int, maximum: int, path: str) -> _Check:
+    type_reason = InvalidReason(TYPE_MISMATCH, path)
+    null_reason = InvalidReason(NULL_VALUE, path)
+    range_reason = InvalidReason(OUT_OF_RANGE, path)
+
+    def check_integer(datum: Any) -> InvalidReason | None:
+        if isinstance(datum, bool) or not isinstance(datum, (int, numbers.Integral)):
+            return null_reason if datum is None else type_reason
+        if minimum <= datum <= maximum:
+            return None
+        return range_reason
+    return check_integer
+
+
+def _floating_check(path: str) -> _Check:
+    type_reason = InvalidReason(TYPE_MISMATCH, path)
+    null_reason = InvalidReason(NULL_VALUE, path)
+
+    def check_floating(datum: Any) -> InvalidReason | None:
+        if isinstance(datum, bool) or not isinstance(datum, (int, float, numbers.Real)):
+            return null_reason if datum is None else type_reason
+        return None
+    return check_floating
+
+
+def _compile_primitive(contract: str, path: str) -> _Check | None:
+    if contract == "null":
+        return _compile_null(path)
+    if contract == "boolean":
+        return _instance_check(bool, path)
+    if contract == "string":
+        return _instance_check(str, path)
+    if contract == "bytes":
+        return _instance_check((bytes, bytearray), path)
+    if contract == "int":
+        return _integer_check(INT_MIN_VALUE, INT_MAX_VALUE, path)
+    if contract == "long":
+        return _integer_check(LONG_MIN_VALUE, LONG_MAX_VALUE, path)
+    if contract in ("float", "double"):
+        return _floating_check(path)
+    return None
+
+
+class _ValidatorCompiler:
+    def __init__(self, named_schemas: Dict[str, Any], strict: bool) -> None:
+        self.named_schemas = named_schemas
+        self.strict = strict
+        self.named_checks: Dict[Tuple[str, str], _Check] = {}
+
+    def compile(self, contract: Any, path: str) -> _Check:
+        if isinstance(contract, list):
+            return self._compile_union(contract, path)
+
+        if isinstance(contract, str):
+            primitive_check = _compile_primitive(contract, path)
+            if primitive_check is not None:
+                return primitive_check
+            return self._compile_named_reference(contract, path)
+
+        if isinstance(contract, dict):
+            return self._compile_dict(contract, path)
+
+        raise ValueError(f"Unsupported contract node: {contract!r}")
+
+    def _compile_named_reference(self, name: str, path: str) -> _Check:
+        key = (name, path)
+        if key in self.named_checks:
+            return self.named_checks[key]
+        if name not in self.named_schemas:
+            raise ValueError(f"Unknown type: {name}")
+
+        resolved: List[_Check] = []
+
+        def check_named(datum: Any) -> InvalidReason | None:
+            return resolved[0](datum)
+
+        self.named_checks[key] = check_named
+        resolved.append(self.compile(self.named_schemas[name], path))
+        return check_named
+
+    def _compile_dict(self, contract: Dict[str, Any], path: str) -> _Check:
+        data_type = contract.get("type")
+        base_check = self._compile_dict_type(contract, data_type, path)
+
+        logical_type = contract.get("logicalType")
+        prepare = LOGICAL_WRITERS.get(f"{data_type}-{logical_type}") if logical_type else None
+        if prepare is None:
+            return base_check
+
+        reason = InvalidReason(TYPE_MISMATCH, path)
+
+        def check_logical(datum: Any) -> InvalidReason | None:
+            try:
+                datum = prepare(datum, contract)
+            except Exception:
+                return reason
+            return base_check(datum)
+        return check_logical
+
+    def _compile_dict_type(self, contract: Dict[str, Any], data_type: Any, path: str) -> _Check:
+        if data_type in ("record", "error", "request"):
+            return self._compile_record(contract, path)
+        if data_type == "array":
+            return self._compile_array(contract, path)
+        if data_type == "map":
+            return self._compile_map(contract, path)
+        if data_type == "enum":
+            return self._compile_enum(contract, path)
+        if data_type == "fixed":
+            return self._compile_fixed(contract, path)
+        return self.compile(data_type, path)
+
+    def _compile_record(self, contract: Dict[str, Any], path: str) -> _Check:
+        fullname = contract.get("name", "")
+        if fullname in self.named_schemas and (fullname, path) not in self.named_checks:
+            return self._compile_named_reference(fullname, path)
+
+        fields = tuple(
+            (
+                field["name"],
+                field.get("default", _NO_VALUE),
+                self.compile(field["type"], f"{fullname}.{field['name']}"),
+                InvalidReason(MISSING_FIELD, f"{fullname}.{field['name']}"),
+            )
+            for field in contract.get("fields", [])
+        )
+        strict = self.strict
+        type_reason = InvalidReason(TYPE_MISMATCH, path)
+        null_reason = InvalidReason(NULL_VALUE, path)
+        name_reason = InvalidReason(RECORD_NAME_MISMATCH, path)
+
+        def check_record(datum: Any) -> InvalidReason | None:
+            if not isinstance(datum, Mapping):
+                return null_reason if datum is None else type_reason
+            if "-type" in datum and datum["-type"] != fullname:
+                return name_reason
+
+            for name, default, check_field, missing_reason in fields:
+                if name in datum:
+                    reason = check_field(datum[name])
+                elif default is not _NO_VALUE:
+                    reason = check_field(default)
+                else:
+                    if strict or check_field(None) is not None:
+                        return missing_reason
+                    reason = None
+                if reason is not None:
+                    return reason
+            return None
+        return check_record
+
+    def _compile_array(self, contract: Dict[str, Any], path: str) -> _Check:
+        check_item = self.compile(contract["items"], path)
+        type_reason = InvalidReason(TYPE_MISMATCH, path)
+        null_reason = InvalidReason(NULL_VALUE, path)
+
+        def check_array(datum: Any) -> InvalidReason | None:
+            if not isinstance(datum, (Sequence, array.array)) or isinstance(datum, str):
+                return null_reason if datum is None else type_reason
+            for item in datum:
+                reason = check_item(item)
+                if reason is not None:
+                    return reason
+            return None
+        return check_array
+
+    def _compile_map(self, contract: Dict[str, Any], path: str) -> _Check:
+        check_value = self.compile(contract["values"], path)
+        type_reason = InvalidReason(TYPE_MISMATCH, path)
+        null_reason = InvalidReason(NULL_VALUE, path)
+        key_reason = InvalidReason(INVALID_MAP_KEY, path)
+
+        def check_map(datum: Any) -> InvalidReason | None:
+            if not isinstance(datum, Mapping):
+                return null_reason if datum is None else type_reason
+            for key, value in datum.items():
+                if not isinstance(key, str):
+                    return key_reason
+                reason = check_value(value)
+                if reason is not None:
+                    return reason
+            return None
+        return check_map
+
+    def _compile_enum(self, contract: Dict[str, Any], path: str) -> _Check:
+        symbols = list(contract["symbols"])
+        enum_reason = InvalidReason(INVALID_ENUM, path)
+        null_reason = InvalidReason(NULL_VALUE, path)
+
+        def check_enum(datum: Any) -> InvalidReason | None:
+            try:
+                if datum in symbols:
+                    return None
+            except Exception:
+                pass
+            return null_reason if datum is None else enum_reason
+        return check_enum
+
+    def _compile_fixed(self, contract: Dict[str, Any], path: str) -> _Check:
+        size = contract["size"]
+        type_reason = InvalidReason(TYPE_MISMATCH, path)
+        null_reason = InvalidReason(NULL_VALUE, path)
+        size_reason = InvalidReason(INVALID_SIZE, path)
+
+        def check_fixed(datum: Any) -> InvalidReason | None:
+            if not isinstance(datum, (bytes, bytearray)):
+                return null_reason if datum is None else type_reason
+            return None if len(datum) == size else size_reason
+        return check_fixed
+
+    def _compile_union(self, contract: List[Any], path: str) -> _Check:
+        branch_checks = tuple(self.compile(branch, path) for branch in contract)
+        accepts_null = any(
+            branch == "null" or (isinstance(branch, dict) and branch.get("type") == "null") for branch in contract
+        )
+        type_reason = InvalidReason(TYPE_MISMATCH, path)
+        null_reason = InvalidReason(NULL_VALUE, path)
+
+        def check_union(datum: Any) -> InvalidReason | None:
+            if datum is None and accepts_null:
+                return None
+            first_reason = None
+            for check_branch in branch_checks:
+                reason = check_branch(datum)
+                if reason is None:
+                    return None
+                if first_reason is None or first_reason.code == TYPE_MISMATCH:
+                    first_reason = reason
+            if datum is None:
+                return null_reason
+            if first_reason is not None and first_reason.field != path:
+                return first_reason
+            return type_reason
+        return check_union
+
+
+def compile_validator(
+    parsed_contract: Any,
+    strict: bool = False,
+    named_schemas: Dict[str, Any] | None = None
+) -> Validator:
+    # `named_schemas` resolves names in a sub-contract of a parsed schema.
+    if named_schemas is None:
+        named_schemas = parsed_contract.get("__named_schemas", {}) if isinstance(parsed_contract, dict) else {}
+    return _ValidatorCompiler(named_schemas, strict).compile(parsed_contract, "")
@@ -0,0 +1,15 @@
+# Created by AG on 18-10-2026
+
+from pathlib import Path
+
+# Names shared by the CLI options and the modules behind them, kept free of
+# third-party imports so `avroman --help` does not load the generators.
+
+RANDOM_MUTATIONS = "random"
+MUTATION_MATRIX = "matrix"
+INVALID_MODES = (RANDOM_MUTATIONS, MUTATION_MATRIX)
+
+CODECS = ("null", "deflate", "zstandard")
+DEFAULT_AGENT_PORT = 7878
+AGENT_TOKEN_ENV = "AVROMAN_AGENT_TOKEN"
+DEFAULT_CACHE_DIR = Path(".avroman-cache")
@@ -0,0 +1,155 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from importlib import import_module
+from typing import Any, Dict, Iterable, Iterator, Tuple
+from fastavro import block_reader, parse_schema, writer
+from fastavro.schema import to_parsing_canonical_form
+from core.encoding import from_avro_converter, schema_fingerprint, to_avro_converter
+from src.compile_validator import compile_validator
+from src.pipeline import Case, LabelledCase
+from src.constants import CODECS
+
+SIDECAR_SUFFIX = ".invalid.jsonl"
+METADATA_PREFIX = "avroman."
+
+
+def sidecar_path(corpus_path: str | Path) -> Path:
+    corpus_path = Path(corpus_path)
+    return corpus_path.with_name(corpus_path.stem + SIDECAR_SUFFIX)
+
+
+def raw_contract(parsed_contract: Any) -> Any:
+    if not isinstance(parsed_contract, dict):
+        return parsed_contract
+    return {
+        key: value for key, value in parsed_contract.items() if key not in ("__fastavro_parsed", "__named_schemas")
+    }
+
+
+def _case_schema(parsed_contract: Any) -> Dict[str, Any]:
+    return parse_schema({
+        "type": "record",
+        "name": "CorpusCase",
+        "namespace": "avroman",
+        "fields": [
+            {"name": "id", "type": "string"},
+            {"name": "payload", "type": raw_contract(parsed_contract)}
+        ]
+    })
+
+
+def _zstd_available() -> bool:
+    # the libraries fastavro looks for, in its order: the 3.14 stdlib module, then its backport
+    for module in ("compression.zstd", "backports.zstd"):
+        try:
+            import_module(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def check_codec(codec: str) -> None:
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec {codec!r}, expected one of {', '.join(CODECS)}")
+    if codec == "zstandard" and not _zstd_available():
+        raise ValueError("The zstandard codec needs a zstd library: pip install 'avroman[zstd]'")
+
+
+def write_corpus(
+    corpus_path: str | Path,
+    parsed_contract: Dict[str, Any],
+    cases: Iterable[LabelledCase],
+    metadata: Dict[str, Any] | None = None,
+    codec: str = "deflate"
+) -> Dict[str, Any]:
+    check_codec(codec)
+    corpus_path = Path(corpus_path)
+    to_avro = to_avro_converter(parsed_contract)
+    validator = compile_validator(parsed_contract)
+    counts: Dict[str, Any] = {"encoded": 0, "sidecar": 0, "mutations": {}}
+
+    header = {f"{METADATA_PREFIX}{key}": str(value) for key, value in (metadata or {}).items()}
+    header[f"{METADATA_PREFIX}sidecar"] = sidecar_path(corpus_path).name
+    header[f"{METADATA_PREFIX}fingerprint"] = schema_fingerprint(parsed_contract).hex()
+
+    with corpus_path.open("wb") as corpus_file, sidecar_path(corpus_path).open("w", encoding="utf-8") as sidecar_file:
+        def encodable_cases() -> Iterator[Dict[str, Any]]:
+            # sidecar lines keep their position in `cases`, so replay can put them back between container records
+            for ordinal, (case_id, is_valid, payload, mutation) in enumerate(cases):
+                if mutation is not None:
+                    counts["mutations"][mutation] = counts["mutations"].get(mutation, 0) + 1
+
+                datum = to_avro(payload)
+                if is_valid and validator(datum) is None:
+                    counts["encoded"] += 1
+                    yield {"id": case_id, "payload": datum}
+                    continue
+
+                counts["sidecar"] += 1
+                sidecar_file.write(json.dumps(
+                    {"id": case_id, "ordinal": ordinal, "is_valid": is_valid, "mutation": mutation, "payload": payload},
+                    separators=(",", ":")
+                ))
+                sidecar_file.write("\n")
+
+        writer(corpus_file, _case_schema(parsed_contract), encodable_cases(), codec=codec, metadata=header)
+
+    return counts
+
+
+def read_corpus_header(corpus_path: str | Path) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    with Path(corpus_path).open("rb") as corpus_file:
+        blocks = block_reader(corpus_file)
+        payload_contract = next(
+            field["type"] for field in blocks.writer_schema["fields"] if field["name"] == "payload"
+        )
+        metadata = {
+            key[len(METADATA_PREFIX):]: value for key, value in blocks.metadata.items() if key.startswith(METADATA_PREFIX)
+        }
+    return parse_schema(payload_contract), metadata
+
+
+def _iter_sidecar(sidecar: Path) -> Iterator[Tuple[int | None, Case]]:
+    if not sidecar.exists():
+        return
+    with sidecar.open("r", encoding="utf-8") as sidecar_file:
+        for line in sidecar_file:
+            if line.strip():
+                case = json.loads(line)
+                yield case.get("ordinal"), (case["id"], bool(case["is_valid"]), case["payload"])
+
+
+def iter_corpus_cases(corpus_path: str | Path) -> Iterator[Case]:
+    # Cases come back in the order they were generated: a sidecar case is sent
+    # once `ordinal` cases have gone before it. Sidecars written without
+    # ordinals are sent after the container, as before.
+    corpus_path = Path(corpus_path)
+    parsed_contract, metadata = read_corpus_header(corpus_path)
+    from_avro = from_avro_converter(parsed_contract)
+    sidecar_cases = _iter_sidecar(corpus_path.with_name(metadata.get("sidecar", sidecar_path(corpus_path).name)))
+    pending = next(sidecar_cases, None)
+    position = 0
+
+    with corpus_path.open("rb") as corpus_file:
+        # Reading through the canonical form keeps logical types as their
+        # underlying ints/longs, which is how payloads are sent as JSON.
+        blocks = block_reader(corpus_file)
+        plain_schema = parse_schema(json.loads(to_parsing_canonical_form(blocks.writer_schema)))
+        corpus_file.seek(0)
+        for block in block_reader(corpus_file, reader_schema=plain_schema):
+            for record in block:
+                while pending is not None and pending[0] is not None and pending[0] <= position:
+                    yield pending[1]
+                    position += 1
+                    pending = next(sidecar_cases, None)
+                yield record["id"], True, from_avro(record["payload"])
+                position += 1
+
+    while pending is not None:
+        yield pending[1]
+        pending = next(sidecar_cases, None)
@@ -0,0 +1,199 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import hmac
+import json
+import queue
+import socket
+import threading
+import socketserver
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Tuple
+from core.statistics import RunStatistics
+from src.pipeline import RunSettings
+from src.sharding import Shard, plan_shards, run_shard, shard_settings
+from src.size_profile import SizeProfile
+from src.constants import DEFAULT_AGENT_PORT
+
+PROTOCOL_VERSION = 1
+
+Address = Tuple[str, int]
+
+
+class AgentError(RuntimeError):
+    pass
+
+
+def parse_agent_address(address: str) -> Address:
+    host, _, port = address.rpartition(":")
+    if not host:
+        return address, DEFAULT_AGENT_PORT
+    try:
+        return host.strip("[]"), int(port)
+    except ValueError:
+        raise ValueError(f"Invalid agent address: {address!r}, expected host:port") from None
+
+
+def _send_message(stream: Any, message: Dict[str, Any]) -> None:
+    stream.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def _read_message(stream: Any) -> Dict[str, Any] | None:
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    # One job per connection: a job line in, progress lines and one result line out.
+    # Nothing in the job is used before its token matches the agent's.
+    server: "AgentServer"
+
+    def handle(self) -> None:
+        try:
+            job = _read_message(self.rfile)
+            if job is None:
+                return
+            token = job.get("token")
+            if not isinstance(token, str) or not hmac.compare_digest(token.encode("utf-8"), self.server.token.encode("utf-8")):
+                raise AgentError("Invalid agent token")
+            if job.get("type") != "job" or job.get("version") != PROTOCOL_VERSION:
+                raise AgentError(f"Unsupported job message (protocol version {job.get('version')!r})")
+
+            settings = RunSettings(**job["settings"])
+            shard = Shard(**job["shard"])
+            size_profile = SizeProfile.from_dict(job["size_profile"]) if job.get("size_profile") else None
+
+            def report(statistics: RunStatistics) -> None:
+                _send_message(self.wfile, {"type": "progress", "statistics": statistics.to_dict()})
+
+            result = run_shard(
+                job["contract"], settings, shard,
+                on_progress=report, progress_interval_s=float(job.get("progress_interval_s", 0.5)),
+                size_profile=size_profile
+            )
+            _send_message(self.wfile, {"type": "result", "statistics": result})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as err:
+            try:
+                _send_message(self.wfile, {"type": "error", "error": f"{type(err).__name__}: {err}"})
+            except OSError:
+                pass
+
+
+class AgentServer(socketserver.TCPServer):
+    allow_reuse_address = True
+
+    def __init__(self, address: Address, token: str) -> None:
+        if not token:
+            raise ValueError("An agent token is required")
+        self.token = token
+        super().__init__(address, _AgentHandler)
+
+
+def serve_agent(
+    token: str,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_AGENT_PORT,
+    on_ready: Callable[[Address], None] | None = None
+) -> None:
+    # agents run whatever job they are sent, so they only listen on loopback unless told otherwise
+    with AgentServer((host, port), token) as server:
+        if on_ready is not None:
+            on_ready(server.server_address[:2])
+        server.serve_forever()
+
+
+def _drive_agent(
+    address: Address,
+    job: Dict[str, Any],
+    events: "queue.Queue[Tuple[int, str, Any]]",
+    index: int,
+    connect_timeout_s: float
+) -> None:
+    try:
+        with socket.create_connection(address, timeout=connect_timeout_s) as connection:
+            connection.settimeout(None)
+            stream = connection.makefile("rwb")
+            _send_message(stream, job)
+            while True:
+                message = _read_message(stream)
+                if message is None:
+                    raise AgentError("Agent closed the connection before reporting a result")
+                if message["type"] == "error":
+                    raise AgentError(message["error"])
+                events.put((index, message["type"], message["statistics"]))
+                if message["type"] == "result":
+                    return
+    except Exception as err:
+        events.put((index, "error", f"{address[0]}:{address[1]}: {err}"))
+
+
+def coordinate(
+    parsed_contract: Dict[str, Any],
+    settings: RunSettings,
+    seed: int,
+    n_valid: int,
+    n_invalid: int,
+    agents: List[Address],
+    token: str,
+    on_progress: Callable[[RunStatistics], None] | None = None,
+    progress_interval_s: float = 0.5,
+    connect_timeout_s: float = 10.0,
+    size_profile: SizeProfile | None = None
+) -> RunStatistics:
+    # Agents get the same disjoint seed/id plan as local --workers shards, so a
+    # distributed run sends exactly the cases a sharded local run would.
+    shards = plan_shards(seed, n_valid, n_invalid, len(agents), open_loop=settings.duration_s is not None)
+    agent_settings = asdict(shard_settings(settings, len(agents)))
+
+    events: "queue.Queue[Tuple[int, str, Any]]" = queue.Queue()
+    threads = []
+    for index, (address, shard) in enumerate(zip(agents, shards)):
+        job = {
+            "type": "job",
+            "version": PROTOCOL_VERSION,
+            "token": token,
+            "contract": parsed_contract,
+            "settings": agent_settings,
+            "shard": asdict(shard),
+            "progress_interval_s": progress_interval_s,
+            "size_profile": size_profile.to_dict() if size_profile is not None else None,
+        }
+        thread = threading.Thread(
+            target=_drive_agent, args=(address, job, events, index, connect_timeout_s),
+            name=f"avroman-agent-{index}", daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+
+    snapshots: Dict[int, Dict[str, Any]] = {}
+    finished: Dict[int, Dict[str, Any]] = {}
+    failures: List[str] = []
+    while len(finished) + len(failures) < len(agents):
+        index, kind, payload = events.get()
+        if kind == "error":
+            failures.append(payload)
+            continue
+        snapshots[index] = payload
+        if kind == "result":
+            finished[index] = payload
+        if on_progress is not None:
+            on_progress(_merge_snapshots(snapshots.values()))
+
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise AgentError("; ".join(failures))
+    return _merge_snapshots(finished.values())
+
+
+def _merge_snapshots(snapshots: Any) -> RunStatistics:
+    statistics = RunStatistics()
+    for snapshot in snapshots:
+        statistics.merge(RunStatistics.from_dict(snapshot))
+    return statistics
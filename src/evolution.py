@@ -0,0 +1,389 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import io
+import re
+import time
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Tuple
+from fastavro import parse_schema, schemaless_reader, schemaless_writer
+from rich.table import Table
+from rich.console import Console
+from core.encoding import from_avro_converter, to_avro_converter
+from src.compile_validator import Validator, compile_validator
+from src.compile_payload import compile_payload_generator
+from src.mutation_matrix import BRANCH, FIELD, ITEM, VALUE, PathStep, format_path
+from src.named_types import PRIMITIVE_TYPES, named_schema_index
+from src.size_profile import SizeProfile
+
+MISSING_DEFAULT = "missing_default"
+TYPE_MISMATCH = "type_mismatch"
+NAME_MISMATCH = "name_mismatch"
+ENUM_SYMBOL_REMOVED = "enum_symbol_removed"
+UNION_BRANCH_REMOVED = "union_branch_removed"
+FIXED_SIZE_MISMATCH = "fixed_size_mismatch"
+BYTES_NOT_UTF8 = "bytes_not_utf8"
+
+# writer type -> reader types it resolves to (Avro spec, "Schema Resolution")
+PROMOTIONS = {
+    "int": {"long", "float", "double"},
+    "long": {"float", "double"},
+    "float": {"double"},
+    "string": {"bytes"},
+    "bytes": {"string"},
+}
+NAMED_TYPES = ("record", "error", "enum", "fixed")
+_ERROR_DETAILS = re.compile(r"0x[0-9a-f]+|\d+")
+
+
+class CompatibilityIssue(NamedTuple):
+    # path is in writer terms, the same steps as MutationMatrix targets
+    path: Tuple[PathStep, ...]
+    kind: str
+    message: str
+    symbols: FrozenSet[str] = frozenset()
+
+    @property
+    def field_path(self) -> str:
+        return format_path(self.path) or "(root)"
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind}:{self.field_path}"
+
+
+def _short_name(name: str) -> str:
+    return name.rsplit(".", 1)[-1]
+
+
+class _CompatibilityChecker:
+    # Walks a writer and a reader schema side by side and lists every place
+    # where reading writer data with the reader schema can fail. Issues under a
+    # union branch or an enum only fire for records that use that branch/symbol.
+    def __init__(self, writer: Any, reader: Any) -> None:
+        self.writer_named = named_schema_index(writer)
+        self.reader_named = named_schema_index(reader)
+        self.issues: List[CompatibilityIssue] = []
+        self._seen: set = set()
+
+    @staticmethod
+    def _resolve(contract: Any, named_schemas: Dict[str, Any]) -> Any:
+        while isinstance(contract, str) and contract not in PRIMITIVE_TYPES and contract in named_schemas:
+            contract = named_schemas[contract]
+        if isinstance(contract, dict) and isinstance(contract.get("type"), (str, list)) \
+                and contract["type"] not in ("record", "error", "array", "map", "enum", "fixed"):
+            # primitives with a logicalType resolve as their underlying type
+            return _CompatibilityChecker._resolve(contract["type"], named_schemas)
+        return contract
+
+    @staticmethod
+    def _kind(contract: Any) -> str:
+        if isinstance(contract, dict):
+            return "record" if contract.get("type") == "error" else contract.get("type")
+        return contract
+
+    def _matches(self, writer: Any, reader: Any) -> bool:
+        writer = self._resolve(writer, self.writer_named)
+        reader = self._resolve(reader, self.reader_named)
+        writer_kind, reader_kind = self._kind(writer), self._kind(reader)
+        if writer_kind in NAMED_TYPES:
+            return writer_kind == reader_kind and self._same_name(writer, reader)
+        if writer_kind in ("array", "map"):
+            return writer_kind == reader_kind
+        return writer_kind == reader_kind or reader_kind in PROMOTIONS.get(writer_kind, ())
+
+    @staticmethod
+    def _same_name(writer: Dict[str, Any], reader: Dict[str, Any]) -> bool:
+        names = {_short_name(reader.get("name", ""))} | {_short_name(alias) for alias in reader.get("aliases", [])}
+        return _short_name(writer.get("name", "")) in names
+
+    def _add(self, path: Tuple[PathStep, ...], kind: str, message: str, symbols: FrozenSet[str] = frozenset()) -> None:
+        self.issues.append(CompatibilityIssue(path, kind, message, symbols))
+
+    def check(self, writer: Any, reader: Any, path: Tuple[PathStep, ...] = ()) -> None:
+        writer = self._resolve(writer, self.writer_named)
+        reader = self._resolve(reader, self.reader_named)
+
+        if isinstance(writer, list):
+            for index, branch in enumerate(writer):
+                branch_path = path + ((BRANCH, index, branch),)
+                readers = reader if isinstance(reader, list) else [reader]
+                match = next((candidate for candidate in readers if self._matches(branch, candidate)), None)
+                if match is None:
+                    self._add(branch_path, UNION_BRANCH_REMOVED, f"writer branch {self._label(branch)} has no match in the reader")
+                else:
+                    self.check(branch, match, branch_path)
+            return
+
+        if isinstance(reader, list):
+            match = next((candidate for candidate in reader if self._matches(writer, candidate)), None)
+            if match is None:
+                self._add(path, TYPE_MISMATCH, f"writer {self._label(writer)} is not in reader union {self._label(reader)}")
+            else:
+                self.check(writer, match, path)
+            return
+
+        writer_kind, reader_kind = self._kind(writer), self._kind(reader)
+        if not self._matches(writer, reader):
+            if writer_kind == reader_kind and writer_kind in NAMED_TYPES:
+                self._add(path, NAME_MISMATCH, f"writer {writer.get('name')} does not match reader {reader.get('name')}")
+            else:
+                self._add(path, TYPE_MISMATCH, f"writer {self._label(writer)} cannot be read as {self._label(reader)}")
+            return
+
+        if writer_kind == "record":
+            pair = (writer.get("name"), reader.get("name"))
+            if pair in self._seen:
+                return
+            self._seen.add(pair)
+            writer_fields = {writer_field["name"]: writer_field for writer_field in writer.get("fields", [])}
+            for reader_field in reader.get("fields", []):
+                names = [reader_field["name"]] + list(reader_field.get("aliases", []))
+                writer_field = next((writer_fields[name] for name in names if name in writer_fields), None)
+                if writer_field is None:
+                    if "default" not in reader_field:
+                        self._add(
+                            path + ((FIELD, reader_field["name"], reader_field["type"]),), MISSING_DEFAULT,
+                            f"reader field {reader_field['name']} is not written and has no default"
+                        )
+                    continue
+                self.check(
+                    writer_field["type"], reader_field["type"], path + ((FIELD, writer_field["name"], writer_field["type"]),)
+                )
+        elif writer_kind == "enum":
+            removed = frozenset(writer["symbols"]) - frozenset(reader["symbols"])
+            if removed and "default" not in reader:
+                self._add(
+                    path, ENUM_SYMBOL_REMOVED,
+                    f"symbols {sorted(removed)} of {writer.get('name')} are not in the reader and it has no default", removed
+                )
+        elif writer_kind == "array":
+            self.check(writer["items"], reader["items"], path + ((ITEM, writer["items"]),))
+        elif writer_kind == "map":
+            self.check(writer["values"], reader["values"], path + ((VALUE, writer["values"]),))
+        elif writer_kind == "bytes" and reader_kind == "string":
+            self._add(path, BYTES_NOT_UTF8, "writer bytes are read as a string, which fails unless they are valid UTF-8")
+        elif writer_kind == "fixed" and writer.get("size") != reader.get("size"):
+            self._add(path, FIXED_SIZE_MISMATCH, f"fixed {writer.get('name')} is {writer.get('size')} bytes, reader expects {reader.get('size')}")
+
+    @staticmethod
+    def _label(contract: Any) -> str:
+        if isinstance(contract, list):
+            return "[" + ", ".join(_CompatibilityChecker._label(branch) for branch in contract) + "]"
+        if isinstance(contract, dict):
+            return contract.get("name") or str(contract.get("type"))
+        return str(contract)
+
+
+def compatibility_issues(writer: Any, reader: Any) -> List[CompatibilityIssue]:
+    checker = _CompatibilityChecker(writer, reader)
+    checker.check(writer, reader)
+    return checker.issues
+
+
+def _is_utf8(value: bytes) -> bool:
+    try:
+        value.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _error_key(err: Exception) -> str:
+    # one entry per kind of error, not per byte offset or value
+    return _ERROR_DETAILS.sub("#", f"{type(err).__name__}: {err}")
+
+
+class _IssueMatcher:
+    # Which issues a writer datum runs into, found by following each issue's
+    # path through the datum. A union branch counts as taken when the payload
+    # value validates against it.
+    def __init__(self, issues: List[CompatibilityIssue], named_schemas: Dict[str, Any]) -> None:
+        self.issues = issues
+        self.named_schemas = named_schemas
+        self._validators: Dict[int, Validator] = {}
+
+    def _branch_taken(self, value: Any, branch: Any) -> bool:
+        validator = self._validators.get(id(branch))
+        if validator is None:
+            validator = self._validators[id(branch)] = compile_validator(branch, named_schemas=self.named_schemas)
+        return validator(value) is None
+
+    def _reaches(self, value: Any, steps: Tuple[PathStep, ...], issue: CompatibilityIssue) -> bool:
+        if not steps:
+            if issue.kind == ENUM_SYMBOL_REMOVED:
+                return value in issue.symbols
+            if issue.kind == BYTES_NOT_UTF8:
+                return isinstance(value, bytes) and not _is_utf8(value)
+            return True
+        step = steps[0]
+        if step[0] == FIELD:
+            if issue.kind == MISSING_DEFAULT and len(steps) == 1:
+                return isinstance(value, dict)
+            return isinstance(value, dict) and step[1] in value and self._reaches(value[step[1]], steps[1:], issue)
+        if step[0] == ITEM:
+            return isinstance(value, list) and any(self._reaches(item, steps[1:], issue) for item in value)
+        if step[0] == VALUE:
+            return isinstance(value, dict) and any(self._reaches(item, steps[1:], issue) for item in value.values())
+        return self._branch_taken(value, step[2]) and self._reaches(value, steps[1:], issue)
+
+    def triggered(self, payload: Any) -> List[CompatibilityIssue]:
+        return [issue for issue in self.issues if self._reaches(payload, issue.path, issue)]
+
+
+def _without_logical_types(contract: Any) -> Any:
+    # schema copy that decodes to plain Avro values (ints, bytes, ...) instead of
+    # date/datetime/Decimal objects, so resolved payloads stay JSON-shaped
+    if isinstance(contract, list):
+        return [_without_logical_types(branch) for branch in contract]
+    if isinstance(contract, dict):
+        return {
+            key: _without_logical_types(value) for key, value in contract.items()
+            if key not in ("logicalType", "__fastavro_parsed", "__named_schemas")
+        }
+    return contract
+
+
+@dataclass
+class EvolutionReport:
+    issues: List[CompatibilityIssue]
+    generated: int = 0
+    decoded: int = 0
+    failed: int = 0
+    generate_s: float = 0.0
+    encode_s: float = 0.0
+    decode_s: float = 0.0
+    # issue label -> records that ran into it
+    issue_records: Dict[str, int] = field(default_factory=dict)
+    # decode errors not explained by any issue, by message
+    unattributed: Dict[str, int] = field(default_factory=dict)
+    resolved: List[Dict[str, Any]] = field(default_factory=list)
+
+    @staticmethod
+    def rate(count: int, seconds: float) -> float:
+        return count / seconds if seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "generated": self.generated,
+            "decoded": self.decoded,
+            "failed": self.failed,
+            "throughput": {
+                "generate_rps": self.rate(self.generated, self.generate_s),
+                "encode_rps": self.rate(self.generated, self.encode_s),
+                "decode_rps": self.rate(self.generated, self.decode_s),
+            },
+            "issues": [
+                {
+                    "kind": issue.kind,
+                    "field_path": issue.field_path,
+                    "message": issue.message,
+                    "records": self.issue_records.get(issue.label, 0),
+                }
+                for issue in self.issues
+            ],
+            "unattributed": dict(self.unattributed),
+        }
+
+
+def fuzz_evolution(
+    writer: Dict[str, Any],
+    reader: Dict[str, Any],
+    n_records: int,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    size_profile: SizeProfile | None = None,
+    keep_resolved: int = 0
+) -> EvolutionReport:
+    # Generates writer payloads, encodes each batch into one buffer and decodes
+    # it record by record with reader-schema resolution. A failing record is
+    # skipped by its offset and charged to the issues its datum runs into.
+    report = EvolutionReport(compatibility_issues(writer, reader))
+    matcher = _IssueMatcher(report.issues, named_schema_index(writer))
+    payload_generator = compile_payload_generator(writer, size_profile)
+    validator = compile_validator(writer)
+    to_avro = to_avro_converter(writer)
+    from_avro = from_avro_converter(reader)
+    plain_writer = parse_schema(_without_logical_types(writer))
+    plain_reader = parse_schema(_without_logical_types(reader))
+    rng = random.Random(seed)
+
+    for batch_start in range(0, n_records, batch_size):
+        count = min(batch_size, n_records - batch_start)
+
+        start_time = time.perf_counter()
+        # validated as Avro data: bytes fields are raw bytes here, base64 text in payloads
+        data = [datum for datum in (to_avro(payload_generator(rng)) for _ in range(count)) if validator(datum) is None]
+        generated_at = time.perf_counter()
+
+        buffer = io.BytesIO()
+        offsets: List[int] = []
+        for datum in data:
+            offsets.append(buffer.tell())
+            schemaless_writer(buffer, writer, datum)
+        offsets.append(buffer.tell())
+        encoded_at = time.perf_counter()
+
+        failures: List[Tuple[int, str]] = []
+        buffer.seek(0)
+        for index in range(len(data)):
+            try:
+                resolved = schemaless_reader(buffer, plain_writer, plain_reader)
+            except Exception as err:
+                failures.append((index, _error_key(err)))
+                buffer.seek(offsets[index + 1])
+                continue
+            report.decoded += 1
+            if len(report.resolved) < keep_resolved:
+                report.resolved.append(from_avro(resolved))
+        decoded_at = time.perf_counter()
+
+        report.generated += len(data)
+        report.generate_s += generated_at - start_time
+        report.encode_s += encoded_at - generated_at
+        report.decode_s += decoded_at - encoded_at
+
+        for index, message in failures:
+            report.failed += 1
+            triggered = matcher.triggered(data[index])
+            for issue in triggered:
+                report.issue_records[issue.label] = report.issue_records.get(issue.label, 0) + 1
+            if not triggered:
+                report.unattributed[message] = report.unattributed.get(message, 0) + 1
+
+    return report
+
+
+def render_evolution(report: EvolutionReport, max_errors: int = 20) -> None:
+    console = Console(width=140)
+    table = Table(title=f"Compatibility issues ({len(report.issues)})", expand=True)
+    table.add_column("kind", no_wrap=True)
+    table.add_column("field path", overflow="fold")
+    table.add_column("records", justify="right", no_wrap=True)
+    table.add_column("detail", overflow="fold", ratio=1)
+    for issue in report.issues:
+        table.add_row(issue.kind, issue.field_path, str(report.issue_records.get(issue.label, 0)), issue.message)
+    console.print(table)
+
+    if report.unattributed:
+        unattributed = Table(title="Decode failures not explained by a schema issue", expand=True)
+        unattributed.add_column("count", justify="right", width=10, no_wrap=True)
+        unattributed.add_column("error", overflow="fold", ratio=1)
+        ranked = sorted(report.unattributed.items(), key=lambda entry: entry[1], reverse=True)
+        for message, count in ranked[:max_errors]:
+            unattributed.add_row(str(count), message)
+        console.print(unattributed)
+        if len(ranked) > max_errors:
+            console.print(f"... and {len(ranked) - max_errors} more distinct errors")
+
+    console.print(
+        f"Records: {report.generated}  Resolved: {report.decoded}  Failed: {report.failed} "
+        f"({100.0 * report.failed / report.generated if report.generated else 0.0:.1f}%)"
+    )
+    console.print(
+        f"Throughput: generate {report.rate(report.generated, report.generate_s):,.0f}/s  "
+        f"encode {report.rate(report.generated, report.encode_s):,.0f}/s  "
+        f"decode {report.rate(report.generated, report.decode_s):,.0f}/s"
+    )
@@ -0,0 +1,206 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import uuid
+import base64
+import random
+import struct
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+from src.compile_validator import LONG_MAX_VALUE, LONG_MIN_VALUE
+
+LogicalGenerator = Callable[[random.Random], Any]
+
+# share of values drawn from a type's boundary table instead of its random range
+BOUNDARY_PROBABILITY = 0.2
+
+UINT_MAX_VALUE = (1 << 32) - 1
+
+EPOCH_DATE = date(1970, 1, 1)
+EPOCH_DATETIME = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MILLIS_PER_DAY = 86_400_000
+MICROS_PER_DAY = MILLIS_PER_DAY * 1000
+
+
+class LogicalRange(NamedTuple):
+    # an integer-backed logical type: uniform draws from [low, high] plus boundary values
+    low: int
+    high: int
+    boundaries: Tuple[int, ...]
+
+
+def _days(value: date) -> int:
+    return (value - EPOCH_DATE).days
+
+
+def _micros(value: datetime) -> int:
+    return (value.replace(tzinfo=timezone.utc) - EPOCH_DATETIME) // timedelta(microseconds=1)
+
+
+_BOUNDARY_DATES = (
+    date.min, date.max, EPOCH_DATE, date(1969, 12, 31), date(1970, 1, 2),
+    # leap days, and the century years that are not leap years
+    date(1904, 2, 29), date(2000, 2, 29), date(2024, 2, 29), date(2400, 2, 29),
+    date(1900, 2, 28), date(1900, 3, 1), date(2100, 2, 28), date(2100, 3, 1),
+    date(1999, 12, 31), date(2000, 1, 1),
+    # where 32-bit epoch seconds run out
+    date(1901, 12, 13), date(2038, 1, 19),
+)
+_BOUNDARY_DATETIMES = (
+    datetime.min, datetime.max, datetime(1970, 1, 1), datetime(1969, 12, 31, 23, 59, 59, 999_999),
+    datetime(1970, 1, 1, 0, 0, 0, 1000), datetime(1999, 12, 31, 23, 59, 59, 999_000), datetime(2000, 1, 1),
+    datetime(2000, 2, 29, 23, 59, 59, 999_000), datetime(2100, 3, 1), datetime(2016, 12, 31, 23, 59, 59, 999_000),
+    datetime(1901, 12, 13, 20, 45, 52), datetime(2038, 1, 19, 3, 14, 7), datetime(2038, 1, 19, 3, 14, 8),
+)
+# random timestamps fall in 1900-2100, away from the boundaries above
+_RANDOM_FROM, _RANDOM_TO = datetime(1900, 1, 1), datetime(2100, 1, 1)
+
+_DATE = LogicalRange(
+    _days(_RANDOM_FROM.date()), _days(_RANDOM_TO.date()), tuple(sorted({_days(value) for value in _BOUNDARY_DATES}))
+)
+_TIMESTAMP_MICROS = LogicalRange(
+    _micros(_RANDOM_FROM), _micros(_RANDOM_TO), tuple(sorted({_micros(value) for value in _BOUNDARY_DATETIMES}))
+)
+_TIMESTAMP_MILLIS = LogicalRange(
+    _TIMESTAMP_MICROS.low // 1000, _TIMESTAMP_MICROS.high // 1000,
+    tuple(sorted({micros // 1000 for micros in _TIMESTAMP_MICROS.boundaries}))
+)
+# nanoseconds since the epoch only span 1677-2262 in a long, so the long limits are boundaries too
+_TIMESTAMP_NANOS = LogicalRange(
+    _TIMESTAMP_MICROS.low * 1000, _TIMESTAMP_MICROS.high * 1000,
+    tuple(sorted({LONG_MIN_VALUE, LONG_MAX_VALUE} | {
+        micros * 1000 for micros in _TIMESTAMP_MICROS.boundaries if LONG_MIN_VALUE <= micros * 1000 <= LONG_MAX_VALUE
+    }))
+)
+_TIME_MILLIS = LogicalRange(0, MILLIS_PER_DAY - 1, (0, 1, MILLIS_PER_DAY // 2, MILLIS_PER_DAY - 1000, MILLIS_PER_DAY - 1))
+_TIME_MICROS = LogicalRange(0, MICROS_PER_DAY - 1, (0, 1, MICROS_PER_DAY // 2, MICROS_PER_DAY - 1000, MICROS_PER_DAY - 1))
+
+# (Avro type, logicalType) -> range of its integer values
+LOGICAL_RANGES: Dict[Tuple[str, str], LogicalRange] = {
+    ("int", "date"): _DATE,
+    ("int", "time-millis"): _TIME_MILLIS,
+    ("long", "time-micros"): _TIME_MICROS,
+    ("long", "timestamp-millis"): _TIMESTAMP_MILLIS,
+    ("long", "timestamp-micros"): _TIMESTAMP_MICROS,
+    ("long", "timestamp-nanos"): _TIMESTAMP_NANOS,
+    ("long", "local-timestamp-millis"): _TIMESTAMP_MILLIS,
+    ("long", "local-timestamp-micros"): _TIMESTAMP_MICROS,
+    ("long", "local-timestamp-nanos"): _TIMESTAMP_NANOS,
+}
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _range_generator(logical_range: LogicalRange) -> LogicalGenerator:
+    low, high, boundaries = logical_range
+
+    def generate_logical_range(rng: random.Random) -> int:
+        if rng.random() < BOUNDARY_PROBABILITY:
+            return rng.choice(boundaries)
+        return rng.randint(low, high)
+
+    return generate_logical_range
+
+
+def _table_generator(boundaries: Tuple[Any, ...], draw: LogicalGenerator) -> LogicalGenerator:
+    def generate_logical_value(rng: random.Random) -> Any:
+        if rng.random() < BOUNDARY_PROBABILITY:
+            return rng.choice(boundaries)
+        return draw(rng)
+
+    return generate_logical_value
+
+
+def _uuid_string(contract: Dict[str, Any]) -> LogicalGenerator:
+    def draw(rng: random.Random) -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    return _table_generator((str(uuid.UUID(int=0)), str(uuid.UUID(int=(1 << 128) - 1))), draw)
+
+
+def _uuid_fixed(contract: Dict[str, Any]) -> LogicalGenerator | None:
+    if contract.get("size") != 16:
+        return None
+
+    def draw(rng: random.Random) -> str:
+        return _b64(uuid.UUID(int=rng.getrandbits(128), version=4).bytes)
+
+    return _table_generator((_b64(bytes(16)), _b64(b"\xff" * 16)), draw)
+
+
+@lru_cache(maxsize=256)
+def decimal_boundaries(precision: int, scale: int, size: int | None = None) -> Tuple[int, ...]:
+    # unscaled values at the edges of `precision` digits (and of a fixed's byte width)
+    largest = 10 ** precision - 1
+    if size is not None:
+        largest = min(largest, (1 << (8 * size - 1)) - 1)
+    magnitudes = {0, 1, largest, 10 ** (precision - 1), 10 ** min(scale, precision - 1)}
+    return tuple(sorted(value for magnitude in magnitudes if magnitude <= largest for value in (magnitude, -magnitude)))
+
+
+def _decimal(contract: Dict[str, Any]) -> LogicalGenerator | None:
+    # two's-complement big-endian unscaled value, base64 like any other bytes/fixed payload value
+    precision, scale = contract.get("precision"), contract.get("scale", 0)
+    if not isinstance(precision, int) or precision < 1 or not isinstance(scale, int) or not 0 <= scale <= precision:
+        return None
+    size = int(contract["size"]) if contract.get("type") == "fixed" else None
+    boundaries = decimal_boundaries(precision, scale, size)
+    largest = boundaries[-1]
+
+    def encode(unscaled: int) -> str:
+        length = size if size is not None else max(1, (unscaled.bit_length() + 8) // 8)
+        return _b64(unscaled.to_bytes(length, "big", signed=True))
+
+    encoded_boundaries = tuple(encode(unscaled) for unscaled in boundaries)
+
+    def draw(rng: random.Random) -> str:
+        return encode(rng.randint(-largest, largest))
+
+    return _table_generator(encoded_boundaries, draw)
+
+
+_DURATION_BOUNDARIES = tuple(
+    _b64(struct.pack("<III", *parts)) for parts in (
+        (0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, MILLIS_PER_DAY - 1), (12, 0, 0),
+        (UINT_MAX_VALUE, 0, 0), (0, UINT_MAX_VALUE, 0), (0, 0, UINT_MAX_VALUE),
+        (UINT_MAX_VALUE, UINT_MAX_VALUE, UINT_MAX_VALUE),
+    )
+)
+
+
+def _duration(contract: Dict[str, Any]) -> LogicalGenerator | None:
+    # fixed(12): little-endian unsigned months, days and milliseconds
+    if contract.get("size") != 12:
+        return None
+
+    def draw(rng: random.Random) -> str:
+        return _b64(struct.pack("<III", rng.randint(0, 1200), rng.randint(0, 30), rng.randint(0, MILLIS_PER_DAY - 1)))
+
+    return _table_generator(_DURATION_BOUNDARIES, draw)
+
+
+LOGICAL_GENERATORS: Dict[Tuple[str, str], Callable[[Dict[str, Any]], LogicalGenerator | None]] = {
+    **{key: (lambda contract, logical_range=logical_range: _range_generator(logical_range)) for key, logical_range in LOGICAL_RANGES.items()},
+    ("string", "uuid"): _uuid_string,
+    ("fixed", "uuid"): _uuid_fixed,
+    ("bytes", "decimal"): _decimal,
+    ("fixed", "decimal"): _decimal,
+    ("fixed", "duration"): _duration,
+}
+
+
+def logical_key(contract: Any) -> Tuple[str, str] | None:
+    if not isinstance(contract, dict) or not isinstance(contract.get("type"), str) or "logicalType" not in contract:
+        return None
+    return contract["type"], contract["logicalType"]
+
+
+def logical_type_generator(contract: Any) -> LogicalGenerator | None:
+    # None for plain types and for logical types this Avro type cannot carry
+    # (or with invalid attributes); per the spec those are generated as the plain type
+    factory = LOGICAL_GENERATORS.get(logical_key(contract))
+    return factory(contract) if factory is not None else None
@@ -0,0 +1,232 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Tuple
+
+from src.compile_payload import PayloadGenerator, compile_payload_generator
+from src.compile_validator import INT_MAX_VALUE, INT_MIN_VALUE, LONG_MAX_VALUE, LONG_MIN_VALUE
+from src.compile_validator import Validator, compile_validator
+from src.named_types import PRIMITIVE_TYPES, named_schema_index
+from src.payload_generation_utils import _generate_wrong_data_type, _is_branch_empty, _is_union_nullable
+from src.size_profile import SizeProfile
+from src.constants import INVALID_MODES, MUTATION_MATRIX, RANDOM_MUTATIONS
+
+DROP_REQUIRED_FIELD = "drop_required_field"
+NULL_REQUIRED = "null_required"
+INVALID_TYPE = "invalid_type"
+INVALID_ENUM = "invalid_enum"
+OUT_OF_RANGE = "out_of_range"
+MUTATION_KINDS = (DROP_REQUIRED_FIELD, NULL_REQUIRED, INVALID_TYPE, INVALID_ENUM, OUT_OF_RANGE)
+
+FIELD = "field"
+ITEM = "item"
+VALUE = "value"
+BRANCH = "branch"
+
+# (FIELD, field name, field contract), (ITEM, items contract), (VALUE, values contract)
+# or (BRANCH, union index, branch contract)
+PathStep = Tuple[Any, ...]
+
+
+class MutationTarget(NamedTuple):
+    path: Tuple[PathStep, ...]
+    kind: str
+    contract: Any
+
+    @property
+    def field_path(self) -> str:
+        return format_path(self.path)
+
+    @property
+    def label(self) -> str:
+        return f"{self.kind}:{self.field_path}"
+
+
+def format_path(path: Iterable[PathStep]) -> str:
+    # address.city, tags[], attributes{}, contact|1.phone
+    text = ""
+    for step in path:
+        if step[0] == FIELD:
+            text += f".{step[1]}" if text else step[1]
+        elif step[0] == ITEM:
+            text += "[]"
+        elif step[0] == VALUE:
+            text += "{}"
+        else:
+            text += f"|{step[1]}"
+    return text
+
+
+class MutationMatrix:
+    # Every (field path, mutation kind) pair of a contract, each listed once.
+    # Named types are walked at their first occurrence on a path only, so
+    # recursive schemas give a finite matrix. Cases mutate a valid base payload
+    # by copying just the containers along the target path.
+    def __init__(
+        self,
+        parsed_contract: Dict[str, Any],
+        size_profile: SizeProfile | None = None
+    ) -> None:
+        self.parsed_contract = parsed_contract
+        # fills for sub-contracts use the fitted ranges, not a fresh --target-size fit
+        self.size_profile = replace(size_profile, target_bytes=None) if size_profile is not None else None
+        self.named_schemas = named_schema_index(parsed_contract)
+        self.targets: List[MutationTarget] = []
+        self._generators: Dict[int, PayloadGenerator] = {}
+        self._validators: Dict[int, Validator] = {}
+        self._walk_named(parsed_contract, (), frozenset())
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __iter__(self) -> Iterator[MutationTarget]:
+        return iter(self.targets)
+
+    def _resolve(self, contract: Any) -> Any:
+        while isinstance(contract, str) and contract not in PRIMITIVE_TYPES and contract in self.named_schemas:
+            contract = self.named_schemas[contract]
+        if isinstance(contract, dict) and isinstance(contract.get("type"), (str, list)) \
+                and contract["type"] not in ("record", "error", "array", "map", "enum", "fixed") \
+                and "logicalType" not in contract:
+            return self._resolve(contract["type"])
+        return contract
+
+    def _single_branch(self, contract: Any) -> Any:
+        # the one non-null branch of a nullable union, or the contract itself
+        if not isinstance(contract, list):
+            return self._resolve(contract)
+        branches = [branch for branch in contract if not _is_branch_empty(branch)]
+        return self._resolve(branches[0]) if len(branches) == 1 else None
+
+    def _walk(self, contract: Any, path: Tuple[PathStep, ...], expanding: FrozenSet[str]) -> None:
+        if isinstance(contract, list):
+            for index, branch in enumerate(contract):
+                if not _is_branch_empty(branch):
+                    self._walk_named(branch, path + ((BRANCH, index, branch),), expanding)
+            return
+
+        if not isinstance(contract, dict):
+            return
+
+        data_type = contract.get("type")
+        if data_type in ("record", "error"):
+            for field in contract.get("fields", []):
+                field_path = path + ((FIELD, field["name"], field["type"]),)
+                if "default" not in field and not _is_union_nullable(field["type"]) and field["type"] != "null":
+                    self.targets.append(MutationTarget(field_path, DROP_REQUIRED_FIELD, field["type"]))
+                self._add_value_targets(field["type"], field_path, expanding)
+        elif data_type == "array":
+            self._add_value_targets(contract["items"], path + ((ITEM, contract["items"]),), expanding)
+        elif data_type == "map":
+            self._add_value_targets(contract["values"], path + ((VALUE, contract["values"]),), expanding)
+
+    def _walk_named(self, contract: Any, path: Tuple[PathStep, ...], expanding: FrozenSet[str]) -> None:
+        if isinstance(contract, str) and contract in self.named_schemas:
+            if contract in expanding:
+                return
+            expanding = expanding | {contract}
+        resolved = self._resolve(contract)
+        if isinstance(resolved, dict) and resolved.get("type") in ("record", "error"):
+            expanding = expanding | {resolved.get("name", "")}
+        self._walk(resolved, path, expanding)
+
+    def _add_value_targets(self, contract: Any, path: Tuple[PathStep, ...], expanding: FrozenSet[str]) -> None:
+        if not _is_union_nullable(contract) and contract != "null":
+            self.targets.append(MutationTarget(path, NULL_REQUIRED, contract))
+        self.targets.append(MutationTarget(path, INVALID_TYPE, self._resolve(contract)))
+
+        single = self._single_branch(contract)
+        if isinstance(single, dict) and single.get("type") == "enum":
+            self.targets.append(MutationTarget(path, INVALID_ENUM, single))
+        if single in ("int", "long"):
+            self.targets.append(MutationTarget(path, OUT_OF_RANGE, single))
+
+        if isinstance(contract, list):
+            self._walk(contract, path, expanding)
+        else:
+            self._walk_named(contract, path, expanding)
+
+    def _generator(self, contract: Any) -> PayloadGenerator:
+        generator = self._generators.get(id(contract))
+        if generator is None:
+            generator = self._generators[id(contract)] = compile_payload_generator(
+                contract, self.size_profile, named_schemas=self.named_schemas
+            )
+        return generator
+
+    def _validator(self, contract: Any) -> Validator:
+        validator = self._validators.get(id(contract))
+        if validator is None:
+            validator = self._validators[id(contract)] = compile_validator(contract, named_schemas=self.named_schemas)
+        return validator
+
+    def _mutated_value(self, target: MutationTarget, rng: random.Random) -> Any:
+        if target.kind == NULL_REQUIRED:
+            return None
+        if target.kind == INVALID_ENUM:
+            return "INVALID_SYMBOLS"
+        if target.kind == OUT_OF_RANGE:
+            if target.contract == "int":
+                return rng.choice((INT_MIN_VALUE - 1, INT_MAX_VALUE + 1))
+            return rng.choice((LONG_MIN_VALUE - 1, LONG_MAX_VALUE + 1))
+        return _generate_wrong_data_type(target.contract, rng)
+
+    def _mutate(self, value: Any, steps: Tuple[PathStep, ...], target: MutationTarget, rng: random.Random) -> Any:
+        step = steps[0]
+        last = len(steps) == 1
+
+        if step[0] == BRANCH:
+            branch = step[2]
+            if self._validator(branch)(value) is not None:
+                value = self._generator(branch)(rng)
+            return self._mutate(value, steps[1:], target, rng) if not last else value
+
+        if step[0] == FIELD:
+            record = dict(value) if isinstance(value, dict) else {}
+            name = step[1]
+            if last:
+                if target.kind == DROP_REQUIRED_FIELD:
+                    record.pop(name, None)
+                else:
+                    record[name] = self._mutated_value(target, rng)
+                return record
+            child = record[name] if name in record else self._generator(step[2])(rng)
+            record[name] = self._mutate(child, steps[1:], target, rng)
+            return record
+
+        if step[0] == ITEM:
+            items = list(value) if isinstance(value, list) and value else [self._generator(step[1])(rng)]
+            index = rng.randrange(len(items))
+            items[index] = self._mutated_value(target, rng) if last else self._mutate(items[index], steps[1:], target, rng)
+            return items
+
+        entries = dict(value) if isinstance(value, dict) and value else {"key": self._generator(step[1])(rng)}
+        key = rng.choice(list(entries))
+        entries[key] = self._mutated_value(target, rng) if last else self._mutate(entries[key], steps[1:], target, rng)
+        return entries
+
+    def mutate(self, index: int, base_payload: Dict[str, Any], rng: random.Random) -> Tuple[Dict[str, Any], str]:
+        # Case `index` takes target index % len(self); base_payload is not modified.
+        target = self.targets[index % len(self.targets)]
+        return self._mutate(base_payload, target.path, target, rng), target.label
+
+    def describe(self) -> Dict[str, int]:
+        counts = {kind: 0 for kind in MUTATION_KINDS}
+        for target in self.targets:
+            counts[target.kind] += 1
+        return counts
+
+    def field_paths(self) -> int:
+        return len({target.field_path for target in self.targets})
+
+
+def mutation_coverage(
+    matrix: MutationMatrix,
+    labels: Iterable[str]
+) -> Tuple[int, int]:
+    # (covered pairs, total pairs)
+    known = {target.label for target in matrix.targets}
+    return len(known.intersection(labels)), len(known)
@@ -0,0 +1,81 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Iterator, Set
+
+PRIMITIVE_TYPES = frozenset(("null", "boolean", "int", "long", "float", "double", "bytes", "string"))
+
+
+def named_schema_index(parsed_contract: Any) -> Dict[str, Any]:
+    return parsed_contract.get("__named_schemas", {}) if isinstance(parsed_contract, dict) else {}
+
+
+def _referenced_names(contract: Any) -> Iterator[str]:
+    if isinstance(contract, list):
+        for branch in contract:
+            yield from _referenced_names(branch)
+    elif isinstance(contract, str):
+        if contract not in PRIMITIVE_TYPES:
+            yield contract
+    elif isinstance(contract, dict):
+        data_type = contract.get("type")
+        if data_type in ("record", "error"):
+            for field in contract.get("fields", []):
+                yield from _referenced_names(field["type"])
+        elif data_type == "array":
+            yield from _referenced_names(contract["items"])
+        elif data_type == "map":
+            yield from _referenced_names(contract["values"])
+        elif isinstance(data_type, (str, list)) and data_type not in ("enum", "fixed"):
+            yield from _referenced_names(data_type)
+
+
+def recursive_names(named_schemas: Dict[str, Any]) -> FrozenSet[str]:
+    references = {name: set(_referenced_names(contract)) for name, contract in named_schemas.items()}
+
+    def reaches(start: str, target: str) -> bool:
+        seen: Set[str] = set()
+        pending = list(references.get(start, ()))
+        while pending:
+            name = pending.pop()
+            if name == target:
+                return True
+            if name not in seen:
+                seen.add(name)
+                pending.extend(references.get(name, ()))
+        return False
+
+    return frozenset(name for name in named_schemas if reaches(name, name))
+
+
+def can_terminate(
+    contract: Any,
+    named_schemas: Dict[str, Any],
+    expanding: FrozenSet[str] = frozenset()
+) -> bool:
+    # Whether a finite value exists without expanding any name in `expanding`
+    # again; empty arrays/maps, null branches and field defaults all end a branch.
+    if isinstance(contract, list):
+        return any(can_terminate(branch, named_schemas, expanding) for branch in contract)
+
+    if isinstance(contract, str):
+        if contract in PRIMITIVE_TYPES or contract not in named_schemas:
+            return True
+        if contract in expanding:
+            return False
+        return can_terminate(named_schemas[contract], named_schemas, expanding | {contract})
+
+    if not isinstance(contract, dict):
+        return True
+
+    data_type = contract.get("type")
+    if data_type in ("record", "error"):
+        expanding = expanding | {contract.get("name", "")}
+        return all(
+            "default" in field or can_terminate(field["type"], named_schemas, expanding)
+            for field in contract.get("fields", [])
+        )
+    if isinstance(data_type, (str, list)) and data_type not in ("array", "map", "enum", "fixed"):
+        return can_terminate(data_type, named_schemas, expanding)
+    return True
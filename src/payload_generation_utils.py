@@ -7,51 +7,83 @@ import string
 from typing import Any
 from datetime import date, datetime, timezone
 
+ALPHANUMERIC_CHARACTERS = string.ascii_letters + string.digits
+EMAIL_CHARACTERS = string.ascii_lowercase + string.digits
+EMAIL_PROVIDERS = (
+    "gmail.com",
+    "yahoo.com",
+    "outlook.com",
+    "icloud.com",
+    "proton.me",
+    "hotmail.com"
+)
+# Above this length strings and bytes are drawn in one getrandbits() call
+# instead of one draw per character, which keeps MB-sized values cheap.
+BULK_LENGTH_THRESHOLD = 256
+# Bytes 0-247 map onto four copies of the 62 characters and 248-255 are
+# rejected, so every character is equally likely.
+_ALPHANUMERIC_TABLE = (ALPHANUMERIC_CHARACTERS * 4).encode("ascii") + bytes(8)
+_REJECTED_BYTES = bytes(range(4 * len(ALPHANUMERIC_CHARACTERS), 256))
+
+
+def _random_raw_bytes(
+    rng: random.Random,
+    length: int
+) -> bytes:
+    if length > BULK_LENGTH_THRESHOLD:
+        return rng.getrandbits(8 * length).to_bytes(length, "little")
+    return bytes(
+        rng.getrandbits(8) for _ in range(length)
+    )
+
+
 def _rand_bytes_to_b64(
     rng: random.Random,
     rand_min: int = 0,
     rand_max: int = 16
 ) -> str:
-    raw_data = bytes(
-        rng.getrandbits(8) for _ in range(rng.randint(rand_min, rand_max))
-    )
+    raw_data = _random_raw_bytes(rng, rng.randint(rand_min, rand_max))
     return base64.b64encode(raw_data).decode("ascii")
 
 def _rand_fixed_bytes_to_b64(
     rng: random.Random,
     length: int
 ) -> str:
-    raw_data = bytes(
-        rng.getrandbits(8) for _ in range(length)
-    )
+    raw_data = _random_raw_bytes(rng, length)
     return base64.b64encode(raw_data).decode("ascii")
 
+def _random_alphanumeric(
+    rng: random.Random,
+    length: int
+) -> str:
+    text = b""
+    while len(text) < length:
+        # 1 in 32 bytes is rejected; drawing a few extra usually avoids a second round
+        missing = length - len(text)
+        draw = missing + missing // 16 + 8
+        text += rng.getrandbits(8 * draw).to_bytes(draw, "little").translate(_ALPHANUMERIC_TABLE, _REJECTED_BYTES)
+    return text[:length].decode("ascii")
+
+
 def _generate_random_string(
     rng: random.Random,
     minimum_length: int = 4,
     maximum_length: int = 20
 ) -> str:
     randnum = rng.randint(minimum_length, maximum_length)
-    alphanum = string.ascii_letters + string.digits
-    return "".join(rng.choice(alphanum) for _ in range(randnum))
+    if randnum > BULK_LENGTH_THRESHOLD:
+        return _random_alphanumeric(rng, randnum)
+    choice = rng.choice
+    return "".join([choice(ALPHANUMERIC_CHARACTERS) for _ in range(randnum)])
 
 def _rand_email_gen(
     rng: random.Random
 ) -> str:
     email_length = rng.randint(3, 12)
-    email_characters = string.ascii_lowercase + string.digits
-    email = "".join(rng.choice(email_characters) for _ in range(email_length))
+    choice = rng.choice
+    email = "".join([choice(EMAIL_CHARACTERS) for _ in range(email_length)])
 
-    email_providers = [
-        "gmail.com",
-        "yahoo.com",
-        "outlook.com",
-        "icloud.com",
-        "proton.me",
-        "hotmail.com"
-    ]
-
-    return f"{email}@{rng.choice(email_providers)}"
+    return f"{email}@{rng.choice(EMAIL_PROVIDERS)}"
 
 def _is_branch_empty(branch: Any) -> bool:
     return branch == "null" or \
@@ -75,11 +107,17 @@ def _is_email_field_valid(field_name: str) -> bool:
     return field_name == "email" or field_name.endswith("_email") or field_name.endswith("email")
 
 
+def _probabilistic_choice(
+    rng: random.Random,
+    probability: float = 0.3
+) -> bool:
+    return rng.random() < probability
+
+
 def _choose_union_branching(
     branches: list[Any],
     rng: random.Random
 ) -> Any:
-    from src.utils import _probabilistic_choice
     empty_branches = [branch for branch in branches if _is_branch_empty(branch)]
     non_empty_branches = [branch for branch in branches if branch not in empty_branches]
 
@@ -0,0 +1,338 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import time
+import random
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Tuple
+from core.engine import dispatch, dispatch_open_loop
+from core.encoding import JSON, PayloadEncoder, is_identity, to_avro_converter
+from core.runner import Record, parse_runner_response
+from core.phases import FAILED_RECORDS, GENERATE, MUTATE, VALIDATE, VALIDATION_RETRIES, PhaseTimer
+from src.utils import is_record_valid
+from src.compile_validator import Validator, compile_validator
+from src.compile_payload import PayloadGenerator, compile_payload_generator
+from src.size_profile import SizeProfile
+from src.mutation_matrix import MUTATION_MATRIX, RANDOM_MUTATIONS, MutationMatrix
+from src.generate_payload import generate_valid_payload, generate_invalid_case
+
+if TYPE_CHECKING:
+    from core.http_runner import HttpRunner
+
+Case = Tuple[str, bool, Dict[str, Any]]
+LabelledCase = Tuple[str, bool, Dict[str, Any], str | None]
+SendOutcome = Tuple[int | None, float, float, str | None, str | None]
+
+
+@dataclass
+class RunSettings:
+    url: str
+    method: str = "POST"
+    headers: Dict[str, str] | None = None
+    timeout_s: float = 10.0
+    concurrency: int = 1
+    pool_size: int | None = None
+    max_in_flight: int | None = None
+    encoding: str = JSON
+    schema_id: int = 1
+    expect_2xx_for_valid: bool = True
+    rps: float | None = None
+    duration_s: float | None = None
+    invalid_mode: str = RANDOM_MUTATIONS
+    # with a registry the schema id is looked up (or registered) there instead of using schema_id
+    registry_url: str | None = None
+    subject: str | None = None
+
+
+def resolve_schema_id(
+    parsed_contract: Dict[str, Any],
+    settings: RunSettings,
+    phases: PhaseTimer | None = None
+) -> RunSettings:
+    # Settings with the registry's schema id in place of registry_url. Called
+    # once before a run is split up, so workers and agents never query the registry.
+    if settings.registry_url is None:
+        return settings
+    from core.registry import default_subject, registry_client
+    schema_id = registry_client(settings.registry_url).schema_id(
+        settings.subject or default_subject(parsed_contract), parsed_contract, phases
+    )
+    return replace(settings, schema_id=schema_id, registry_url=None)
+
+
+def build_runner(
+    parsed_contract: Dict[str, Any],
+    settings: RunSettings,
+    phases: PhaseTimer | None = None
+) -> HttpRunner:
+    # requests/urllib3 are loaded by the first runner, not by every command that imports the pipeline
+    from core.http_runner import HttpRunner
+    settings = resolve_schema_id(parsed_contract, settings, phases)
+    encoder = None
+    if settings.encoding != JSON:
+        encoder = PayloadEncoder(
+            parsed_contract, settings.encoding, schema_id=settings.schema_id, validator=compile_validator(parsed_contract)
+        )
+    return HttpRunner(
+        settings.url,
+        settings.method,
+        headers=settings.headers,
+        timeout=settings.timeout_s,
+        pool_size=settings.pool_size or settings.concurrency,
+        encoder=encoder,
+        phases=phases
+    )
+
+
+def payload_validator(parsed_contract: Dict[str, Any], validator: Validator) -> Validator:
+    # payloads carry bytes/fixed as base64 text, the validator checks the Avro values they encode to
+    to_avro = to_avro_converter(parsed_contract)
+    if is_identity(to_avro):
+        return validator
+
+    def validate_payload(payload: Any) -> Any:
+        return validator(to_avro(payload))
+
+    return validate_payload
+
+
+def validate_record_type(payload: Any) -> Dict[str, Any] | None:
+    return payload if isinstance(payload, dict) else None
+
+
+def generate_valid_record(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    attempts_to_make: int = 5,
+    payload_generator: PayloadGenerator | None = None,
+    validator: Validator | None = None,
+    phases: PhaseTimer | None = None
+) -> Dict[str, Any]:
+    for attempt in range(max(1, attempts_to_make)):
+        if attempt and phases is not None:
+            phases.count(VALIDATION_RETRIES)
+        start_time = time.perf_counter()
+        if payload_generator is not None:
+            payload = validate_record_type(payload_generator(rng))
+        else:
+            payload = validate_record_type(
+                generate_valid_payload(parsed_contract, rng)
+            )
+        generated_at = time.perf_counter()
+        if phases is not None:
+            phases.add(GENERATE, generated_at - start_time)
+        if payload is None:
+            continue
+        if validator is not None:
+            is_valid = validator(payload) is None
+        else:
+            is_valid = is_record_valid(parsed_contract, payload)
+        if phases is not None:
+            phases.add(VALIDATE, time.perf_counter() - generated_at)
+        if is_valid:
+            return payload
+
+    if phases is not None:
+        phases.count(FAILED_RECORDS)
+    return {
+        "_failed": True
+    }
+
+
+def generate_invalid_record(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    payload_generator: PayloadGenerator | None = None
+) -> Dict[str, Any]:
+    return generate_invalid_labelled_record(parsed_contract, rng, payload_generator)[0]
+
+
+def generate_invalid_labelled_record(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    payload_generator: PayloadGenerator | None = None
+) -> Tuple[Dict[str, Any], str | None]:
+    payload, mutation = generate_invalid_case(parsed_contract, rng, payload_generator)
+    if isinstance(payload, dict):
+        return payload, mutation
+
+    return {
+        "_is_invalid": True
+    }, None
+
+
+def generate_matrix_labelled_record(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    matrix: MutationMatrix,
+    index: int,
+    payload_generator: PayloadGenerator | None = None,
+    validator: Validator | None = None,
+    phases: PhaseTimer | None = None
+) -> Tuple[Dict[str, Any], str | None]:
+    base_payload = generate_valid_record(
+        parsed_contract, rng, payload_generator=payload_generator, validator=validator, phases=phases
+    )
+    if not len(matrix) or base_payload.get("_failed"):
+        return {
+            "_is_invalid": True
+        }, None
+    return matrix.mutate(index, base_payload, rng)
+
+
+def _invalid_case_source(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    invalid_mode: str,
+    payload_generator: PayloadGenerator,
+    validator: Validator,
+    size_profile: SizeProfile | None,
+    phases: PhaseTimer
+) -> Callable[[int], Tuple[Dict[str, Any], str | None]]:
+    # Invalid case `index` -> (payload, mutation label); payloads that still
+    # validate after mutating are replaced with the {"_is_invalid": True} marker.
+    if invalid_mode == MUTATION_MATRIX:
+        matrix = MutationMatrix(parsed_contract, size_profile)
+
+        def mutate(index: int) -> Tuple[Dict[str, Any], str | None]:
+            return generate_matrix_labelled_record(
+                parsed_contract, rng, matrix, index, payload_generator, validator, phases
+            )
+    elif invalid_mode == RANDOM_MUTATIONS:
+        def mutate(index: int) -> Tuple[Dict[str, Any], str | None]:
+            return generate_invalid_labelled_record(parsed_contract, rng, payload_generator)
+    else:
+        raise ValueError(f"Unknown invalid mode: {invalid_mode}")
+
+    def invalid_case(index: int) -> Tuple[Dict[str, Any], str | None]:
+        with phases.time(MUTATE):
+            payload, mutation = mutate(index)
+        with phases.time(VALIDATE):
+            still_valid = isinstance(payload, dict) and validator(payload) is None
+        if still_valid:
+            return {"_is_invalid": True}, None
+        return payload, mutation
+
+    return invalid_case
+
+
+def iter_labelled_cases(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    n_valid: int,
+    n_invalid: int,
+    valid_offset: int = 0,
+    invalid_offset: int = 0,
+    size_profile: SizeProfile | None = None,
+    invalid_mode: str = RANDOM_MUTATIONS,
+    phases: PhaseTimer | None = None,
+    payload_generator: PayloadGenerator | None = None,
+    validator: Validator | None = None
+) -> Iterator[LabelledCase]:
+    # payload_generator/validator: already compiled for this contract and size_profile
+    phases = phases or PhaseTimer()
+    payload_generator = payload_generator or compile_payload_generator(parsed_contract, size_profile)
+    validator = payload_validator(parsed_contract, validator or compile_validator(parsed_contract))
+    invalid_case = _invalid_case_source(
+        parsed_contract, rng, invalid_mode, payload_generator, validator, size_profile, phases
+    )
+
+    for i in range(valid_offset, valid_offset + n_valid):
+        yield f"V{i:03d}", True, generate_valid_record(
+            parsed_contract, rng, payload_generator=payload_generator, validator=validator, phases=phases
+        ), None
+
+    for i in range(invalid_offset, invalid_offset + n_invalid):
+        payload, mutation = invalid_case(i)
+        yield f"I{i:03d}", False, payload, mutation
+
+
+def iter_cases(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    n_valid: int,
+    n_invalid: int,
+    valid_offset: int = 0,
+    invalid_offset: int = 0,
+    size_profile: SizeProfile | None = None,
+    invalid_mode: str = RANDOM_MUTATIONS,
+    phases: PhaseTimer | None = None,
+    payload_generator: PayloadGenerator | None = None,
+    validator: Validator | None = None
+) -> Iterator[Case]:
+    for case_id, is_valid, payload, _ in iter_labelled_cases(
+        parsed_contract, rng, n_valid, n_invalid, valid_offset, invalid_offset, size_profile, invalid_mode, phases,
+        payload_generator, validator
+    ):
+        yield case_id, is_valid, payload
+
+
+def iter_open_loop_cases(
+    parsed_contract: Dict[str, Any],
+    rng: random.Random,
+    n_valid: int,
+    n_invalid: int,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    size_profile: SizeProfile | None = None,
+    invalid_mode: str = RANDOM_MUTATIONS,
+    phases: PhaseTimer | None = None
+) -> Iterator[Case]:
+    if n_valid + n_invalid <= 0:
+        return
+
+    phases = phases or PhaseTimer()
+    payload_generator = compile_payload_generator(parsed_contract, size_profile)
+    validator = payload_validator(parsed_contract, compile_validator(parsed_contract))
+    invalid_case = _invalid_case_source(
+        parsed_contract, rng, invalid_mode, payload_generator, validator, size_profile, phases
+    )
+    valid_count = invalid_count = 0
+
+    while True:
+        if n_valid and valid_count * (n_valid + n_invalid) <= (valid_count + invalid_count) * n_valid:
+            yield f"V{valid_count * shard_count + shard_index:03d}", True, generate_valid_record(
+                parsed_contract, rng, payload_generator=payload_generator, validator=validator, phases=phases
+            )
+            valid_count += 1
+            continue
+
+        case_index = invalid_count * shard_count + shard_index
+        yield f"I{case_index:03d}", False, invalid_case(case_index)[0]
+        invalid_count += 1
+
+
+def execute(
+    cases: Iterable[Case],
+    send: Callable[..., SendOutcome],
+    concurrency: int = 1,
+    max_in_flight: int | None = None,
+    expect_2xx_for_valid: bool = True,
+    rps: float | None = None,
+    duration_s: float | None = None
+) -> Iterator[Record]:
+    if rps:
+        def send_scheduled_case(case: Case, scheduled_at: float) -> SendOutcome:
+            return send(case[2], scheduled_at)
+
+        outcomes = dispatch_open_loop(cases, send_scheduled_case, rps, concurrency, duration_s, max_in_flight)
+    else:
+        def send_case(case: Case) -> SendOutcome:
+            return send(case[2])
+
+        outcomes = dispatch(cases, send_case, concurrency, max_in_flight)
+
+    for (case_id, is_valid, _), (status, ms, connect_ms, err, snippet) in outcomes:
+        expected, ok = parse_runner_response(is_valid, status, expect_2xx_for_valid=expect_2xx_for_valid)
+        yield Record(
+            id=case_id,
+            is_valid=is_valid,
+            expected=expected,
+            status_code=status,
+            elapsed_time_ms=ms,
+            error=err,
+            response=snippet,
+            connect_time_ms=connect_ms,
+            ok=ok,
+        )
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 import random
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
-from src.payload_generation_utils import _generate_random_string, _generate_wrong_data_type
-from src.utils import _probabilistic_choice, identify_logical_type, _fields_enum, _field_names, _field_names_required
+from src.payload_generation_utils import _generate_random_string, _generate_wrong_data_type, _probabilistic_choice
+from src.utils import identify_logical_type, _fields_enum, _field_names, _field_names_required
 from src.payload_generation_utils import _union_contains_string, _rand_email_gen, _choose_union_branching
 from src.payload_generation_utils import _is_email_field_valid, _is_string_valid_contract, _rand_fixed_bytes_to_b64
+from src.payload_generation_utils import _generate_primitive_data_type, _rand_bytes_to_b64
+from src.named_types import PRIMITIVE_TYPES, named_schema_index
+from src.size_profile import DEFAULT_SIZE_PROFILE, SizeProfile, SizeRange, fit_size_profile
+from src.compile_payload import compile_terminal_generator
 
 AvroContract = Dict[str, Any]
 
@@ -15,21 +19,29 @@ def _generate_record_field_value(
     field_name: str,
     field_contract: Any,
     field_default_value: Any | None,
-    rng: random.Random
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE,
+    size: SizeRange | None = None
 ) -> Any:
-    from src.generate_payload import generate_valid_payload
     if field_default_value is not None and _probabilistic_choice(rng, 0.15):
         return field_default_value
 
     if _is_email_field_valid(field_name) and (_is_string_valid_contract(field_contract) or _union_contains_string(field_contract)):
         return _rand_email_gen(rng)
 
-    return generate_valid_payload(field_contract, rng=rng)
+    return generate_valid_payload(
+        field_contract, rng=rng, named_schemas=named_schemas, expanding=expanding, size_profile=size_profile, size=size
+    )
 
 
 def _generate_record(
     contract: AvroContract,
-    rng: random.Random
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE
 ) -> Dict[str, Any]:
     record: Dict[str, Any] = {}
 
@@ -37,30 +49,45 @@ def _generate_record(
         name = field["name"]
         field_contract = field["type"]
         field_default = field.get("default", None) if "default" in field else None
-        record[name] = _generate_record_field_value(name, field_contract, field_default, rng)
+        record[name] = _generate_record_field_value(
+            name, field_contract, field_default, rng, named_schemas, expanding,
+            size_profile, size_profile.for_field(contract.get("name", ""), name)
+        )
 
     return record
 
 
 def _generate_array(
     contract: AvroContract,
-    rng: random.Random
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE,
+    size: SizeRange | None = None
 ) -> list[Any]:
-    from src.generate_payload import generate_valid_payload
     items_contract = contract["items"]
+    items = size or size_profile.items
     return [
-        generate_valid_payload(items_contract, rng) for _ in range(rng.randint(0, 5))
+        generate_valid_payload(items_contract, rng, named_schemas, expanding, size_profile)
+        for _ in range(rng.randint(items.minimum, items.maximum))
     ]
 
 
 def _generate_map(
     contract: AvroContract,
-    rng: random.Random
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE,
+    size: SizeRange | None = None
 ) -> Dict[str, Any]:
-    from src.generate_payload import generate_valid_payload
     values_contract = contract["values"]
+    items = size or size_profile.items
+    key_length = size_profile.map_key_length
     return {
-        _generate_random_string(rng, 3, 10): generate_valid_payload(values_contract, rng) for _ in range(rng.randint(0, 5))
+        _generate_random_string(rng, key_length.minimum, key_length.maximum):
+            generate_valid_payload(values_contract, rng, named_schemas, expanding, size_profile)
+        for _ in range(rng.randint(items.minimum, items.maximum))
     }
 
 
@@ -73,11 +100,14 @@ def _generate_enum(
 
 def _generate_union(
     contract: list[Any],
-    rng: random.Random
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE,
+    size: SizeRange | None = None
 ) -> Any:
-    from src.generate_payload import generate_valid_payload
     selected_branch = _choose_union_branching(contract, rng=rng)
-    return generate_valid_payload(selected_branch, rng)
+    return generate_valid_payload(selected_branch, rng, named_schemas, expanding, size_profile, size)
 
 
 def _generate_fixed(
@@ -89,7 +119,11 @@ def _generate_fixed(
 
 def _generate_dict_contract(
     contract: AvroContract,
-    rng: random.Random
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE,
+    size: SizeRange | None = None
 ) -> Any:
     logical_type = identify_logical_type(contract, rng)
     if logical_type is not None:
@@ -98,15 +132,68 @@ def _generate_dict_contract(
     data_type = contract.get("type")
 
     if data_type == "record":
-        return _generate_record(contract, rng)
+        return _generate_record(contract, rng, named_schemas, expanding, size_profile)
     if data_type == "array":
-        return _generate_array(contract, rng)
+        return _generate_array(contract, rng, named_schemas, expanding, size_profile, size)
     if data_type == "map":
-        return _generate_map(contract, rng)
+        return _generate_map(contract, rng, named_schemas, expanding, size_profile, size)
     if data_type == "enum":
         return _generate_enum(contract, rng)
     if data_type == "fixed":
         return _generate_fixed(contract, rng)
+    if isinstance(data_type, (str, list)):
+        # {"type": "long"} and unknown logical types generate as their plain type
+        return generate_valid_payload(data_type, rng, named_schemas, expanding, size_profile, size)
+
+
+def _generate_named_reference(
+    name: str,
+    rng: random.Random,
+    named_schemas: Dict[str, Any],
+    expanding: Tuple[str, ...],
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE
+) -> Any:
+    # `expanding` holds the names being generated above this point; a name seen
+    # max_depth times already is recursive and ends in its smallest finite value.
+    if expanding.count(name) >= size_profile.max_depth:
+        return compile_terminal_generator(name, named_schemas)(rng)
+    return generate_valid_payload(named_schemas[name], rng, named_schemas, expanding + (name,), size_profile)
+
+
+def generate_valid_payload(
+    contract: Any,
+    rng: random.Random,
+    named_schemas: Dict[str, Any] | None = None,
+    expanding: Tuple[str, ...] = (),
+    size_profile: SizeProfile | None = None,
+    size: SizeRange | None = None
+) -> Any:
+    # size_profile sizes strings, bytes, arrays and maps as compile_payload_generator
+    # does; `size` is a per-field override for the value directly below it.
+    if size_profile is None:
+        size_profile = DEFAULT_SIZE_PROFILE
+    elif size_profile.target_bytes is not None:
+        size_profile, _ = fit_size_profile(contract, size_profile)
+    if named_schemas is None:
+        named_schemas = named_schema_index(contract)
+
+    if isinstance(contract, list):
+        return _generate_union(contract, rng, named_schemas, expanding, size_profile, size)
+
+    if isinstance(contract, str):
+        if contract not in PRIMITIVE_TYPES and contract in named_schemas:
+            return _generate_named_reference(contract, rng, named_schemas, expanding, size_profile)
+        if contract == "string":
+            length = size or size_profile.string_length
+            return _generate_random_string(rng, length.minimum, length.maximum)
+        if contract == "bytes":
+            length = size or size_profile.bytes_length
+            return _rand_bytes_to_b64(rng, length.minimum, length.maximum)
+        return _generate_primitive_data_type(contract, rng)
+
+    if isinstance(contract, dict):
+        return _generate_dict_contract(contract, rng, named_schemas, expanding, size_profile, size)
+    return None
 
 
 def _generate_invalid_type(
@@ -0,0 +1,107 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+import pickle
+import hashlib
+import threading
+import fastavro
+from pathlib import Path
+from typing import Dict, Tuple
+from fastavro import parse_schema
+from fastavro.types import Schema
+from src.compile_validator import Validator, compile_validator
+from src.compile_payload import PayloadGenerator, compile_payload_generator
+from src.size_profile import SizeProfile
+from src.constants import DEFAULT_CACHE_DIR
+
+# bump when the cached representation changes; fastavro's version is part of every key too
+CACHE_VERSION = 1
+
+
+class SchemaCache:
+    # Parsed schemas keyed by a hash of the schema file's bytes. Parsed schemas
+    # are pickled to `directory` (None keeps them in memory only), so unchanged
+    # contracts skip fastavro.parse_schema on later runs. Compiled generators
+    # and validators are closures and cannot be stored; they are shared in
+    # memory between entries with the same contents and size profile.
+    # Only point `directory` at a cache you wrote yourself: entries are unpickled.
+    def __init__(self, directory: Path | None = DEFAULT_CACHE_DIR) -> None:
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._parsed: Dict[str, Schema] = {}
+        self._compiled: Dict[Tuple[str, str], Tuple[PayloadGenerator, Validator]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"avroman-schema:{CACHE_VERSION}:{fastavro.__version__}:".encode("ascii"))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path | None:
+        return None if self.directory is None else self.directory / f"{key}.pickle"
+
+    def _read(self, key: str) -> Schema | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with path.open("rb") as handle:
+                return pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # a truncated or stale entry is parsed again and overwritten
+            return None
+
+    def _write(self, key: str, parsed_contract: Schema) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.{threading.get_ident()}.partial")
+        with partial.open("wb") as handle:
+            pickle.dump(parsed_contract, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        partial.replace(path)
+
+    def load(self, contract_path: str | Path) -> Tuple[str, Schema]:
+        # (content key, parsed schema); equal files give the same parsed object
+        data = Path(contract_path).read_bytes()
+        key = self.key(data)
+        with self._lock:
+            parsed_contract = self._parsed.get(key)
+            if parsed_contract is not None:
+                self.hits += 1
+                return key, parsed_contract
+
+        parsed_contract = self._read(key)
+        if parsed_contract is None:
+            parsed_contract = parse_schema(json.loads(data))
+            self._write(key, parsed_contract)
+            hit = False
+        else:
+            hit = True
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return key, self._parsed.setdefault(key, parsed_contract)
+
+    def compiled(
+        self,
+        key: str,
+        parsed_contract: Schema,
+        size_profile: SizeProfile | None = None
+    ) -> Tuple[PayloadGenerator, Validator]:
+        profile_key = "" if size_profile is None else json.dumps(size_profile.to_dict(), sort_keys=True)
+        with self._lock:
+            compiled = self._compiled.get((key, profile_key))
+        if compiled is None:
+            compiled = (compile_payload_generator(parsed_contract, size_profile), compile_validator(parsed_contract))
+            with self._lock:
+                compiled = self._compiled.setdefault((key, profile_key), compiled)
+        return compiled
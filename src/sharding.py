@@ -0,0 +1,155 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import time
+import random
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core.sinks import RecordSinks
+from core.statistics import RunStatistics
+from src.pipeline import RunSettings, build_runner, execute, iter_cases, iter_open_loop_cases
+from src.size_profile import SizeProfile
+
+
+@dataclass
+class Shard:
+    index: int
+    count: int
+    seed: int
+    valid_offset: int
+    n_valid: int
+    invalid_offset: int
+    n_invalid: int
+    spill_path: Path | None = None
+    csv_path: Path | None = None
+
+
+def derive_seed(seed: int, shard_index: int) -> int:
+    digest = hashlib.blake2b(f"avroman:{seed}:{shard_index}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _split(total: int, parts: int) -> List[Tuple[int, int]]:
+    size, remainder = divmod(total, parts)
+    slices: List[Tuple[int, int]] = []
+    offset = 0
+    for index in range(parts):
+        length = size + (1 if index < remainder else 0)
+        slices.append((offset, length))
+        offset += length
+    return slices
+
+
+def _shard_path(path: Path | None, shard_index: int) -> Path | None:
+    if path is None:
+        return None
+    return path.with_name(f"{path.stem}.shard{shard_index}{path.suffix}")
+
+
+def plan_shards(
+    seed: int,
+    n_valid: int,
+    n_invalid: int,
+    workers: int,
+    spill_path: Path | None = None,
+    open_loop: bool = False,
+    csv_path: Path | None = None
+) -> List[Shard]:
+    if open_loop:
+        # open-loop shards share the mix ratio and stride the ids instead of slicing them
+        return [
+            Shard(
+                index, workers, derive_seed(seed, index), 0, n_valid, 0, n_invalid,
+                _shard_path(spill_path, index), _shard_path(csv_path, index)
+            )
+            for index in range(workers)
+        ]
+
+    return [
+        Shard(
+            index=index,
+            count=workers,
+            seed=derive_seed(seed, index),
+            valid_offset=valid_offset,
+            n_valid=valid_length,
+            invalid_offset=invalid_offset,
+            n_invalid=invalid_length,
+            spill_path=_shard_path(spill_path, index),
+            csv_path=_shard_path(csv_path, index),
+        )
+        for index, ((valid_offset, valid_length), (invalid_offset, invalid_length)) in enumerate(
+            zip(_split(n_valid, workers), _split(n_invalid, workers))
+        )
+    ]
+
+
+def run_shard(
+    parsed_contract: Dict[str, Any],
+    settings: RunSettings,
+    shard: Shard,
+    on_progress: Callable[[RunStatistics], None] | None = None,
+    progress_interval_s: float = 0.5,
+    size_profile: SizeProfile | None = None
+) -> Dict[str, Any]:
+    rng = random.Random(shard.seed)
+    statistics = RunStatistics()
+    statistics.target_rps = settings.rps
+    if settings.duration_s is not None:
+        cases = iter_open_loop_cases(
+            parsed_contract, rng, shard.n_valid, shard.n_invalid, shard.index, shard.count, size_profile,
+            settings.invalid_mode, statistics.phases
+        )
+    else:
+        cases = iter_cases(
+            parsed_contract, rng, shard.n_valid, shard.n_invalid, shard.valid_offset, shard.invalid_offset, size_profile,
+            settings.invalid_mode, statistics.phases
+        )
+
+    last_progress = time.perf_counter()
+    with build_runner(parsed_contract, settings, statistics.phases) as http_runner, RecordSinks(shard.spill_path, shard.csv_path) as sinks:
+        records = execute(
+            cases, http_runner.send, settings.concurrency, settings.max_in_flight,
+            expect_2xx_for_valid=settings.expect_2xx_for_valid, rps=settings.rps, duration_s=settings.duration_s
+        )
+        for record in records:
+            statistics.add(record)
+            sinks.write(record)
+            if on_progress is not None and time.perf_counter() - last_progress >= progress_interval_s:
+                last_progress = time.perf_counter()
+                on_progress(statistics)
+
+    return statistics.to_dict()
+
+
+def shard_settings(settings: RunSettings, shards: int) -> RunSettings:
+    return replace(settings, rps=settings.rps / shards if settings.rps else None)
+
+
+def run_sharded(
+    parsed_contract: Dict[str, Any],
+    settings: RunSettings,
+    seed: int,
+    n_valid: int,
+    n_invalid: int,
+    workers: int,
+    spill_path: Path | None = None,
+    on_shard_done: Callable[[RunStatistics], None] | None = None,
+    size_profile: SizeProfile | None = None,
+    csv_path: Path | None = None
+) -> RunStatistics:
+    shards = plan_shards(seed, n_valid, n_invalid, workers, spill_path, open_loop=settings.duration_s is not None, csv_path=csv_path)
+    worker_settings = shard_settings(settings, workers)
+
+    statistics = RunStatistics()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_shard, parsed_contract, worker_settings, shard, size_profile=size_profile) for shard in shards]
+        for future in as_completed(futures):
+            statistics.merge(RunStatistics.from_dict(future.result()))
+            if on_shard_done is not None:
+                on_shard_done(statistics)
+
+    return statistics
@@ -0,0 +1,298 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Tuple
+
+from src.payload_generation_utils import EMAIL_PROVIDERS, _is_branch_empty, _is_email_field_valid
+from src.payload_generation_utils import _is_string_valid_contract, _union_contains_string
+from src.named_types import named_schema_index, recursive_names
+
+
+@dataclass(frozen=True)
+class SizeRange:
+    minimum: int
+    maximum: int
+
+    def __post_init__(self) -> None:
+        if self.minimum < 0 or self.maximum < self.minimum:
+            raise ValueError(f"Invalid size range: {self.minimum}-{self.maximum}")
+
+    @property
+    def mean(self) -> float:
+        return (self.minimum + self.maximum) / 2
+
+    def scaled(self, factor: float) -> "SizeRange":
+        minimum = int(round(self.minimum * factor))
+        return SizeRange(minimum, max(minimum, int(round(self.maximum * factor))))
+
+    def narrowed(self, spread: float) -> "SizeRange":
+        # the same mean, within +-spread of it
+        minimum = int(round(self.mean * (1 - spread)))
+        return SizeRange(minimum, max(minimum, int(round(self.mean * (1 + spread)))))
+
+    def __str__(self) -> str:
+        return f"{self.minimum}-{self.maximum}"
+
+
+@dataclass(frozen=True)
+class SizeProfile:
+    items: SizeRange = SizeRange(0, 5)
+    string_length: SizeRange = SizeRange(5, 20)
+    bytes_length: SizeRange = SizeRange(0, 16)
+    map_key_length: SizeRange = SizeRange(3, 10)
+    fields: Dict[str, SizeRange] = field(default_factory=dict)
+    target_bytes: int | None = None
+    max_depth: int = 4
+
+    def __post_init__(self) -> None:
+        if self.max_depth < 0:
+            raise ValueError(f"Invalid recursion depth: {self.max_depth}")
+
+    def for_field(self, record_name: str, field_name: str) -> SizeRange | None:
+        # "namespace.Record.field", "Record.field" or a bare "field"
+        short_name = record_name.rsplit(".", 1)[-1]
+        for key in (f"{record_name}.{field_name}", f"{short_name}.{field_name}", field_name):
+            if key in self.fields:
+                return self.fields[key]
+        return None
+
+    def scaled(self, factor: float, spread: float | None = None) -> "SizeProfile":
+        # explicit per-field ranges are kept as given; with a spread the scaled
+        # ranges are also narrowed to within +-spread of their mean
+        def scale(size: SizeRange) -> SizeRange:
+            size = size.scaled(factor)
+            return size if spread is None else size.narrowed(spread)
+
+        return replace(
+            self,
+            items=scale(self.items),
+            string_length=scale(self.string_length),
+            bytes_length=scale(self.bytes_length),
+            target_bytes=None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": str(self.items),
+            "string_length": str(self.string_length),
+            "bytes_length": str(self.bytes_length),
+            "map_key_length": str(self.map_key_length),
+            "fields": {name: str(size) for name, size in self.fields.items()},
+            "target_bytes": self.target_bytes,
+            "max_depth": self.max_depth,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SizeProfile":
+        unknown = set(data) - {
+            "items", "string_length", "bytes_length", "map_key_length", "fields", "target_bytes", "max_depth"
+        }
+        if unknown:
+            raise ValueError(f"Unknown size profile keys: {', '.join(sorted(unknown))}")
+
+        profile = cls()
+        return replace(
+            profile,
+            **{
+                key: parse_size_range(data[key])
+                for key in ("items", "string_length", "bytes_length", "map_key_length") if key in data
+            },
+            fields={name: parse_size_range(size) for name, size in (data.get("fields") or {}).items()},
+            target_bytes=int(data["target_bytes"]) if data.get("target_bytes") is not None else None,
+            max_depth=int(data.get("max_depth", profile.max_depth)),
+        )
+
+
+DEFAULT_SIZE_PROFILE = SizeProfile()
+# With a target size the fitted ranges keep within 10% of their mean; scaling
+# 0-5 items and 5-20 characters as they are spreads single payloads over
+# three orders of magnitude around the target.
+TARGET_SIZE_SPREAD = 0.1
+
+
+def parse_size_range(value: Any) -> SizeRange:
+    if isinstance(value, SizeRange):
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid size range: {value!r}")
+    if isinstance(value, int):
+        return SizeRange(value, value)
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        return SizeRange(int(value[0]), int(value[1]))
+    if isinstance(value, str):
+        minimum, separator, maximum = value.strip().partition("-")
+        try:
+            return SizeRange(int(minimum), int(maximum if separator else minimum))
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid size range: {value!r}, expected N, MIN-MAX or [MIN, MAX]")
+
+
+def load_size_profile(profile_path: str | Path) -> SizeProfile:
+    return SizeProfile.from_dict(json.loads(Path(profile_path).read_text(encoding="utf-8")))
+
+
+def parse_field_sizes(values: Iterable[str]) -> Dict[str, SizeRange]:
+    field_sizes: Dict[str, SizeRange] = {}
+    for value in values:
+        name, separator, size = value.partition("=")
+        if not separator or not name.strip():
+            raise ValueError(f"Invalid field size: {value!r}, expected FIELD=MIN-MAX")
+        field_sizes[name.strip()] = parse_size_range(size)
+    return field_sizes
+
+
+def _base64_size(length: float) -> float:
+    return length * 4 / 3 + 2
+
+
+_PRIMITIVE_SIZES = {
+    "null": 4.0,
+    "boolean": 4.5,
+    "int": 4.0,
+    "long": 6.0,
+    "float": 18.0,
+    "double": 18.0,
+}
+_LOGICAL_SIZES = {
+    "date": 5.0,
+    "time-millis": 8.0,
+    "time-micros": 11.0,
+    "timestamp-millis": 13.0,
+    "timestamp-micros": 16.0,
+    "timestamp-nanos": 19.0,
+    "local-timestamp-millis": 13.0,
+    "local-timestamp-micros": 16.0,
+    "local-timestamp-nanos": 19.0,
+    "uuid": 38.0,
+    "duration": _base64_size(12),
+}
+_EMAIL_SIZE = 7.5 + 1 + sum(len(provider) for provider in EMAIL_PROVIDERS) / len(EMAIL_PROVIDERS) + 2
+
+
+class _SizeEstimator:
+    def __init__(self, size_profile: SizeProfile, named_schemas: Dict[str, Any]) -> None:
+        self.size_profile = size_profile
+        self.named_schemas = named_schemas
+        self.recursive = recursive_names(named_schemas)
+        self.depth = 0
+
+    def estimate(self, contract: Any, size: SizeRange | None = None) -> float:
+        size_profile = self.size_profile
+        if isinstance(contract, list):
+            empty_branches = [branch for branch in contract if _is_branch_empty(branch)]
+            branches = [branch for branch in contract if branch not in empty_branches] or contract
+            branch_size = sum(self.estimate(branch, size) for branch in branches) / len(branches)
+            if empty_branches:
+                return 0.25 * _PRIMITIVE_SIZES["null"] + 0.75 * branch_size
+            return branch_size
+
+        if isinstance(contract, str):
+            if contract == "string":
+                return (size or size_profile.string_length).mean + 2
+            if contract == "bytes":
+                return _base64_size((size or size_profile.bytes_length).mean)
+            if contract in self.named_schemas:
+                return self._estimate_named(contract)
+            return _PRIMITIVE_SIZES.get(contract, 14.0)
+
+        if not isinstance(contract, dict):
+            return _PRIMITIVE_SIZES["null"]
+
+        logical_type = contract.get("logicalType")
+        if logical_type == "decimal" and isinstance(contract.get("precision"), int):
+            # unscaled value of about `precision` digits, two's complement
+            return _base64_size(contract["size"] if contract.get("type") == "fixed" else contract["precision"] * 0.415 + 1)
+        if logical_type in _LOGICAL_SIZES:
+            return _LOGICAL_SIZES[logical_type]
+
+        data_type = contract.get("type")
+        if data_type == "record":
+            total = 2.0
+            for record_field in contract.get("fields", []):
+                name = record_field["name"]
+                field_contract = record_field["type"]
+                if _is_email_field_valid(name) and (
+                    _is_string_valid_contract(field_contract) or _union_contains_string(field_contract)
+                ):
+                    field_size = _EMAIL_SIZE
+                else:
+                    field_size = self.estimate(field_contract, size_profile.for_field(contract.get("name", ""), name))
+                if record_field.get("default") is not None:
+                    field_size = 0.85 * field_size + 0.15 * len(json.dumps(record_field["default"]))
+                total += len(name) + 4 + field_size
+            return total
+        if data_type == "array":
+            items = size or size_profile.items
+            return 2 + items.mean * (self.estimate(contract["items"]) + 1)
+        if data_type == "map":
+            items = size or size_profile.items
+            key_size = size_profile.map_key_length.mean + 3
+            return 2 + items.mean * (key_size + self.estimate(contract["values"]) + 1)
+        if data_type == "enum":
+            symbols = contract["symbols"]
+            return sum(len(symbol) for symbol in symbols) / len(symbols) + 2
+        if data_type == "fixed":
+            return _base64_size(int(contract["size"]))
+        if isinstance(data_type, (str, list)):
+            return self.estimate(data_type, size)
+        return _PRIMITIVE_SIZES["null"]
+
+    def _estimate_named(self, name: str) -> float:
+        if name not in self.recursive:
+            return self.estimate(self.named_schemas[name])
+        if self.depth >= self.size_profile.max_depth:
+            # past the depth budget generation takes the smallest finite branch
+            return _PRIMITIVE_SIZES["null"]
+        self.depth += 1
+        try:
+            return self.estimate(self.named_schemas[name])
+        finally:
+            self.depth -= 1
+
+
+def estimate_payload_size(
+    contract: Any,
+    size_profile: SizeProfile = DEFAULT_SIZE_PROFILE
+) -> float:
+    # Expected JSON size in bytes of a payload from compile_payload_generator;
+    # Avro binary bodies come out smaller, mostly on field names and numbers.
+    return _SizeEstimator(size_profile, named_schema_index(contract)).estimate(contract)
+
+
+def fit_size_profile(
+    contract: Any,
+    size_profile: SizeProfile
+) -> Tuple[SizeProfile, float]:
+    # Scales the per-type ranges until the expected payload size meets the
+    # target, narrowed around their mean. Returns the fitted profile and its
+    # expected size; single payloads still vary with optional fields, union
+    # branches and defaults.
+    target = size_profile.target_bytes
+    if target is None:
+        return size_profile, estimate_payload_size(contract, size_profile)
+
+    def expected(factor: float) -> float:
+        return estimate_payload_size(contract, size_profile.scaled(factor, TARGET_SIZE_SPREAD))
+
+    low, high = 0.0, 1.0
+    while expected(high) < target:
+        low, high = high, high * 2
+        if high > 1e9:
+            raise ValueError(
+                f"Target size {target} bytes is out of reach: the schema has no string, bytes, array or map "
+                "sizes left to scale"
+            )
+    for _ in range(60):
+        middle = (low + high) / 2
+        if expected(middle) < target:
+            low = middle
+        else:
+            high = middle
+
+    fitted = size_profile.scaled(high, TARGET_SIZE_SPREAD)
+    return fitted, estimate_payload_size(contract, fitted)
@@ -0,0 +1,216 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+from pathlib import Path
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from fastavro.schema import SchemaParseException
+from rich.table import Table
+from rich.console import Console
+from core.runner import Record
+from core.statistics import RunStatistics
+from core.phases import PARSE_SCHEMA, PhaseTimer
+from core.registry import RegistryError
+from src.pipeline import RunSettings, build_runner, execute, iter_cases, resolve_schema_id
+from src.mutation_matrix import MUTATION_MATRIX, MutationMatrix
+from src.schema_cache import SchemaCache
+from src.size_profile import SizeProfile, fit_size_profile
+
+SCHEMA_SUFFIXES = (".avsc",)
+
+
+@dataclass
+class SuiteEntry:
+    name: str
+    contract_path: Path
+    settings: RunSettings
+    n_valid: int = 25
+    n_invalid: int | None = None
+
+
+@dataclass
+class SuiteResult:
+    entry: SuiteEntry
+    statistics: RunStatistics
+    error: str | None = None
+
+
+def discover_entries(
+    directory: Path,
+    url_template: str,
+    settings: RunSettings,
+    n_valid: int,
+    n_invalid: int | None
+) -> List[SuiteEntry]:
+    # every *.avsc below `directory`, named by its relative path; "{name}" in the URL is the file stem
+    return [
+        SuiteEntry(
+            path.relative_to(directory).with_suffix("").as_posix(), path,
+            replace(settings, url=url_template.format(name=path.stem)), n_valid, n_invalid
+        )
+        for path in sorted(directory.rglob("*"))
+        if path.suffix in SCHEMA_SUFFIXES and path.is_file()
+    ]
+
+
+def load_manifest(
+    manifest_path: Path,
+    settings: RunSettings,
+    n_valid: int,
+    n_invalid: int | None
+) -> List[SuiteEntry]:
+    # {"defaults": {...}, "schemas": [{"schema": "a.avsc", "url": "...", ...}, ...]}
+    # Entries may set name, url, method, headers, subject, n_valid and n_invalid; "defaults"
+    # applies to every entry and the command line fills in the rest. Schema
+    # paths are relative to the manifest.
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    defaults = manifest.get("defaults", {})
+    entries: List[SuiteEntry] = []
+    for index, item in enumerate(manifest.get("schemas", [])):
+        merged = {**defaults, **item}
+        if "schema" not in merged:
+            raise ValueError(f"Manifest entry {index} has no 'schema'")
+        contract_path = (manifest_path.parent / merged["schema"]).resolve()
+        url = merged.get("url", settings.url)
+        if not url:
+            raise ValueError(f"Manifest entry {index} ({merged['schema']}) has no 'url'")
+        entries.append(SuiteEntry(
+            name=merged.get("name", contract_path.stem),
+            contract_path=contract_path,
+            settings=replace(
+                settings,
+                url=url.format(name=contract_path.stem),
+                method=merged.get("method", settings.method),
+                headers={**(settings.headers or {}), **merged.get("headers", {})} or None,
+                subject=merged.get("subject", settings.subject),
+            ),
+            n_valid=int(merged.get("n_valid", n_valid)),
+            n_invalid=None if merged.get("n_invalid", n_invalid) is None else int(merged.get("n_invalid", n_invalid)),
+        ))
+    return entries
+
+
+def run_entry(
+    entry: SuiteEntry,
+    cache: SchemaCache,
+    seed: int = 0,
+    size_profile: SizeProfile | None = None,
+    on_record: Callable[[Record], None] | None = None
+) -> SuiteResult:
+    phases = PhaseTimer()
+    try:
+        with phases.time(PARSE_SCHEMA):
+            key, parsed_contract = cache.load(entry.contract_path)
+        if size_profile is not None and size_profile.target_bytes is not None:
+            size_profile, _ = fit_size_profile(parsed_contract, size_profile)
+        n_invalid = entry.n_invalid
+        if n_invalid is None:
+            n_invalid = len(MutationMatrix(parsed_contract, size_profile)) \
+                if entry.settings.invalid_mode == MUTATION_MATRIX else 25
+        payload_generator, validator = cache.compiled(key, parsed_contract, size_profile)
+        settings = resolve_schema_id(parsed_contract, entry.settings, phases)
+    except (OSError, ValueError, SchemaParseException, RegistryError) as err:
+        # one broken contract is reported in its row instead of stopping the suite
+        return SuiteResult(entry, RunStatistics(), f"{type(err).__name__}: {err}")
+
+    cases = iter_cases(
+        parsed_contract, random.Random(seed), entry.n_valid, n_invalid,
+        size_profile=size_profile, invalid_mode=entry.settings.invalid_mode, phases=phases,
+        payload_generator=payload_generator, validator=validator
+    )
+    statistics = RunStatistics()
+    statistics.phases = phases
+    with build_runner(parsed_contract, settings, phases) as http_runner:
+        records = execute(
+            cases, http_runner.send, settings.concurrency, settings.max_in_flight,
+            expect_2xx_for_valid=settings.expect_2xx_for_valid
+        )
+        for record in records:
+            statistics.add(record)
+            if on_record is not None:
+                on_record(record)
+    return SuiteResult(entry, statistics)
+
+
+def run_suite(
+    entries: List[SuiteEntry],
+    cache: SchemaCache,
+    parallel: int = 4,
+    seed: int = 0,
+    size_profile: SizeProfile | None = None,
+    on_progress: Callable[[RunStatistics], None] | None = None
+) -> List[SuiteResult]:
+    # Entries share one process: up to `parallel` run at a time, each with its
+    # own connection pool and --concurrency. Every entry uses the same seed, so
+    # a contract's cases do not depend on which other contracts are in the suite.
+    overall = RunStatistics()
+    lock = threading.Lock()
+
+    def on_record(record: Record) -> None:
+        with lock:
+            overall.add(record)
+            if on_progress is not None:
+                on_progress(overall)
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel), thread_name_prefix="suite") as pool:
+        futures = [pool.submit(run_entry, entry, cache, seed, size_profile, on_record) for entry in entries]
+        return [future.result() for future in futures]
+
+
+def render_suite(results: List[SuiteResult], cache: SchemaCache) -> None:
+    console = Console(width=140)
+    table = Table(title=f"Suite ({len(results)} schemas)", expand=True)
+    table.add_column("schema", overflow="fold", ratio=1)
+    table.add_column("total", justify="right", no_wrap=True)
+    table.add_column("unexpected", justify="right", no_wrap=True)
+    table.add_column("errors", justify="right", no_wrap=True)
+    table.add_column("status codes", overflow="fold", ratio=1)
+    table.add_column("p50 (ms)", justify="right", no_wrap=True)
+    table.add_column("p99 (ms)", justify="right", no_wrap=True)
+    table.add_column("req/s", justify="right", no_wrap=True)
+
+    for result in results:
+        statistics = result.statistics
+        if result.error is not None:
+            table.add_row(result.entry.name, "-", "-", "-", f"[red]{result.error}[/red]", "-", "-", "-")
+            continue
+        table.add_row(
+            result.entry.name,
+            str(statistics.total),
+            f"[red]{statistics.unexpected}[/red]" if statistics.unexpected else "0",
+            str(statistics.errors),
+            " ".join(f"{status}:{count}" for status, count in sorted(statistics.status_counts.items())),
+            f"{statistics.latency.percentile(50.0):.1f}",
+            f"{statistics.latency.percentile(99.0):.1f}",
+            f"{statistics.throughput():.1f}",
+        )
+
+    console.print(table)
+    failed = sum(1 for result in results if result.error is not None or result.statistics.unexpected)
+    console.print(
+        f"Schemas: {len(results)}  Failed: {failed}  "
+        f"Schema cache: {cache.hits} hits, {cache.misses} parsed"
+    )
+
+
+def suite_summary(results: List[SuiteResult]) -> Dict[str, Any]:
+    return {
+        result.entry.name: {
+            "schema": str(result.entry.contract_path),
+            "url": result.entry.settings.url,
+            "error": result.error,
+            "total": result.statistics.total,
+            "unexpected": result.statistics.unexpected,
+            "errors": result.statistics.errors,
+            "status_counts": dict(sorted(result.statistics.status_counts.items())),
+            "p50_ms": result.statistics.latency.percentile(50.0),
+            "p99_ms": result.statistics.latency.percentile(99.0),
+            "throughput_rps": result.statistics.throughput(),
+        }
+        for result in results
+    }
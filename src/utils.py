@@ -5,15 +5,20 @@ from __future__ import annotations
 import json
 import random
 from pathlib import Path
+from importlib.resources import files
 from typing import Any, Dict, List
 from fastavro import parse_schema
 from fastavro.types import Schema
 from fastavro.validation import validate
-from datetime import date, datetime, timezone
+from src.logical_types import logical_type_generator
+from src.payload_generation_utils import _is_union_nullable
 
 
 Contract = Dict[str, Any]
 
+# schemas shipped with the package, in src/contracts
+SAMPLE_CONTRACT = "sample.avsc"
+
 def load_contract(
         contract_path: str | Path
 ) -> Schema:
@@ -21,6 +26,13 @@ def load_contract(
     contract_data = json.loads(contract_path.read_text(encoding="utf-8"))
     return parse_schema(contract_data)
 
+def load_bundled_contract(
+        name: str = SAMPLE_CONTRACT
+) -> Schema:
+    # read through importlib.resources, so an installed copy finds it as well as a checkout
+    contract_data = json.loads(files("src.contracts").joinpath(name).read_text(encoding="utf-8"))
+    return parse_schema(contract_data)
+
 def is_record_valid(
     parsed_contract: Dict[str, Any],
     record: Dict[str, Any]
@@ -31,33 +43,15 @@ def is_record_valid(
         return False
 
 
-def _probabilistic_choice(
-    rng: random.Random,
-    probability: float = 0.3
-) -> bool:
-    return rng.random() < probability
-
 def identify_logical_type(
     contract: Contract,
     rng: random.Random
 ) -> Any:
-    logical_type = contract.get("logicalType")
-    if logical_type == "date":
-        set_date = date(
-            2000 + rng.randint(0, 30), rng.randint(1, 12), rng.randint(1, 28)
-        ) 
-        epoch = date(1970, 1, 1)
-        return (set_date - epoch).days
-
-    if logical_type in ("timestamp-millis", "timestamp-micros"):
-        now = datetime.now(tz=timezone.utc)
-        millisecond = int(now.timestamp() * 1000)
-
-        if logical_type == "timestamp-micros":
-            return millisecond * 1000
-        return millisecond
-
-    return None
+    # None when the contract has no logical type this generator set knows
+    generate_logical_type = logical_type_generator(contract)
+    if generate_logical_type is None:
+        return None
+    return generate_logical_type(rng)
 
 
 def _field_names(contract: Contract) -> List[str]:
@@ -67,7 +61,6 @@ def _field_names(contract: Contract) -> List[str]:
 
 
 def _field_names_required(contract: Contract) -> List[str]:
-    from src.payload_generation_utils import _is_union_nullable
     required_field_names: List[str] = []
     for field in contract.get("fields", []):
         if not _is_union_nullable(field["type"]):
@@ -0,0 +1,114 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+from fastavro import parse_schema
+from fastavro.validation import validate
+from core.encoding import to_avro_converter
+from src.utils import load_bundled_contract
+from src.compile_validator import compile_validator
+from src.compile_payload import compile_payload_generator
+from src.generate_payload import generate_invalid_payload
+from src.mutation_matrix import MutationMatrix
+from benchmarks.schemas import large_arrays, nested_unions, wide_record
+from tests.test_encoding import NESTED_BYTES
+
+LOGICAL_TYPES = {
+    "type": "record",
+    "name": "Logical",
+    "fields": [
+        {"name": "day", "type": {"type": "int", "logicalType": "date"}},
+        {"name": "at", "type": {"type": "long", "logicalType": "timestamp-micros"}},
+        {"name": "id", "type": {"type": "string", "logicalType": "uuid"}},
+        {"name": "amount", "type": {"type": "bytes", "logicalType": "decimal", "precision": 9, "scale": 2}},
+        {"name": "span", "type": {"type": "fixed", "name": "Span", "size": 12, "logicalType": "duration"}},
+    ],
+}
+
+CONTRACTS = {
+    "sample": lambda: load_bundled_contract(),
+    "wide": lambda: parse_schema(wide_record(60)),
+    "nested_unions": lambda: parse_schema(nested_unions(4)),
+    "large_arrays": lambda: parse_schema(large_arrays()),
+    "nested_bytes": lambda: parse_schema(NESTED_BYTES),
+    "logical_types": lambda: parse_schema(LOGICAL_TYPES),
+}
+
+# values around every primitive's edges, checked against each primitive schema
+EDGE_VALUES = [
+    None, True, False, 0, 1, -1, 2 ** 31 - 1, 2 ** 31, -2 ** 31, -2 ** 31 - 1, 2 ** 63 - 1, 2 ** 63, -2 ** 63 - 1,
+    0.0, -1.5, 3.4e38, 1e300, math.inf, -math.inf, math.nan, "", "text", b"", b"\x00\xff", bytearray(b"ab"),
+    [], [1], {}, {"a": 1},
+]
+PRIMITIVES = ["null", "boolean", "int", "long", "float", "double", "bytes", "string"]
+
+
+def _fastavro_accepts(parsed_contract, datum):
+    return validate(datum, parsed_contract, raise_errors=False)
+
+
+@pytest.mark.parametrize("name", sorted(CONTRACTS))
+def test_generated_payloads_agree_with_fastavro(name):
+    parsed_contract = CONTRACTS[name]()
+    generate = compile_payload_generator(parsed_contract)
+    validator = compile_validator(parsed_contract)
+    to_avro = to_avro_converter(parsed_contract)
+    matrix = MutationMatrix(parsed_contract)
+    rng = random.Random(3)
+
+    data = []
+    for index in range(100):
+        data.append(generate(rng))
+        data.append(generate_invalid_payload(parsed_contract, rng, generate))
+        if len(matrix):
+            data.append(matrix.mutate(index, generate(rng), rng)[0])
+
+    for datum in data:
+        datum = to_avro(datum)
+        assert (validator(datum) is None) == _fastavro_accepts(parsed_contract, datum), datum
+
+
+@pytest.mark.parametrize("primitive", PRIMITIVES)
+def test_primitive_edges_agree_with_fastavro(primitive):
+    parsed_contract = parse_schema(primitive)
+    validator = compile_validator(parsed_contract)
+    for value in EDGE_VALUES:
+        assert (validator(value) is None) == _fastavro_accepts(parsed_contract, value), (primitive, value)
+
+
+def test_union_and_enum_edges_agree_with_fastavro():
+    parsed_contract = parse_schema({
+        "type": "record",
+        "name": "Edges",
+        "fields": [
+            {"name": "choice", "type": ["null", "int", {"type": "enum", "name": "Color", "symbols": ["RED", "GREEN"]}]},
+            {"name": "tags", "type": {"type": "map", "values": ["null", "string"]}},
+            {"name": "digest", "type": {"type": "fixed", "name": "Digest", "size": 2}},
+        ],
+    })
+    validator = compile_validator(parsed_contract)
+    base = {"choice": None, "tags": {}, "digest": b"ab"}
+    variants = [
+        {}, {"choice": "RED"}, {"choice": "BLUE"}, {"choice": 2 ** 31}, {"choice": 1.5}, {"choice": True},
+        {"tags": {"a": None, "b": "x"}}, {"tags": {"a": 1}}, {"tags": []}, {"digest": b"abc"}, {"digest": "ab"},
+        {"digest": bytearray(b"ab")}, {"digest": bytearray(b"abc")}, {"extra": 1},
+    ]
+    for variant in variants:
+        datum = {**base, **variant}
+        assert (validator(datum) is None) == _fastavro_accepts(parsed_contract, datum), datum
+    datum = dict(base)
+    del datum["tags"]
+    assert (validator(datum) is None) == _fastavro_accepts(parsed_contract, datum)
+
+
+def test_invalid_reason_names_the_field():
+    parsed_contract = load_bundled_contract()
+    payload = compile_payload_generator(parsed_contract)(random.Random(0))
+    payload["source"] = "NOT_A_SYMBOL"
+    reason = compile_validator(parsed_contract)(to_avro_converter(parsed_contract)(payload))
+    assert reason is not None
+    assert reason.field.endswith("source")
@@ -0,0 +1,35 @@
+# Created by AG on 18-10-2026
+
+import json
+import random
+
+from src.corpus import iter_corpus_cases, sidecar_path, write_corpus
+from src.pipeline import iter_labelled_cases
+from src.utils import load_bundled_contract
+
+
+def test_replay_keeps_the_generated_order(tmp_path):
+    parsed_contract = load_bundled_contract()
+    cases = list(iter_labelled_cases(parsed_contract, random.Random(5), 6, 6))
+    # a valid case that fails validation goes to the sidecar, between container records
+    cases.insert(3, ("V999", True, {}, None))
+    corpus_path = tmp_path / "corpus.avro"
+    counts = write_corpus(corpus_path, parsed_contract, cases)
+    assert counts["sidecar"] == 7
+
+    replayed = list(iter_corpus_cases(corpus_path))
+    assert [case_id for case_id, _, _ in replayed] == [case[0] for case in cases]
+    assert [is_valid for _, is_valid, _ in replayed] == [case[1] for case in cases]
+
+
+def test_sidecars_without_ordinals_replay_after_the_container(tmp_path):
+    parsed_contract = load_bundled_contract()
+    cases = list(iter_labelled_cases(parsed_contract, random.Random(5), 3, 3))
+    corpus_path = tmp_path / "corpus.avro"
+    write_corpus(corpus_path, parsed_contract, cases)
+    sidecar = sidecar_path(corpus_path)
+    lines = [json.loads(line) for line in sidecar.read_text(encoding="utf-8").splitlines()]
+    sidecar.write_text("".join(json.dumps({k: v for k, v in line.items() if k != "ordinal"}) + "\n" for line in lines), encoding="utf-8")
+
+    replayed = [case_id for case_id, _, _ in iter_corpus_cases(corpus_path)]
+    assert replayed == [case[0] for case in cases if case[1]] + [case[0] for case in cases if not case[1]]
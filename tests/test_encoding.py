@@ -0,0 +1,99 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+from fastavro import parse_schema
+from core.constants import ENCODINGS, JSON
+from core.encoding import CONTENT_TYPES, EncodingError, PayloadEncoder, decode_payload, from_avro_converter, is_identity, to_avro_converter
+from src.utils import load_bundled_contract
+from src.compile_validator import compile_validator
+from src.compile_payload import compile_payload_generator
+
+# bytes under union branches that are records, maps and arrays, a recursive
+# reference, and an enum next to bytes whose symbols are also valid base64
+NESTED_BYTES = {
+    "type": "record",
+    "name": "Outer",
+    "namespace": "com.example.tests",
+    "fields": [
+        {"name": "inner", "type": ["null", {"type": "record", "name": "Inner", "fields": [{"name": "blob", "type": "bytes"}]}]},
+        {"name": "blobs", "type": ["null", {"type": "map", "values": "bytes"}, {"type": "array", "items": "bytes"}]},
+        {"name": "next", "type": ["null", "Outer"]},
+        {"name": "tag", "type": ["null", {"type": "enum", "name": "Tag", "symbols": ["NONE", "ABCD"]}, "bytes"]},
+        {"name": "digest", "type": {"type": "fixed", "name": "Digest", "size": 4}},
+    ],
+}
+
+
+def _round_trip(parsed_contract, encoding, n_records=200, seed=0):
+    generate = compile_payload_generator(parsed_contract)
+    encoder = PayloadEncoder(parsed_contract, encoding, schema_id=7, validator=compile_validator(parsed_contract))
+    from_avro = from_avro_converter(parsed_contract)
+    rng = random.Random(seed)
+    for _ in range(n_records):
+        payload = generate(rng)
+        body, content_type = encoder.encode(payload)
+        assert content_type == CONTENT_TYPES[encoding]
+        decoded = decode_payload(body, content_type, parsed_contract, expected_fingerprint=encoder.fingerprint)
+        assert (decoded if encoding == JSON else from_avro(decoded)) == payload
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_sample_contract_round_trips(encoding):
+    _round_trip(load_bundled_contract(), encoding)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_bytes_nested_in_unions_round_trip(encoding):
+    _round_trip(parse_schema(NESTED_BYTES), encoding)
+
+
+def test_bytes_nested_in_unions_are_valid_after_conversion():
+    parsed_contract = parse_schema(NESTED_BYTES)
+    generate = compile_payload_generator(parsed_contract)
+    validator = compile_validator(parsed_contract)
+    to_avro = to_avro_converter(parsed_contract)
+    rng = random.Random(1)
+    for _ in range(200):
+        assert validator(to_avro(generate(rng))) is None
+
+
+def test_confluent_header_carries_schema_id():
+    body, _ = PayloadEncoder(parse_schema(NESTED_BYTES), "confluent", schema_id=258).encode(
+        {"inner": None, "blobs": None, "next": None, "tag": None, "digest": "AAAAAA=="}
+    )
+    assert body[:5] == b"\x00\x00\x00\x01\x02"
+
+
+def test_payload_that_does_not_match_raises():
+    parsed_contract = parse_schema(NESTED_BYTES)
+    encoder = PayloadEncoder(parsed_contract, "avro-binary", validator=compile_validator(parsed_contract))
+    with pytest.raises(EncodingError):
+        encoder.encode({"inner": None, "blobs": None, "next": None, "tag": None, "digest": "not base64"})
+
+
+def test_json_body_is_plain_json():
+    payload = {"inner": None, "blobs": {"a": "AA=="}, "next": None, "tag": "NONE", "digest": "AAAAAA=="}
+    body, content_type = PayloadEncoder(parse_schema(NESTED_BYTES), JSON).encode(payload)
+    assert content_type == "application/json"
+    assert json.loads(body) == payload
+
+
+def test_wrong_single_object_fingerprint_is_rejected():
+    parsed_contract = parse_schema(NESTED_BYTES)
+    body, content_type = PayloadEncoder(parsed_contract, "avro-single-object").encode(
+        {"inner": None, "blobs": None, "next": None, "tag": None, "digest": "AAAAAA=="}
+    )
+    with pytest.raises(EncodingError):
+        decode_payload(body, content_type, parsed_contract, expected_fingerprint=b"\x00" * 8)
+
+
+def test_converters_without_bytes_are_identity():
+    parsed_contract = parse_schema({"type": "record", "name": "Plain", "fields": [{"name": "id", "type": "long"}]})
+    assert is_identity(to_avro_converter(parsed_contract))
+    assert is_identity(from_avro_converter(parsed_contract))
+    assert not is_identity(to_avro_converter(parse_schema(NESTED_BYTES)))
@@ -0,0 +1,99 @@
+# Created by AG on 18-10-2026
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+
+import pytest
+from core.histogram import LatencyHistogram
+
+PERCENTS = (1.0, 25.0, 50.0, 90.0, 99.0, 99.9, 100.0)
+
+
+def _samples(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(2.0, 1.5) for _ in range(n)]
+
+
+def _histogram(samples):
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+    return histogram
+
+
+def _nearest_rank(ordered, percent):
+    return ordered[max(1, math.ceil(len(ordered) * percent / 100.0)) - 1]
+
+
+def test_percentiles_stay_within_bucket_precision():
+    samples = _samples(20_000)
+    histogram = _histogram(samples)
+    ordered = sorted(samples)
+    for percent in PERCENTS:
+        exact = _nearest_rank(ordered, percent)
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=histogram.precision)
+    assert histogram.percentile(100.0) == histogram.max_ms == max(samples)
+
+
+def test_summary_statistics_are_exact():
+    samples = _samples(5_000, seed=1)
+    histogram = _histogram(samples)
+    assert histogram.count == len(samples)
+    assert histogram.min_ms == min(samples)
+    assert histogram.max_ms == max(samples)
+    assert histogram.mean_ms == pytest.approx(statistics.fmean(samples))
+    assert histogram.stddev_ms == pytest.approx(statistics.stdev(samples), rel=1e-6)
+
+
+def test_merge_equals_recording_everything_in_one():
+    first, second = _samples(3_000, seed=2), _samples(7_000, seed=3)
+    merged = _histogram(first).merge(_histogram(second))
+    combined = _histogram(first + second)
+    assert merged.counts == combined.counts
+    assert merged.count == combined.count
+    assert (merged.min_ms, merged.max_ms) == (combined.min_ms, combined.max_ms)
+    assert merged.sum_ms == pytest.approx(combined.sum_ms)
+    assert merged.percentiles(PERCENTS) == combined.percentiles(PERCENTS)
+
+
+def test_merge_into_empty_and_of_empty():
+    samples = _samples(100, seed=4)
+    assert LatencyHistogram().merge(_histogram(samples)).counts == _histogram(samples).counts
+    histogram = _histogram(samples).merge(LatencyHistogram())
+    assert histogram.count == len(samples)
+    assert histogram.min_ms == min(samples)
+
+
+def test_merge_rejects_other_bucket_layouts():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(precision=0.05))
+
+
+def test_cumulative_counts_bracket_the_exact_counts():
+    samples = _samples(10_000, seed=5)
+    histogram = _histogram(samples)
+    bounds = [0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 1000.0, math.inf]
+    cumulative = histogram.cumulative_counts(bounds)
+    assert cumulative == sorted(cumulative)
+    assert cumulative[-1] == len(samples)
+    slack = (1.0 + histogram.precision) ** 2
+    for bound, count in zip(bounds, cumulative):
+        assert sum(sample <= bound / slack for sample in samples) <= count <= sum(sample <= bound for sample in samples)
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50.0) == 0.0
+    assert histogram.mean_ms == histogram.stddev_ms == 0.0
+    assert histogram.cumulative_counts([1.0, 10.0]) == [0, 0]
+
+
+def test_round_trips_through_dict():
+    histogram = _histogram(_samples(1_000, seed=6))
+    restored = LatencyHistogram.from_dict(histogram.to_dict())
+    assert restored.counts == histogram.counts
+    assert restored.percentiles(PERCENTS) == histogram.percentiles(PERCENTS)
+    assert LatencyHistogram.from_dict(LatencyHistogram().to_dict()).min_ms == math.inf
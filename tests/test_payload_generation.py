@@ -0,0 +1,48 @@
+# Created by AG on 18-10-2026
+
+import random
+from collections import Counter
+from src.payload_generation_utils import ALPHANUMERIC_CHARACTERS, BULK_LENGTH_THRESHOLD, _generate_random_string
+from src.schema_builders import generate_valid_payload
+from src.size_profile import SizeProfile, SizeRange, fit_size_profile
+from src.utils import load_bundled_contract
+
+
+def test_bulk_strings_have_the_requested_length_and_alphabet():
+    rng = random.Random(19)
+    for length in (BULK_LENGTH_THRESHOLD + 1, 1000, 4096):
+        text = _generate_random_string(rng, length, length)
+        assert len(text) == length
+        assert set(text) <= set(ALPHANUMERIC_CHARACTERS)
+
+
+def test_bulk_strings_draw_characters_uniformly():
+    # a 256-entry table repeating the alphabet made its first 8 characters 25% more likely
+    text = _generate_random_string(random.Random(7), 310_000, 310_000)
+    counts = Counter(text)
+    assert set(counts) == set(ALPHANUMERIC_CHARACTERS)
+    expected = len(text) / len(ALPHANUMERIC_CHARACTERS)
+    assert all(abs(count - expected) < 0.08 * expected for count in counts.values())
+
+
+def test_bulk_strings_are_deterministic_per_seed():
+    assert _generate_random_string(random.Random(3), 2000, 2000) == _generate_random_string(random.Random(3), 2000, 2000)
+
+
+def test_interpreted_generator_follows_the_size_profile():
+    parsed_contract = load_bundled_contract()
+    size_profile = SizeProfile(items=SizeRange(40, 50), string_length=SizeRange(30, 30), fields={"id": SizeRange(7, 7)})
+    rng = random.Random(2)
+    for _ in range(20):
+        payload = generate_valid_payload(parsed_contract, rng, size_profile=size_profile)
+        assert len(payload["id"]) == 7
+        if payload["tags"]:
+            assert 40 <= len(payload["tags"]) <= 50
+            assert all(len(tag) == 30 for tag in payload["tags"])
+
+
+def test_target_size_ranges_stay_close_to_their_mean():
+    fitted, expected = fit_size_profile(load_bundled_contract(), SizeProfile(target_bytes=100_000))
+    assert abs(expected - 100_000) < 1_000
+    for size in (fitted.items, fitted.string_length, fitted.bytes_length):
+        assert size.maximum <= 1.25 * size.minimum + 1
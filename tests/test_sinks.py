@@ -0,0 +1,23 @@
+# Created by AG on 18-10-2026
+
+import pytest
+
+from core.runner import Record
+from core.sinks import CsvSink, JsonlSpill, RecordSinks
+
+
+class _BrokenSpill(JsonlSpill):
+    def _open(self, handle):
+        raise RuntimeError("disk full")
+
+
+def test_a_failing_sink_does_not_lose_the_others(tmp_path):
+    sinks = RecordSinks()
+    sinks.sinks = [_BrokenSpill(tmp_path / "spill.jsonl"), CsvSink(tmp_path / "records.csv")]
+    with pytest.raises(RuntimeError, match="disk full"):
+        with sinks:
+            for index in range(3):
+                sinks.write(Record(f"V{index:03d}", True, "pass", 200, 1.0, None, "ok"))
+
+    lines = (tmp_path / "records.csv").read_text(encoding="utf-8").splitlines()
+    assert [line.split(",")[0] for line in lines] == ["id", "V000", "V001", "V002"]